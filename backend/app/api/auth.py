@@ -1,3 +1,4 @@
+import httpx
 import urllib.parse
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import RedirectResponse
@@ -8,8 +9,10 @@ from uuid import UUID
 from typing import Optional
 
 from ..core.config import settings
+from ..core.rate_limit import rate_limit
 from ..core.security import SecurityService, security
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
+from ..core.http import get_http_client
 from ..services.auth_service import AuthService
 from ..services.user_service import UserService
 from ..schemas.user import TokenResponse, UserResponse
@@ -17,7 +20,7 @@ from ..schemas.user import TokenResponse, UserResponse
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 
-@router.get("/login")
+@router.get("/login", dependencies=[Depends(rate_limit(settings.rate_limit_auth))])
 async def login():
     """Redirect to GitHub OAuth"""
     github_auth_url = (
@@ -29,8 +32,16 @@ async def login():
     return RedirectResponse(url=github_auth_url)
 
 
-@router.get("/callback", response_model=TokenResponse)
-async def auth_callback(code: str, db: Session = Depends(get_db)):
+@router.get(
+    "/callback",
+    response_model=TokenResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_auth))],
+)
+async def auth_callback(
+    code: str,
+    db: Session = Depends(get_db),
+    http_client: httpx.AsyncClient = Depends(get_http_client),
+):
     if not code:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,7 +51,7 @@ async def auth_callback(code: str, db: Session = Depends(get_db)):
     """Handle GitHub OAuth callback"""
     try:
         # Exchange code for access token
-        token_response = await AuthService.exchange_code_for_token(code)
+        token_response = await AuthService.exchange_code_for_token(http_client, code)
         access_token = token_response.get("access_token")
 
         if not access_token:
@@ -50,7 +61,7 @@ async def auth_callback(code: str, db: Session = Depends(get_db)):
             )
 
         # Get user info from GitHub
-        github_user = await AuthService.get_github_user_info(access_token)
+        github_user = await AuthService.get_github_user_info(http_client, access_token)
 
         allowed_github_usernames = ["0xs1r4t"]  # only allow me to login
 
@@ -90,7 +101,7 @@ async def auth_callback(code: str, db: Session = Depends(get_db)):
 # Authentication dependency
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> UserResponse:
     """Dependency to get current authenticated user"""
     if not credentials:
@@ -121,7 +132,7 @@ async def get_current_user(
 # Implement in the future
 async def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ) -> Optional[UserResponse]:
     """Dependency to get current user if authenticated, otherwise returns None"""
     try:
@@ -132,7 +143,11 @@ async def get_optional_user(
         return None
 
 
-@router.get("/me", response_model=UserResponse)
+@router.get(
+    "/me",
+    response_model=UserResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
 async def get_current_user_info(
     current_user: UserResponse = Depends(get_current_user),
 ):
@@ -0,0 +1,166 @@
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from ..core.config import settings
+from ..core.database import get_read_db
+from ..core.live import BrokerFull, Subscriber, broker
+from ..core.rate_limit import rate_limit
+from ..schemas.change import ChangeFeedResponse, ChangeItem
+from ..schemas.media import MediaResponse
+from ..schemas.post import PostResponse
+from ..schemas.user import UserResponse
+from ..services.change_service import ChangeService
+from ..services.media_service import MediaService
+from ..services.post_service import PostService
+from .auth import get_current_user
+from .media import can_view_media
+from .posts import can_view_post
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+
+@router.get(
+    "/",
+    response_model=ChangeFeedResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_changes(
+    since: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=settings.change_feed_max_limit),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Posts and media created, updated or deleted after the `since` token
+
+    Without `since`, returns no changes and the current token: list
+    everything once, then sync from there. Each object appears once per
+    page with its latest action and current state; anything you can no
+    longer see comes back as deleted.
+    """
+    changes = ChangeService(db)
+    if since is None:
+        return ChangeFeedResponse(
+            changes=[], next_since=changes.latest_seq(), has_more=False
+        )
+
+    entries = changes.changes_since(since, limit)
+    latest = {}
+    for entry in entries:
+        key = (entry.entity, entry.entity_id)
+        latest.pop(key, None)  # Re-insert so the dict stays in seq order
+        latest[key] = entry
+
+    post_ids = [entity_id for entity, entity_id in latest if entity == "post"]
+    media_ids = [entity_id for entity, entity_id in latest if entity == "media"]
+    posts = (
+        {p.id: p for p in PostService(db).get_posts_by_ids(post_ids)}
+        if post_ids
+        else {}
+    )
+    media = (
+        {m.id: m for m in MediaService(db).get_media_by_ids(media_ids)}
+        if media_ids
+        else {}
+    )
+
+    items = []
+    for (entity, entity_id), entry in latest.items():
+        item = ChangeItem(
+            seq=entry.seq, entity=entity, id=str(entity_id), action=entry.action
+        )
+        if entity == "post":
+            post = posts.get(entity_id)
+            if post and can_view_post(post, current_user):
+                item.post = PostResponse.from_post(post)
+        else:
+            media_file = media.get(entity_id)
+            # Pending uploads aren't listed anywhere until completed
+            if (
+                media_file
+                and media_file.status != "pending"
+                and can_view_media(media_file, current_user)
+            ):
+                item.media = MediaResponse.from_media(media_file)
+
+        if not (item.post or item.media):
+            if entry.action == "created":
+                continue  # Never visible to this user; its delete, if any, is later
+            item.action = "deleted"
+        items.append(item)
+
+    return ChangeFeedResponse(
+        changes=items,
+        next_since=entries[-1].seq if entries else since,
+        has_more=len(entries) == limit,
+    )
+
+
+class LiveStreamResponse(StreamingResponse):
+    """Event stream that frees its broker slot however the response ends
+
+    The generator's own cleanup never runs if the client is gone before the
+    body starts, so the slot is released around the whole response instead.
+    """
+
+    def __init__(self, subscriber: Subscriber, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.subscriber = subscriber
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            broker.unsubscribe(self.subscriber)
+
+
+def change_event(seq: int) -> str:
+    return f"event: changes\ndata: {json.dumps({'seq': seq})}\n\n"
+
+
+@router.get("/stream", dependencies=[Depends(rate_limit(settings.rate_limit_read))])
+async def stream_changes(
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Server-sent events: a `changes` event with the newest token after writes
+
+    Events carry only `{"seq": N}`; fetch `GET /changes?since=` to see what
+    changed (with the usual access rules). Slow clients skip to the newest
+    token rather than buffering, and `: ping` comments keep proxies from
+    closing idle streams.
+    """
+    # Auth is done; don't hold a pooled connection for the life of the stream
+    db.close()
+    try:
+        subscriber = broker.subscribe()
+    except BrokerFull:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live connections",
+            headers={"Retry-After": "30"},
+        )
+
+    async def events():
+        yield "retry: 5000\n\n"
+        # Start with the current token so the client can catch up
+        sent = broker.latest or 0
+        if sent:
+            yield change_event(sent)
+        while not subscriber.closed:
+            seq = await subscriber.next(settings.live_heartbeat_seconds)
+            if seq is None:
+                yield ": ping\n\n"
+            elif seq > sent and not subscriber.closed:
+                sent = seq
+                yield change_event(seq)
+
+    return LiveStreamResponse(
+        subscriber,
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
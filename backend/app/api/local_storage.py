@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..core.local_storage import LocalStorageClient, verify_upload_token
+
+# Target of signed upload URLs when STORAGE_BACKEND=local, standing in for
+# Supabase's /object/upload/sign endpoint. Mounted only in that mode.
+router = APIRouter(prefix="/storage", tags=["local storage"])
+
+
+@router.put("/upload/sign/{bucket}/{path:path}")
+async def upload_to_signed_url(bucket: str, path: str, token: str, request: Request):
+    """Stream the request body to disk if the token matches bucket and path"""
+    if not verify_upload_token(bucket, path, token):
+        raise HTTPException(status_code=403, detail="Invalid or expired upload token")
+
+    storage = LocalStorageClient(settings.local_storage_path).from_(bucket)
+    try:
+        f = await run_in_threadpool(storage.open_for_write, path)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    size = 0
+    try:
+        async for chunk in request.stream():
+            size += len(chunk)
+            if size > settings.max_file_size:
+                raise HTTPException(status_code=413, detail="File too large")
+            await run_in_threadpool(f.write, chunk)
+    except HTTPException:
+        await run_in_threadpool(f.close)
+        await storage.remove([path])
+        raise
+    await run_in_threadpool(f.close)
+
+    await run_in_threadpool(
+        storage.write_meta, path, request.headers.get("content-type")
+    )
+    return {"Key": f"{bucket}/{path}"}
@@ -1,20 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+import hashlib
+import uuid
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+    UploadFile,
+)
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Union
 from uuid import UUID
 
-from ..core.database import get_db
+from ..core.database import get_db, get_read_db
 from ..services.storage_service import StorageService
+from ..services.idempotency_service import IdempotencyService, request_hash
 from ..services.media_service import MediaService
+from ..services.media_usage_service import MediaUsageService
 from ..core.config import settings
-from ..schemas.post import CreatedByUser
-from ..schemas.media import MediaResponse
+from ..core.rate_limit import rate_limit
+from ..schemas.post import BatchGetRequest, CreatedByUser
+from ..schemas.media import (
+    MediaBatchItem,
+    MediaListResponse,
+    MediaResponse,
+    UploadUrlRequest,
+    UploadUrlResponse,
+)
+from ..services.counter_service import CounterService
 
 from .auth import get_current_user  # , get_optional_user
+from .params import parse_include, parse_meta
 from ..schemas.user import UserResponse
 
 router = APIRouter(prefix="/media", tags=["media"])
 
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+async def file_digest(file: UploadFile) -> str:
+    """sha256 of an upload, read in chunks and rewound for the actual upload"""
+    digest = hashlib.sha256()
+    while chunk := await file.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    await file.seek(0)
+    return digest.hexdigest()
+
 
 def get_asset_type(mime_type: str) -> str:
     """Determine asset type from MIME type"""
@@ -34,14 +68,24 @@ def get_asset_type(mime_type: str) -> str:
         return "document"
 
 
-@router.post("/upload", response_model=MediaResponse)
+@router.post(
+    "/upload",
+    response_model=MediaResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_upload))],
+)
 async def upload_media(
+    response: Response,
     file: UploadFile = File(...),
     status: str = "draft",
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Upload media file to Supabase Storage"""
+    """Upload media file to Supabase Storage
+
+    With an Idempotency-Key header, retrying an upload that already went
+    through returns that media instead of storing the file again.
+    """
 
     # Validate file type
     if file.content_type not in settings.allowed_file_types:
@@ -49,6 +93,27 @@ async def upload_media(
             status_code=400, detail=f"File type {file.content_type} not allowed"
         )
 
+    keys = IdempotencyService(db)
+    if idempotency_key:
+        fingerprint = request_hash(
+            "POST /media/upload",
+            await file_digest(file),
+            file.filename,
+            file.content_type,
+            status,
+        )
+        created_id = await run_in_threadpool(
+            keys.acquire, current_user.id, idempotency_key, fingerprint
+        )
+        if created_id:
+            response.headers["Idempotent-Replayed"] = "true"
+            media = await run_in_threadpool(
+                MediaService(db).get_media_by_id, created_id
+            )
+            if not media:
+                raise HTTPException(status_code=404, detail="Media not found")
+            return MediaResponse.from_media(media)
+
     try:
         # Upload to Supabase Storage
         storage = StorageService(use_admin=True)
@@ -58,7 +123,17 @@ async def upload_media(
         media_service = MediaService(db)
         asset_type = get_asset_type(file.content_type)
 
-        media_record = media_service.create_media(
+        # The key completes in the same commit as the media row
+        media_id = None
+        if idempotency_key:
+            media_id = uuid.uuid4()
+            await run_in_threadpool(
+                keys.complete, current_user.id, idempotency_key, media_id
+            )
+
+        # Keep the blocking DB write off the event loop
+        media_record = await run_in_threadpool(
+            media_service.create_media,
             filename=upload_result["filename"],
             original_name=upload_result["original_name"],
             file_path=upload_result["file_path"],
@@ -69,6 +144,7 @@ async def upload_media(
             status=status,
             created_by_id=current_user.id,
             meta_data={},
+            media_id=media_id,
         )
 
         return MediaResponse(
@@ -89,22 +165,138 @@ async def upload_media(
         )
 
     except HTTPException:
+        if idempotency_key:
+            await run_in_threadpool(keys.release, current_user.id, idempotency_key)
         raise
     except Exception as e:
+        if idempotency_key:
+            await run_in_threadpool(keys.release, current_user.id, idempotency_key)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
 
-@router.get("/", response_model=List[MediaResponse])
+@router.post(
+    "/upload-url",
+    response_model=UploadUrlResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_upload))],
+)
+async def create_upload_url(
+    upload: UploadUrlRequest,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Start a direct upload: a pending media row plus a signed storage URL
+
+    The client PUTs the file to `upload_url`, then calls /media/{id}/complete.
+    File bytes never pass through the API.
+    """
+    if upload.content_type not in settings.allowed_file_types:
+        raise HTTPException(
+            status_code=400, detail=f"File type {upload.content_type} not allowed"
+        )
+    if not 0 < upload.file_size <= settings.max_file_size:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Max size: {settings.max_file_size} bytes",
+        )
+
+    storage = StorageService(use_admin=True)
+    filename, file_path = storage.new_file_path(upload.filename)
+    try:
+        signed = await storage.create_upload_url(file_path)
+        public_url = await storage.get_file_url(file_path)
+    except Exception as e:
+        raise HTTPException(
+            status_code=502, detail=f"Could not create upload URL: {str(e)}"
+        )
+
+    media_record = await run_in_threadpool(
+        MediaService(db).create_media,
+        filename=filename,
+        original_name=upload.filename,
+        file_path=file_path,
+        public_url=public_url,
+        mime_type=upload.content_type,
+        file_size=upload.file_size,
+        asset_type=get_asset_type(upload.content_type),
+        status="pending",
+        created_by_id=current_user.id,
+        meta_data={},
+    )
+
+    return UploadUrlResponse(media=MediaResponse.from_media(media_record), **signed)
+
+
+@router.post(
+    "/{media_id}/complete",
+    response_model=MediaResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_write))],
+)
+async def complete_upload(
+    media_id: UUID,
+    status: str = "draft",
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Finish a direct upload after checking the stored file's size and type"""
+    if status not in ("draft", "published", "archived"):
+        raise HTTPException(status_code=400, detail=f"Invalid status {status}")
+
+    media_service = MediaService(db)
+    media = await run_in_threadpool(media_service.get_media_by_id, media_id)
+    if not media:
+        raise HTTPException(status_code=404, detail="Media not found")
+    if media.created_by_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="You can only complete your own uploads"
+        )
+    if media.status != "pending":
+        raise HTTPException(status_code=409, detail="Upload already completed")
+
+    storage = StorageService(use_admin=True)
+    info = await storage.get_file_info(media.file_path)
+    if info is None:
+        raise HTTPException(status_code=400, detail="File has not been uploaded yet")
+
+    problem = None
+    if info["size"] != media.file_size:
+        problem = f"Uploaded {info['size']} bytes, expected {media.file_size}"
+    elif info["mime_type"] != media.mime_type:
+        problem = f"Uploaded type {info['mime_type']}, expected {media.mime_type}"
+    if problem:
+        # Start over with a new upload URL (the file is deleted by a job)
+        await run_in_threadpool(media_service.delete_media, media_id)
+        raise HTTPException(status_code=400, detail=problem)
+
+    media = await run_in_threadpool(media_service.complete_upload, media_id, status)
+    if not media:
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    return MediaResponse.from_media(media)
+
+
+@router.get(
+    "/",
+    response_model=Union[List[MediaResponse], MediaListResponse],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
 def list_media(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     asset_type: Optional[str] = Query(None),
     status: Optional[str] = Query(None),
+    meta: Optional[str] = Query(
+        None, description='meta_data filter: {"key": "x"} or key:x,other:y'
+    ),
+    include: Optional[str] = Query(None, description="Comma-separated: total,facets"),
     # current_user: Optional[UserResponse] = Depends(get_optional_user),
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """List media files"""
+    """List media files
+
+    With `include`, returns `{items, total, facets}` instead of a bare array.
+    """
+    includes = parse_include(include, {"total", "facets"})
+    meta_filter = parse_meta(meta)
     media_service = MediaService(db)
 
     # If not authenticated, only show published media
@@ -123,30 +315,85 @@ def list_media(
         asset_type=asset_type,
         status=status_filter,
         user_id=current_user.id if current_user else None,
+        meta=meta_filter,
     )
 
-    return [
-        MediaResponse(
-            id=str(media.id),
-            filename=media.filename,
-            original_name=media.original_name,
-            public_url=media.public_url,
-            asset_type=media.asset_type,
-            file_size=media.file_size,
-            status=media.status,
-            created_by=CreatedByUser(
-                id=str(media.created_by.id),
-                username=media.created_by.username,
-                avatar_url=media.created_by.avatar_url,
-            ),
-            created_at=media.created_at,
-            updated_at=media.updated_at,
+    items = [MediaResponse.from_media(media) for media in media_files]
+
+    if not includes:
+        return items
+
+    counters = CounterService(db)
+    user_id = current_user.id if current_user else None
+    response = MediaListResponse(items=items)
+
+    if "total" in includes:
+        if meta_filter:
+            # No counters per meta_data value; count the filtered rows
+            response.total = media_service.media_list_query(
+                asset_type, status_filter, user_id, meta_filter
+            ).count()
+        elif asset_type:
+            response.total = counters.get_counts(
+                "media", user_id, status_filter, facet="asset_type", value=asset_type
+            )
+        else:
+            response.total = counters.get_counts("media", user_id, status_filter)
+
+    if "facets" in includes:
+        response.facets = counters.get_facets(
+            "media", user_id, status_filter, limit=settings.facet_value_limit
         )
-        for media in media_files
-    ]
 
+    return response
 
-@router.delete("/{media_id}")
+
+def can_view_media(media, current_user: Optional[UserResponse]) -> bool:
+    """Same access rule as list_media: published, or owned by the current user"""
+    if media.status == "published":
+        return True
+    return bool(current_user) and media.created_by_id == current_user.id
+
+
+@router.post(
+    "/batch-get",
+    response_model=List[MediaBatchItem],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def batch_get_media(
+    batch: BatchGetRequest,
+    # current_user: Optional[UserResponse] = Depends(get_optional_user),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Get many media files by ID in one query, returned in request order"""
+    if len(batch.ids) > settings.max_batch_get_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_batch_get_ids} ids per request",
+        )
+
+    media_files = {
+        media.id: media for media in MediaService(db).get_media_by_ids(batch.ids)
+    }
+
+    items = []
+    for media_id in batch.ids:
+        media = media_files.get(media_id)
+        if not media:
+            items.append(MediaBatchItem(id=str(media_id), error="not_found"))
+        elif not can_view_media(media, current_user):
+            items.append(MediaBatchItem(id=str(media_id), error="forbidden"))
+        else:
+            items.append(
+                MediaBatchItem(id=str(media_id), media=MediaResponse.from_media(media))
+            )
+    return items
+
+
+@router.delete(
+    "/{media_id}", dependencies=[Depends(rate_limit(settings.rate_limit_write))]
+)
 async def delete_media(
     media_id: UUID,
     current_user: UserResponse = Depends(get_current_user),
@@ -154,7 +401,7 @@ async def delete_media(
 ):
     """Delete media file"""
     media_service = MediaService(db)
-    media = media_service.get_media_by_id(media_id)
+    media = await run_in_threadpool(media_service.get_media_by_id, media_id)
 
     if not media:
         raise HTTPException(status_code=404, detail="Media not found")
@@ -165,18 +412,25 @@ async def delete_media(
             status_code=403, detail="You can only delete your own media files"
         )
 
-    # Delete from storage
-    storage = StorageService(use_admin=True)
-    storage_deleted = storage.delete_file(media.file_path)
+    # Refuse while posts still use it
+    usages = await run_in_threadpool(MediaUsageService(db).get_usages, media_id)
+    if usages:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Media is used by posts",
+                "post_ids": sorted({str(usage.post_id) for usage in usages}),
+            },
+        )
 
-    # Delete from database
-    db_deleted = media_service.delete_media(media_id)
+    # Delete from database; the storage delete is queued in the same commit
+    db_deleted = await run_in_threadpool(media_service.delete_media, media_id)
 
     if not db_deleted:
         raise HTTPException(status_code=500, detail="Failed to delete media record")
 
     return {
         "message": "Media deleted successfully",
-        "storage_deleted": storage_deleted,
+        "storage_delete": "queued",
         "database_deleted": db_deleted,
     }
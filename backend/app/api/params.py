@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from fastapi import HTTPException
+from typing import Any, Dict, List, Optional, Set
+
+
+def parse_include(include: Optional[str], allowed: Set[str]) -> Set[str]:
+    """Parse a comma-separated `include=` query value against the allowed options"""
+    if not include:
+        return set()
+
+    requested = {part.strip() for part in include.split(",") if part.strip()}
+    unknown = requested - allowed
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include option(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(sorted(allowed))}",
+        )
+    return requested
+
+
+def parse_meta(meta: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse `meta=`: a JSON object to match by containment, or comma-separated
+    `key:value` pairs (string values)"""
+    if not meta:
+        return None
+
+    if meta.lstrip().startswith("{"):
+        try:
+            value = json.loads(meta)
+        except ValueError:
+            value = None
+        if not isinstance(value, dict) or not value:
+            raise HTTPException(
+                status_code=400, detail="meta must be a non-empty JSON object"
+            )
+        return value
+
+    pairs = {}
+    for part in meta.split(","):
+        key, sep, value = part.partition(":")
+        if not sep or not key.strip():
+            raise HTTPException(
+                status_code=400,
+                detail="meta must be key:value pairs separated by commas, "
+                "or a JSON object",
+            )
+        pairs[key.strip()] = value.strip()
+    return pairs
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque keyset cursor from the last row's sort values"""
+    raw = json.dumps([str(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[str]:
+    """Sort values from encode_cursor; 400 if it isn't one"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, ValueError):
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
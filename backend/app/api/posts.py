@@ -1,39 +1,157 @@
-from fastapi import status, APIRouter, Depends, HTTPException, Query
+from anyio.from_thread import run as run_async
+from fastapi import (
+    status,
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import desc, or_
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 from uuid import UUID
 from datetime import datetime, UTC
 
-from ..core.database import get_db
+from ..core.config import settings
+from ..core.rate_limit import rate_limit
+from ..core.single_flight import read_flight
+from ..core.database import get_db, get_read_db
 
-from ..models.post import Post
+from ..models.post import POST_META_INDEXED_KEYS, Post
 from ..models.user import User
-from ..schemas.post import PostCreate, PostResponse, PostUpdate, CreatedByUser
+from ..schemas.post import (
+    BatchGetRequest,
+    CreatedByUser,
+    PostBatchItem,
+    PostContent,
+    PostCreate,
+    PostListResponse,
+    PostResponse,
+    PostUpdate,
+)
+from ..services.content_service import ContentError, ContentService
+from ..services.counter_service import CounterService, post_counter_keys
+from ..services.idempotency_service import IdempotencyService, request_hash
+from ..services.link_service import LinkService
+from ..services.media_usage_service import MediaUsageService
+from ..services.meta_filter import meta_conditions
+from ..services.post_service import PostService
+from ..services.related_service import RelatedService, refresh_related
+from ..services.revision_service import (
+    RESTORABLE_FIELDS,
+    RevisionService,
+    post_state,
+)
+from ..schemas.link import GraphEdge, GraphNode, LinkedPost, LinkGraph, OutLink
+from ..schemas.revision import PostRevisionResponse, PostRevisionSummary
 
 from ..models.media import Media
 
 from .auth import get_current_user  # , get_optional_user
+from .params import parse_include, parse_meta
 from ..schemas.user import UserResponse
 
 router = APIRouter(prefix="/posts", tags=["posts"])
 
+POST_LIST_ADAPTER = TypeAdapter(List[PostResponse])
 
-@router.get("/", response_model=List[PostResponse])
-def list_posts(
+
+@router.get(
+    "/",
+    response_model=Union[List[PostResponse], PostListResponse],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+async def list_posts(
     skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     status: Optional[str] = Query(None),
     post_type: Optional[str] = Query(None, alias="type"),
     tags: Optional[str] = Query(None),
+    meta: Optional[str] = Query(
+        None, description='meta_data filter: {"series": "x"} or series:x,language:en'
+    ),
+    include: Optional[str] = Query(
+        None, description="Comma-separated: total,facets,content"
+    ),
     # current_user: Optional[UserResponse] = Depends(get_optional_user),
     current_user: UserResponse = Depends(get_current_user),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
-    """List posts with pagination and filtering"""
-    query = db.query(Post).options(
-        joinedload(Post.content_media), joinedload(Post.created_by)
+    """List posts with pagination and filtering
+
+    With `include`, returns `{items, total, facets}` instead of a bare array,
+    and `content` adds each post's rendered body.
+    """
+    includes = parse_include(include, {"total", "facets", "content"})
+    meta_filter = parse_meta(meta)
+    # Results depend on the user (own drafts, counters), so only a user's own
+    # identical requests share a query
+    bind = db.get_bind()
+    key = (
+        "list_posts",
+        bind,
+        current_user.id,
+        skip,
+        limit,
+        status,
+        post_type,
+        tags,
+        meta,
+        frozenset(includes),
+    )
+    body = await read_flight.do(
+        key,
+        run_in_threadpool,
+        load_post_list,
+        bind,
+        current_user,
+        skip,
+        limit,
+        status,
+        post_type,
+        tags,
+        meta_filter,
+        includes,
     )
+    return Response(body, media_type="application/json")
+
+
+def load_post_list(
+    bind,
+    current_user: Optional[UserResponse],
+    skip: int,
+    limit: int,
+    status: Optional[str],
+    post_type: Optional[str],
+    tags: Optional[str],
+    meta: Optional[Dict[str, Any]],
+    includes: Set[str],
+) -> bytes:
+    """list_posts as serialized JSON, in its own session (shared by callers)"""
+    with Session(bind=bind, autoflush=False) as db:
+        return build_post_list(
+            db, current_user, skip, limit, status, post_type, tags, meta, includes
+        )
+
+
+def build_post_list(
+    db: Session,
+    current_user: Optional[UserResponse],
+    skip: int,
+    limit: int,
+    status: Optional[str],
+    post_type: Optional[str],
+    tags: Optional[str],
+    meta: Optional[Dict[str, Any]],
+    includes: Set[str],
+) -> bytes:
+    query = db.query(Post)
 
     # If not authenticated, only show published posts with published content
     if not current_user:
@@ -54,104 +172,285 @@ def list_posts(
     if post_type:
         query = query.filter(Post.type == post_type)
 
+    tag_list = []
     if tags:
-        tag_list = [tag.strip() for tag in tags.split(",")]
+        tag_list = list({tag.strip() for tag in tags.split(",")})
         query = query.filter(Post.tags.overlap(tag_list))
 
-    posts = query.order_by(desc(Post.created_at)).offset(skip).limit(limit).all()
+    if meta:
+        query = query.filter(
+            *meta_conditions(Post.meta_data, meta, POST_META_INDEXED_KEYS)
+        )
 
-    return [
-        PostResponse(
-            id=str(post.id),
-            title=post.title,
-            slug=post.slug,
-            description=post.description,
-            tags=post.tags or [],
-            type=post.type,
-            status=post.status,
-            content_media_id=(
-                str(post.content_media_id) if post.content_media_id else None
-            ),
-            content_url=post.content_media.public_url if post.content_media else None,
-            created_by=CreatedByUser(
-                id=str(post.created_by.id),
-                username=post.created_by.username,
-                avatar_url=post.created_by.avatar_url,
-            ),
-            published_at=post.published_at,
-            created_at=post.created_at,
-            updated_at=post.updated_at,
-            meta_data=post.meta_data,
+    posts = (
+        query.options(joinedload(Post.content_media), joinedload(Post.created_by))
+        .order_by(desc(Post.created_at))
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    items = [PostResponse.from_post(post) for post in posts]
+
+    if not includes:
+        return POST_LIST_ADAPTER.dump_json(items)
+
+    if "content" in includes:
+        attach_content(items, posts)
+
+    counters = CounterService(db)
+    user_id = current_user.id if current_user else None
+    response = PostListResponse(items=items)
+
+    if "total" in includes:
+        if (post_type and tag_list) or len(tag_list) > 1 or meta:
+            # Counters are per facet value; type+tag combinations, any-of tag
+            # and meta_data filters fall back to counting the filtered rows
+            response.total = query.order_by(None).count()
+        elif tag_list:
+            response.total = counters.get_counts(
+                "post", user_id, status, facet="tag", value=tag_list[0]
+            )
+        elif post_type:
+            response.total = counters.get_counts(
+                "post", user_id, status, facet="type", value=post_type
+            )
+        else:
+            response.total = counters.get_counts("post", user_id, status)
+
+    if "facets" in includes:
+        response.facets = counters.get_facets(
+            "post", user_id, status, limit=settings.facet_value_limit
         )
-        for post in posts
-    ]
 
+    return response.model_dump_json().encode()
 
-@router.get("/{post_id}", response_model=PostResponse)
-def get_post(
-    post_id: UUID,
+
+def attach_content(items: List[PostResponse], posts: List[Post]):
+    """Fill in rendered bodies (from a sync route's worker thread)"""
+    media_list = [post.content_media for post in posts if post.content_media]
+    if not media_list:
+        return
+    rendered = run_async(ContentService().render_many, media_list)
+    for item, post in zip(items, posts):
+        if rendered.get(post.content_media_id):
+            item.content = PostContent.from_rendered(rendered[post.content_media_id])
+
+
+def validate_schedule(published_at: Optional[datetime]) -> datetime:
+    """A scheduled post needs a published_at in the future (naive means UTC)"""
+    if published_at is None:
+        raise HTTPException(status_code=400, detail="Scheduled posts need published_at")
+    if published_at.tzinfo is None:
+        published_at = published_at.replace(tzinfo=UTC)
+    if published_at <= datetime.now(UTC):
+        raise HTTPException(
+            status_code=400, detail="published_at must be in the future when scheduled"
+        )
+    return published_at
+
+
+def related_changed(old_tags: List[str], old_status: str, post: Post) -> bool:
+    """Whether a write moves related posts: new tags, or (un)published"""
+    return set(old_tags) != set(post.tags or []) or (
+        (old_status == "published") != (post.status == "published")
+    )
+
+
+def can_view_post(post: Post, current_user: Optional[UserResponse]) -> bool:
+    """Same access rule as get_post: published, or owned by the current user"""
+    if post.status == "published":
+        return True
+    return bool(current_user) and post.created_by_id == current_user.id
+
+
+@router.post(
+    "/batch-get",
+    response_model=List[PostBatchItem],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def batch_get_posts(
+    batch: BatchGetRequest,
     # current_user: Optional[UserResponse] = Depends(get_optional_user),
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
+):
+    """Get many posts by ID in one query, returned in request order"""
+    if len(batch.ids) > settings.max_batch_get_ids:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.max_batch_get_ids} ids per request",
+        )
+
+    posts = {post.id: post for post in PostService(db).get_posts_by_ids(batch.ids)}
+
+    items = []
+    for post_id in batch.ids:
+        post = posts.get(post_id)
+        if not post:
+            items.append(PostBatchItem(id=str(post_id), error="not_found"))
+        elif not can_view_post(post, current_user):
+            items.append(PostBatchItem(id=str(post_id), error="forbidden"))
+        else:
+            items.append(
+                PostBatchItem(id=str(post_id), post=PostResponse.from_post(post))
+            )
+    return items
+
+
+@router.get(
+    "/{post_id}",
+    response_model=PostResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+async def get_post(
+    post_id: UUID,
+    # current_user: Optional[UserResponse] = Depends(get_optional_user),
+    include: Optional[str] = Query(None, description="Comma-separated: content"),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
 ):
     """Get a specific post by ID"""
-    post = (
-        db.query(Post)
-        .options(joinedload(Post.content_media), joinedload(Post.created_by))
-        .filter(Post.id == post_id)
-        .first()
+    includes = parse_include(include, {"content"})
+    # Loaded and serialized once for every concurrent reader of the post;
+    # access is checked per request against its status and owner
+    bind = db.get_bind()
+    found = await read_flight.do(
+        ("get_post", bind, post_id, frozenset(includes)),
+        run_in_threadpool,
+        load_post,
+        bind,
+        post_id,
+        includes,
     )
 
-    if not post:
+    if not found:
         raise HTTPException(status_code=404, detail="Post not found")
+    post_status, created_by_id, body = found
 
     # Check access permissions
     if not current_user:
         # Not authenticated - only allow published posts
-        if post.status != "published":
+        if post_status != "published":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied. This post is not published.",
             )
     else:
         # Authenticated - allow access if user is creator OR post is published
-        if post.created_by_id != current_user.id and post.status != "published":
+        if created_by_id != current_user.id and post_status != "published":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied. You can only view your own unpublished posts.",
             )
 
-    return PostResponse(
-        id=str(post.id),
-        title=post.title,
-        slug=post.slug,
-        description=post.description,
-        tags=post.tags or [],
-        type=post.type,
-        status=post.status,
-        content_media_id=(
-            str(post.content_media_id) if post.content_media_id else None
-        ),
-        content_url=(post.content_media.public_url if post.content_media else None),
-        created_by=CreatedByUser(
-            id=str(post.created_by.id),
-            username=post.created_by.username,
-            avatar_url=post.created_by.avatar_url,
-        ),
-        published_at=post.published_at,
-        created_at=post.created_at,
-        updated_at=post.updated_at,
-        meta_data=post.meta_data,
-    )
+    return Response(body, media_type="application/json")
 
 
-@router.post("/", response_model=PostResponse)
+def load_post(
+    bind, post_id: UUID, includes: Set[str]
+) -> Optional[Tuple[str, UUID, bytes]]:
+    """(status, created_by_id, serialized PostResponse), None if missing"""
+    with Session(bind=bind, autoflush=False) as db:
+        post = (
+            db.query(Post)
+            .options(joinedload(Post.content_media), joinedload(Post.created_by))
+            .filter(Post.id == post_id)
+            .first()
+        )
+        if not post:
+            return None
+
+        response = PostResponse.from_post(post)
+        if "content" in includes:
+            attach_content([response], [post])
+        return post.status, post.created_by_id, response.model_dump_json().encode()
+
+
+@router.get(
+    "/{post_id}/content",
+    response_model=PostContent,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+async def get_post_content(
+    post_id: UUID,
+    request: Request,
+    response: Response,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Post body rendered to sanitized HTML with a table of contents
+
+    Rendered output is cached per content file; the content hash is the ETag.
+    """
+    posts = await run_in_threadpool(PostService(db).get_posts_by_ids, [post_id])
+    if not posts:
+        raise HTTPException(status_code=404, detail="Post not found")
+    post = posts[0]
+    if not can_view_post(post, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied. You can only view your own unpublished posts.",
+        )
+    if not post.content_media:
+        raise HTTPException(status_code=404, detail="Post has no content")
+
+    try:
+        rendered = await ContentService().render(post.content_media)
+    except ContentError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+
+    etag = f'"{rendered.content_hash}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return PostContent.from_rendered(rendered)
+
+
+@router.post(
+    "/",
+    response_model=PostResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_write))],
+)
 def create_post(
     post: PostCreate,
+    background_tasks: BackgroundTasks,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Create a new post"""
+    """Create a new post
+
+    With an Idempotency-Key header, retrying a request that already went
+    through returns the post it created instead of failing the slug check.
+    """
+    if not idempotency_key:
+        return insert_post(db, post, current_user, background_tasks)
+
+    keys = IdempotencyService(db)
+    fingerprint = request_hash("POST /posts/", post.model_dump(mode="json"))
+    created_id = keys.acquire(current_user.id, idempotency_key, fingerprint)
+    if created_id:
+        response.headers["Idempotent-Replayed"] = "true"
+        posts = PostService(db).get_posts_by_ids([created_id])
+        if not posts:
+            raise HTTPException(status_code=404, detail="Post not found")
+        return PostResponse.from_post(posts[0])
+
+    try:
+        return insert_post(db, post, current_user, background_tasks, idempotency_key)
+    except Exception:
+        keys.release(current_user.id, idempotency_key)
+        raise
+
+
+def insert_post(
+    db: Session,
+    post: PostCreate,
+    current_user: UserResponse,
+    background_tasks: BackgroundTasks,
+    idempotency_key: Optional[str] = None,
+) -> PostResponse:
     # Check if slug already exists
     existing_post = db.query(Post).filter(Post.slug == post.slug).first()
     if existing_post:
@@ -174,6 +473,13 @@ def create_post(
                 status_code=403, detail="You can only use media files you've uploaded"
             )
 
+    if post.status == "published":
+        published_at = datetime.now(UTC)
+    elif post.status == "scheduled":
+        published_at = validate_schedule(post.published_at)
+    else:
+        published_at = None
+
     db_post = Post(
         title=post.title,
         slug=post.slug,
@@ -184,12 +490,20 @@ def create_post(
         content_media_id=post.content_media_id,
         created_by_id=current_user.id,
         meta_data=post.meta_data or {},
-        published_at=datetime.now(UTC) if post.status == "published" else None,
+        published_at=published_at,
     )
 
     db.add(db_post)
+    CounterService(db).apply_change(None, post_counter_keys(db_post))
+    RevisionService(db).record(db_post, None, current_user.id)
+    MediaUsageService(db).sync_post(db_post)
+    LinkService(db).sync_post(db_post)
+    if idempotency_key:
+        IdempotencyService(db).complete(current_user.id, idempotency_key, db_post.id)
     db.commit()
     db.refresh(db_post)
+    if db_post.tags:
+        background_tasks.add_task(refresh_related, [db_post.id], db_post.tags)
 
     # Load the created_by relationship
     db.refresh(db_post)
@@ -219,10 +533,15 @@ def create_post(
     )
 
 
-@router.put("/{post_id}", response_model=PostResponse)
+@router.put(
+    "/{post_id}",
+    response_model=PostResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_write))],
+)
 def update_post(
     post_id: UUID,
     post_update: PostUpdate,
+    background_tasks: BackgroundTasks,
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -242,19 +561,41 @@ def update_post(
 
     update_data = post_update.model_dump(exclude_unset=True)
 
+    # published_at is only settable for scheduled posts
+    new_status = update_data.get("status", post.status)
+    requested_published_at = update_data.pop("published_at", post.published_at)
+
     # Handle status change to published
-    if (
-        "status" in update_data
-        and update_data["status"] == "published"
-        and post.status != "published"
-    ):
+    if new_status == "published" and post.status != "published":
         update_data["published_at"] = datetime.now(UTC)
-
+    elif new_status == "scheduled":
+        # Check the time only when (re)scheduling; other edits of an overdue
+        # scheduled post keep its stored time for the scheduler to pick up
+        if post.status != "scheduled" or "published_at" in post_update.model_fields_set:
+            update_data["published_at"] = validate_schedule(requested_published_at)
+    elif post.status == "scheduled":
+        # Unscheduled (back to draft/archived)
+        update_data["published_at"] = None
+
+    old_counter_keys = post_counter_keys(post)
+    old_state = post_state(post)
+    old_content_media_id = post.content_media_id
+    old_tags, old_status = list(post.tags or []), post.status
     for field, value in update_data.items():
         setattr(post, field, value)
 
+    CounterService(db).apply_change(old_counter_keys, post_counter_keys(post))
+    RevisionService(db).record(post, old_state, current_user.id)
+    MediaUsageService(db).sync_post(post)
+    LinkService(db).sync_post(
+        post, content_changed=post.content_media_id != old_content_media_id
+    )
     db.commit()
     db.refresh(post)
+    if related_changed(old_tags, old_status, post):
+        background_tasks.add_task(
+            refresh_related, [post.id], old_tags + list(post.tags or [])
+        )
 
     return PostResponse(
         id=str(post.id),
@@ -280,9 +621,12 @@ def update_post(
     )
 
 
-@router.delete("/{post_id}")
+@router.delete(
+    "/{post_id}", dependencies=[Depends(rate_limit(settings.rate_limit_write))]
+)
 def delete_post(
     post_id: UUID,
+    background_tasks: BackgroundTasks,
     current_user: UserResponse = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
@@ -297,7 +641,226 @@ def delete_post(
             status_code=403, detail="You can only delete your own posts"
         )
 
+    CounterService(db).apply_change(post_counter_keys(post), None)
+    tags = list(post.tags or [])
     db.delete(post)
     db.commit()
+    if tags:
+        # Posts that listed this one are a related post short now
+        background_tasks.add_task(refresh_related, [], tags)
 
     return {"message": "Post deleted successfully"}
+
+
+def get_own_post(db: Session, post_id: UUID, current_user: UserResponse) -> Post:
+    """Load a post for history endpoints: 404 if missing, 403 unless owned"""
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post:
+        raise HTTPException(status_code=404, detail="Post not found")
+    if post.created_by_id != current_user.id:
+        raise HTTPException(
+            status_code=403, detail="You can only view the history of your own posts"
+        )
+    return post
+
+
+@router.get(
+    "/{post_id}/revisions",
+    response_model=List[PostRevisionSummary],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def list_post_revisions(
+    post_id: UUID,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """List a post's revisions, newest first"""
+    get_own_post(db, post_id, current_user)
+    return [
+        PostRevisionSummary.from_revision(revision)
+        for revision in RevisionService(db).list_revisions(post_id)
+    ]
+
+
+@router.get(
+    "/{post_id}/revisions/{revision}",
+    response_model=PostRevisionResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_post_revision(
+    post_id: UUID,
+    revision: int,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Get a post as it was at a given revision"""
+    get_own_post(db, post_id, current_user)
+    state = RevisionService(db).get_state(post_id, revision)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+    return PostRevisionResponse(revision=revision, **state)
+
+
+@router.post(
+    "/{post_id}/revisions/{revision}/restore",
+    response_model=PostResponse,
+    dependencies=[Depends(rate_limit(settings.rate_limit_write))],
+)
+def restore_post_revision(
+    post_id: UUID,
+    revision: int,
+    background_tasks: BackgroundTasks,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """Restore a revision's content as a new revision (status is left as is)"""
+    post = get_own_post(db, post_id, current_user)
+    revisions = RevisionService(db)
+    state = revisions.get_state(post_id, revision)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Revision not found")
+
+    restored = {field: state.get(field) for field in RESTORABLE_FIELDS}
+    restored["tags"] = restored["tags"] or []
+    if restored["content_media_id"]:
+        restored["content_media_id"] = UUID(restored["content_media_id"])
+        if (
+            not db.query(Media.id)
+            .filter(Media.id == restored["content_media_id"])
+            .first()
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail="Content media of this revision no longer exists",
+            )
+    if restored["slug"] != post.slug and (
+        db.query(Post.id).filter(Post.slug == restored["slug"]).first()
+    ):
+        raise HTTPException(
+            status_code=400, detail="Post with this slug already exists"
+        )
+
+    old_counter_keys = post_counter_keys(post)
+    old_state = post_state(post)
+    old_content_media_id = post.content_media_id
+    old_tags, old_status = list(post.tags or []), post.status
+    for field, value in restored.items():
+        setattr(post, field, value)
+
+    CounterService(db).apply_change(old_counter_keys, post_counter_keys(post))
+    revisions.record(post, old_state, current_user.id)
+    MediaUsageService(db).sync_post(post)
+    LinkService(db).sync_post(
+        post, content_changed=post.content_media_id != old_content_media_id
+    )
+    db.commit()
+    if related_changed(old_tags, old_status, post):
+        background_tasks.add_task(
+            refresh_related, [post.id], old_tags + list(post.tags or [])
+        )
+
+    post = PostService(db).get_posts_by_ids([post_id])[0]
+    return PostResponse.from_post(post)
+
+
+def get_visible_post(db: Session, post_id: UUID, current_user: UserResponse) -> Post:
+    """Load a post for link endpoints: 404 if missing or not visible"""
+    post = db.query(Post).filter(Post.id == post_id).first()
+    if not post or not can_view_post(post, current_user):
+        raise HTTPException(status_code=404, detail="Post not found")
+    return post
+
+
+@router.get(
+    "/{post_id}/backlinks",
+    response_model=List[LinkedPost],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_post_backlinks(
+    post_id: UUID,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Posts that link to this one"""
+    get_visible_post(db, post_id, current_user)
+    return [
+        LinkedPost.from_post(source)
+        for source in LinkService(db).backlinks(post_id)
+        if can_view_post(source, current_user)
+    ]
+
+
+@router.get(
+    "/{post_id}/outlinks",
+    response_model=List[OutLink],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_post_outlinks(
+    post_id: UUID,
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Links from this post; targets not written yet (or hidden) have no post"""
+    get_visible_post(db, post_id, current_user)
+    return [
+        OutLink(
+            target_slug=link.target_slug,
+            source=link.source,
+            post=(
+                LinkedPost.from_post(target)
+                if target and can_view_post(target, current_user)
+                else None
+            ),
+        )
+        for link, target in LinkService(db).outlinks(post_id)
+    ]
+
+
+@router.get(
+    "/{post_id}/graph",
+    response_model=LinkGraph,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_post_graph(
+    post_id: UUID,
+    depth: int = Query(1, ge=1, le=settings.link_graph_max_depth),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Posts within depth links of this one (either direction) and their links"""
+    get_visible_post(db, post_id, current_user)
+    depths, edges = LinkService(db).neighborhood(
+        post_id, current_user.id, depth, settings.link_graph_max_nodes
+    )
+    posts = db.query(Post).filter(Post.id.in_(depths)).all()
+    return LinkGraph(
+        nodes=sorted(
+            (
+                GraphNode(
+                    **LinkedPost.from_post(post).model_dump(), depth=depths[post.id]
+                )
+                for post in posts
+            ),
+            key=lambda node: (node.depth, node.title),
+        ),
+        edges=[GraphEdge(source=str(a), target=str(b)) for a, b in edges],
+    )
+
+
+@router.get(
+    "/{post_id}/related",
+    response_model=List[PostResponse],
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_related_posts(
+    post_id: UUID,
+    limit: int = Query(5, ge=1, le=settings.related_posts_k),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """Published posts with the most similar tags (precomputed)"""
+    get_visible_post(db, post_id, current_user)
+    return [
+        PostResponse.from_post(post)
+        for post in RelatedService(db).get_related(post_id, limit)
+    ]
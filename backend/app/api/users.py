@@ -0,0 +1,104 @@
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload
+from typing import Optional
+from uuid import UUID
+
+from ..core.config import settings
+from ..core.database import get_read_db
+from ..core.rate_limit import rate_limit
+from ..models.post import Post
+from ..models.user import User
+from ..schemas.post import PostPage, PostResponse
+from ..schemas.user import UserProfile, UserResponse
+from ..services.counter_service import CounterService
+from .auth import get_current_user  # , get_optional_user
+from .params import decode_cursor, encode_cursor
+
+router = APIRouter(prefix="/users", tags=["users"])
+
+
+def get_user_by_username(db: Session, username: str) -> User:
+    """Newest account with the username (idx_users_username); 404 if none"""
+    user = (
+        db.query(User)
+        .filter(User.username == username)
+        .order_by(User.created_at.desc())
+        .first()
+    )
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+@router.get(
+    "/{username}",
+    response_model=UserProfile,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def get_user_profile(
+    username: str,
+    # current_user: Optional[UserResponse] = Depends(get_optional_user),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """An author's public profile"""
+    user = get_user_by_username(db, username)
+    return UserProfile(
+        username=user.username,
+        avatar_url=user.avatar_url,
+        created_at=user.created_at,
+        published_posts=CounterService(db).get_author_count(
+            "post", user.id, "published"
+        ),
+    )
+
+
+@router.get(
+    "/{username}/posts",
+    response_model=PostPage,
+    dependencies=[Depends(rate_limit(settings.rate_limit_read))],
+)
+def list_user_posts(
+    username: str,
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    # current_user: Optional[UserResponse] = Depends(get_optional_user),
+    current_user: UserResponse = Depends(get_current_user),
+    db: Session = Depends(get_read_db),
+):
+    """An author's published posts, newest first
+
+    One range scan on idx_posts_author_published. Pages continue from
+    `next_cursor` (after the last post's published_at and id) instead of an
+    offset, so deep pages cost the same as the first. Published posts
+    without a published_at (from before it was always set) can't be placed
+    in that order and are left out.
+    """
+    user = get_user_by_username(db, username)
+    query = (
+        db.query(Post)
+        .options(joinedload(Post.content_media), joinedload(Post.created_by))
+        .filter(
+            Post.created_by_id == user.id,
+            Post.status == "published",
+            Post.published_at.is_not(None),
+        )
+    )
+    if cursor:
+        published_at, post_id = decode_cursor(cursor, 2)
+        try:
+            after = (datetime.fromisoformat(published_at), UUID(post_id))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(Post.published_at, Post.id) < after)
+
+    posts = (
+        query.order_by(Post.published_at.desc(), Post.id.desc()).limit(limit + 1).all()
+    )
+    page = PostPage(items=[PostResponse.from_post(post) for post in posts[:limit]])
+    if len(posts) > limit:
+        last = posts[limit - 1]
+        page.next_cursor = encode_cursor(last.published_at.isoformat(), last.id)
+    return page
@@ -0,0 +1,35 @@
+import asyncio
+import logging
+import random
+from typing import Callable, List
+
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_periodically(name: str, interval: float, job: Callable[[], object]):
+    # Jittered first run so workers started together don't all fire at once
+    await asyncio.sleep(random.uniform(0, interval))
+    while True:
+        try:
+            await run_in_threadpool(job)
+        except Exception:
+            logger.exception("Background job %s failed", name)
+        await asyncio.sleep(interval)
+
+
+def start_periodic(name: str, interval: float, job: Callable[[], object]):
+    """Run a blocking job every `interval` seconds in the threadpool
+
+    Every worker runs its own copy, so jobs must be safe to run concurrently
+    (e.g. claim rows with FOR UPDATE SKIP LOCKED).
+    """
+    return asyncio.create_task(_run_periodically(name, interval, job), name=name)
+
+
+async def stop_periodic(tasks: List[asyncio.Task]):
+    """Cancel periodic jobs and wait for them to finish"""
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,82 @@
+from sqlalchemy import event, insert, text
+from .config import settings
+from .database import SessionLocal
+from .live import NOTIFY, broker
+
+# Session hooks writing post/media changes to change_log (read by
+# change_service). Registered by core.database, so they run in every process.
+# Models are matched by table name: importing them here would be circular.
+
+# Tables whose writes go to the change log, by entity name
+TRACKED = {"posts": "post", "media": "media"}
+
+# Taken right before commit and held through it, so change_log seqs are
+# committed in the order they're assigned
+CHANGE_LOG_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('change_log'))")
+
+
+def _change_key(obj):
+    entity = TRACKED.get(getattr(obj, "__tablename__", None))
+    return (entity, obj.id) if entity else None
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _collect_changes(session, flush_context):
+    """Remember which posts/media this transaction created, updated or deleted"""
+    changes = session.info.setdefault("changes", {})
+    for obj in session.new:
+        key = _change_key(obj)
+        if key:
+            changes[key] = "created"
+    for obj in session.dirty:
+        key = _change_key(obj)
+        if key and session.is_modified(obj, include_collections=False):
+            changes.setdefault(key, "updated")
+    for obj in session.deleted:
+        key = _change_key(obj)
+        if key and changes.get(key) == "created":
+            del changes[key]  # Never visible outside this transaction
+        elif key:
+            changes[key] = "deleted"
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _write_changes(session):
+    session.flush()
+    changes = session.info.pop("changes", None)
+    if not changes:
+        return
+
+    from ..models.change import ChangeLogEntry
+
+    session.execute(CHANGE_LOG_LOCK)
+    seqs = session.execute(
+        insert(ChangeLogEntry)
+        .values(
+            [
+                {"entity": entity, "entity_id": entity_id, "action": action}
+                for (entity, entity_id), action in changes.items()
+            ]
+        )
+        .returning(ChangeLogEntry.seq)
+    ).scalars()
+    latest = max(seqs)
+    if settings.live_updates_backend == "postgres":
+        # Delivered to every worker's listener when (and only if) this commits
+        session.execute(NOTIFY, {"seq": latest})
+    else:
+        session.info["live_seq"] = latest
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _push_changes(session):
+    seq = session.info.pop("live_seq", None)
+    if seq is not None:
+        broker.publish_threadsafe(seq)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _discard_changes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("changes", None)
+        session.info.pop("live_seq", None)
@@ -1,5 +1,5 @@
 import os
-from typing import List
+from typing import List, Optional
 
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
@@ -8,6 +8,17 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     database_url: str
+    database_read_url: Optional[str] = None  # Read replica for safe GETs
+    read_your_writes_seconds: float = 5.0  # Keep a client on the primary after a write
+
+    # Connection pool (per process, per engine)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 2.0  # Wait this long for a connection, then 503
+    db_pool_recycle: int = 300
+    db_pool_pre_ping: bool = True
+    db_pooler_mode: bool = False  # True behind pgbouncer/Supavisor transaction mode
+    db_pool_retry_after: int = 2  # Retry-After seconds sent with pool 503s
 
     # Supabase Configuration
     supabase_url: str
@@ -27,8 +38,22 @@ class Settings(BaseSettings):
     github_client_secret: str
     redirect_uri: str
 
-    # File Storage
+    # Outbound HTTP (GitHub OAuth, etc.)
+    http_http2: bool = True
+    http_timeout: float = 10.0
+    http_connect_timeout: float = 5.0
+    http_retries: int = 2
+    http_max_connections: int = 20
+    http_max_keepalive_connections: int = 10
+    http_keepalive_expiry: float = 30.0
+
+    # File Storage. storage_backend "local" keeps files under
+    # local_storage_path (served at /storage) instead of Supabase
+    storage_backend: str = "supabase"
+    local_storage_path: str = "./storage"
+    local_storage_url: str = "http://localhost:8000/storage"
     storage_bucket: str = "media"
+    storage_timeout: int = 60
     max_file_size: int = 5242880  # 5MB
     allowed_file_types: List[str] = [
         "image/jpeg",
@@ -46,21 +71,126 @@ class Settings(BaseSettings):
         "model/gltf-binary",
         "application/octet-stream",
         "text/plain",
+        "text/markdown",
         "application/pdf",
     ]
 
+    # Batch reads
+    max_batch_get_ids: int = 100
+
+    # List totals/facets (include=total,facets)
+    facet_value_limit: int = 50
+
     # CORS - Environment-specific
     allowed_origins: List[str]
 
     # Frontend URL
     frontend_url: str
 
+    # Rate limiting: per route and per user (or IP when anonymous). Storage is
+    # memory:// (per process; app.server swaps it for a shared SQLite file when
+    # running several workers), sqlite:///path.db (one host) or redis://host:6379
+    rate_limit_enabled: bool = True
+    rate_limit_storage_uri: str = "memory://"
+    rate_limit_read: str = "300/minute"
+    rate_limit_write: str = "60/minute"
+    rate_limit_upload: str = "10/minute"
+    rate_limit_auth: str = "10/minute"
+
+    # Rendered post bodies (GET /posts/{id}/content, include=content)
+    content_cache_max_entries: int = 512
+    content_cache_max_bytes: int = 64 * 1024 * 1024
+    content_render_max_bytes: int = 2 * 1024 * 1024
+    content_fetch_concurrency: int = 8
+
+    # Link graph (GET /posts/{id}/graph): hops and nodes per request
+    link_graph_max_depth: int = 3
+    link_graph_max_nodes: int = 200
+
+    # Related posts (GET /posts/{id}/related): top K by tag Jaccard similarity,
+    # recomputed for this many posts per batch after tag/status changes
+    related_posts_k: int = 10
+    related_batch_size: int = 500
+
+    # Change feed (GET /changes): max log entries per page
+    change_feed_max_limit: int = 500
+
+    # Live updates (GET /changes/stream). "postgres" fans out across workers
+    # with LISTEN/NOTIFY; "local" only reaches this process's connections.
+    # LISTEN needs a session connection, so behind a transaction pooler set
+    # live_listen_url to a direct one
+    live_updates_backend: str = "postgres"
+    live_listen_url: Optional[str] = None
+    live_max_connections: int = 1000  # Per worker
+    live_heartbeat_seconds: float = 15.0
+
+    # Post history: full snapshot every N revisions, merge patches in between
+    revision_snapshot_interval: int = 10
+
+    # Background jobs (run in every worker, see core/background.py)
+    scheduler_enabled: bool = True
+    publish_scheduled_interval: float = 30.0  # Seconds between due-post scans
+    publish_batch_size: int = 100
+
+    # Media GC: delete unpublished media no post references once older than
+    # the grace period. Dry run only reports candidates (see /health/media-gc)
+    media_gc_enabled: bool = True
+    media_gc_dry_run: bool = True
+    media_gc_grace_hours: int = 72
+    media_gc_pending_hours: int = 6  # Direct uploads never completed
+    media_gc_interval: float = 3600.0
+    media_gc_batch_size: int = 100
+
+    # Job queue (jobs table): side effects like storage deletes are enqueued
+    # with the DB write and run by job workers, in each API worker when
+    # job_worker_enabled and/or by `python -m app.worker`. Failed jobs retry
+    # with exponential backoff, then move to dead_jobs
+    job_worker_enabled: bool = True
+    job_poll_interval: float = 5.0  # Seconds between polls when idle
+    job_batch_size: int = 20
+    job_lease_seconds: int = 300  # Claimed jobs become due again after this
+    job_max_attempts: int = 8
+    job_backoff_base: float = 10.0  # Seconds; doubles every attempt
+    job_backoff_max: float = 3600.0
+
+    # Idempotency-Key on POST /posts/ and /media/upload: retries within the
+    # TTL get the first response's resource back. A duplicate arriving while
+    # the first is running waits up to idempotency_wait_seconds; a request
+    # that died releases its key after idempotency_lock_seconds
+    idempotency_ttl_hours: int = 24
+    idempotency_wait_seconds: float = 10.0
+    idempotency_lock_seconds: int = 60
+    idempotency_purge_interval: float = 3600.0
+    idempotency_purge_batch_size: int = 1000
+
+    # Startup: the schema is managed by Alembic (`alembic upgrade head`).
+    # Local dev only: true creates missing tables once in the lifespan hook,
+    # which Alembic can't upgrade afterwards without `alembic stamp`.
+    schema_auto_create: bool = False
+    migration_lock_timeout: str = "5s"
+
     # Railway
     port: int = int(os.getenv("PORT", 8000))
 
+    # Server (python -m app.server): workers default to the usable CPUs.
+    # db_max_connections is the Postgres connection budget split across
+    # workers (per database, so a replica gets the same budget). Each worker
+    # gets budget // workers = pool_size + max_overflow + 1 LISTEN connection
+    # (live_updates_backend "postgres"); its periodic jobs share the pool.
+    # `python -m app.worker` processes need their own budget on top
+    web_concurrency: Optional[int] = None
+    db_max_connections: Optional[int] = None
+    graceful_shutdown_timeout: int = 30  # Seconds to drain in-flight requests
+    # Proxies trusted for X-Forwarded-For/-Proto; the client address feeds rate
+    # limit keys. Set it to the load balancer's address (or "*" only when the
+    # app can't be reached except through the proxy)
+    forwarded_allow_ips: str = "127.0.0.1"
+
     # Validations
-    @field_validator("database_url")
+    @field_validator("database_url", "database_read_url")
     def validate_database_url(cls, v):
+        if v is None:
+            return v
         if not v.startswith(("postgresql+psycopg2://", "postgres+psycopg2://")):
             raise ValueError("DATABASE_URL must be a valid PostgreSQL + PsycoPG2 URL")
         return v
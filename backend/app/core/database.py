@@ -1,28 +1,252 @@
-from sqlalchemy import create_engine
+import hashlib
+import hmac
+import math
+import threading
+import time
+from typing import Optional
+
+from fastapi import Depends, Request, Response
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool, QueuePool
 from .config import settings
 
 # Railway + Supabase optimized connection
 
-engine = create_engine(
-    settings.database_url,
-    poolclass=QueuePool,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,  # Handles connection drops
-    pool_recycle=300,  # Recycle connections every 5 minutes
-    echo=False,
+
+class PoolMetrics:
+    """Checkout counters for one engine's pool, for sizing from measurements"""
+
+    def __init__(self, name: str, engine):
+        self.name = name
+        self.engine = engine
+        self.checkouts = 0
+        self.connects = 0
+        self.peak_checked_out = 0
+        self._checked_out = 0
+        self._lock = threading.Lock()
+
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        with self._lock:
+            self.connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        with self._lock:
+            self.checkouts += 1
+            self._checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self._checked_out)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        with self._lock:
+            self._checked_out = max(0, self._checked_out - 1)
+
+    def snapshot(self) -> dict:
+        pool = self.engine.pool
+        stats = {
+            "pool": type(pool).__name__,
+            "checked_out": self._checked_out,
+            "peak_checked_out": self.peak_checked_out,
+            "checkouts": self.checkouts,
+            "connects": self.connects,
+        }
+        if isinstance(pool, QueuePool):
+            stats.update(
+                size=pool.size(),
+                max_overflow=pool._max_overflow,
+                idle=pool.checkedin(),
+                overflow=pool.overflow(),
+                timeout=pool.timeout(),
+            )
+        return stats
+
+
+def _create_engine(url: str):
+    if settings.db_pooler_mode:
+        # Behind Supabase's pgbouncer/Supavisor in transaction mode the pooler
+        # owns the connections, so don't hold a second pool here. psycopg2
+        # never uses server-side prepared statements, so there is no
+        # statement cache to turn off.
+        return create_engine(url, poolclass=NullPool, echo=False)
+
+    return create_engine(
+        url,
+        poolclass=QueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        # Fail fast when exhausted; the app turns this into a 503
+        pool_timeout=settings.db_pool_timeout,
+        pool_pre_ping=settings.db_pool_pre_ping,  # Handles connection drops
+        pool_recycle=settings.db_pool_recycle,  # Recycle connections every 5 minutes
+        echo=False,
+    )
+
+
+engine = _create_engine(settings.database_url)
+
+# Read replica for safe GETs; falls back to the primary when not configured
+read_engine = (
+    _create_engine(settings.database_read_url) if settings.database_read_url else engine
 )
 
+pool_metrics = {"primary": PoolMetrics("primary", engine)}
+if read_engine is not engine:
+    pool_metrics["replica"] = PoolMetrics("replica", read_engine)
+
+# Requests shed with a 503 because no connection freed up within pool_timeout
+pool_timeouts = 0
+
+
+def record_pool_timeout():
+    global pool_timeouts
+    pool_timeouts += 1
+
+
+def get_pool_stats() -> dict:
+    """Current pool usage for every engine, plus shed-request count"""
+    return {
+        "engines": {name: metrics.snapshot() for name, metrics in pool_metrics.items()},
+        "timeouts": pool_timeouts,
+    }
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
 
-def get_db():
+def load_models():
+    """Import every model module so Base.metadata knows all tables"""
+    from ..models import (  # noqa: F401
+        post,
+        media,
+        user,
+        counter,
+        revision,
+        media_usage,
+        link,
+        related,
+        change,
+        job,
+        idempotency,
+    )
+
+
+def dispose_engines():
+    """Close pooled connections so Postgres frees them right away on shutdown"""
+    read_engine.dispose()
+    engine.dispose()
+
+
+def init_schema():
+    """Create any missing tables in one pass (all models share Base)"""
+    load_models()
+    Base.metadata.create_all(bind=engine)
+
+
+# Read-your-writes: a response to a request that committed a write carries a
+# signed "read from the primary until T" token, as a cookie and a header (for
+# clients without cookies to echo back). The client holds the deadline, so it
+# works whichever worker or host serves the next read.
+PRIMARY_UNTIL_COOKIE = "cms_primary_until"
+PRIMARY_UNTIL_HEADER = "X-Primary-Until"
+
+
+def sign_primary_until(until: int) -> str:
+    message = f"primary-until:{until}".encode()
+    signature = hmac.new(settings.secret_key.encode(), message, hashlib.sha256)
+    return f"{until}.{signature.hexdigest()}"
+
+
+def primary_until(token: Optional[str]) -> int:
+    """Deadline (unix seconds) in a validly signed token, else 0"""
+    until, _, _ = (token or "").partition(".")
+    if not until.isdigit() or not hmac.compare_digest(
+        token, sign_primary_until(int(until))
+    ):
+        return 0
+    return int(until)
+
+
+def pinned_to_primary(request: Request) -> bool:
+    token = request.cookies.get(PRIMARY_UNTIL_COOKIE) or request.headers.get(
+        PRIMARY_UNTIL_HEADER
+    )
+    return primary_until(token) > time.time()
+
+
+def pin_to_primary(request: Request, response: Response):
+    """Hand the client its primary deadline if the request committed a write"""
+    until = getattr(request.state, "primary_until", None)
+    if until is None:
+        return
+    token = sign_primary_until(until)
+    response.headers[PRIMARY_UNTIL_HEADER] = token
+    response.set_cookie(
+        PRIMARY_UNTIL_COOKIE,
+        token,
+        max_age=max(1, math.ceil(until - time.time())),
+        httponly=True,
+        secure=request.url.scheme == "https",
+        samesite="lax",
+    )
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _flag_orm_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    state = orm_execute_state
+    if state.is_insert or state.is_update or state.is_delete:
+        state.session.info["wrote"] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _record_write(session):
+    state = session.info.get("request_state")
+    if session.info.pop("wrote", False) and state is not None:
+        state.primary_until = math.ceil(time.time() + settings.read_your_writes_seconds)
+
+
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["request_state"] = request.state
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db(request: Request, db: Session = Depends(get_db)):
+    """Session for read-only work: the replica for safe GETs, else the primary
+
+    Unsafe methods and clients that committed a write within
+    READ_YOUR_WRITES_SECONDS (see pin_to_primary) share the request's primary
+    session.
+    """
+    if (
+        read_engine is engine
+        or request.method not in ("GET", "HEAD")
+        or pinned_to_primary(request)
+    ):
+        yield db
+        return
+
+    read_db = ReadSessionLocal()
+    try:
+        yield read_db
+    finally:
+        read_db.close()
+
+
+# Change log hooks on SessionLocal. Imported last, as they need SessionLocal:
+# every process that writes posts/media logs its changes, not only those that
+# load the API routers
+from . import change_log  # noqa: E402,F401
@@ -0,0 +1,42 @@
+import httpx
+from fastapi import Request
+from typing import Optional
+from .config import settings
+
+
+def create_http_client(
+    transport: Optional[httpx.AsyncBaseTransport] = None,
+) -> httpx.AsyncClient:
+    """Build the app-lifetime pooled client used for all outbound HTTP calls
+
+    Pass a transport (e.g. httpx.MockTransport) to keep tests off the network.
+    """
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(
+            http2=settings.http_http2,
+            retries=settings.http_retries,  # Retries failed connects only
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_keepalive_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+
+    return httpx.AsyncClient(
+        transport=transport,
+        timeout=httpx.Timeout(
+            settings.http_timeout, connect=settings.http_connect_timeout
+        ),
+    )
+
+
+async def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Dependency returning the shared client, created on first use
+
+    Async so it runs on the event loop: concurrent first requests can't each
+    build a client (and leak the loser). The app lifespan closes it on shutdown.
+    """
+    client = getattr(request.app.state, "http_client", None)
+    if client is None:
+        client = request.app.state.http_client = create_http_client()
+    return client
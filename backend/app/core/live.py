@@ -0,0 +1,175 @@
+import asyncio
+import logging
+from typing import Optional, Set
+
+import psycopg2
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Postgres channel carrying the latest change_log seq after each commit
+CHANNEL = "content_changes"
+NOTIFY = text(f"SELECT pg_notify('{CHANNEL}', CAST(:seq AS text))")
+
+
+class BrokerFull(Exception):
+    """No room for another live connection in this worker"""
+
+
+class Subscriber:
+    """One live connection: holds at most the newest unsent change token
+
+    Tokens only grow and each one covers everything before it, so a slow
+    client skips straight to the newest instead of queueing a backlog.
+    """
+
+    def __init__(self):
+        self.pending: Optional[int] = None
+        self.closed = False
+        self._ready = asyncio.Event()
+
+    def push(self, seq: int):
+        if self.pending is None or seq > self.pending:
+            self.pending = seq
+        self._ready.set()
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def next(self, timeout: float) -> Optional[int]:
+        """Newest token, or None after timeout (time for a heartbeat)"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self._ready.clear()
+        seq, self.pending = self.pending, None
+        return seq
+
+
+class LiveBroker:
+    """Fans change tokens out to this worker's live connections
+
+    With live_updates_backend "postgres", tokens arrive via LISTEN on one
+    dedicated connection per worker (writers NOTIFY in their commit), so
+    every worker hears every write. "local" only sees this process's writes,
+    for single-worker setups.
+    """
+
+    def __init__(self, max_subscribers: int):
+        self.max_subscribers = max_subscribers
+        self.subscribers: Set[Subscriber] = set()
+        self.latest: Optional[int] = None
+        self.published = 0
+        self.rejected = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listener: Optional[asyncio.Task] = None
+
+    def subscribe(self) -> Subscriber:
+        if len(self.subscribers) >= self.max_subscribers:
+            self.rejected += 1
+            raise BrokerFull()
+        subscriber = Subscriber()
+        self.subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, seq: int):
+        """Push a token to every connection (event loop thread only)"""
+        if self.latest is not None and seq <= self.latest:
+            return
+        self.latest = seq
+        self.published += 1
+        for subscriber in self.subscribers:
+            subscriber.push(seq)
+
+    def publish_threadsafe(self, seq: int):
+        """publish() from a worker thread (local backend, after commit)"""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.publish, seq)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        if settings.live_updates_backend == "postgres":
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        """Stop listening and end every open stream"""
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for subscriber in list(self.subscribers):
+            subscriber.close()
+        self._loop = None
+
+    async def _listen(self):
+        """LISTEN on a dedicated connection, reconnecting with backoff"""
+        dsn = (
+            make_url(settings.live_listen_url or settings.database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        loop = asyncio.get_running_loop()
+        delay = 1.0
+        while True:
+            conn = None
+            try:
+                conn = await loop.run_in_executor(None, psycopg2.connect, dsn)
+                conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {CHANNEL}")
+                    # Anything committed while we weren't listening
+                    cur.execute("SELECT max(seq) FROM change_log")
+                    (latest,) = cur.fetchone()
+                if latest is not None:
+                    self.publish(latest)
+                delay = 1.0
+
+                readable = asyncio.Event()
+                fd = conn.fileno()
+                loop.add_reader(fd, readable.set)
+                try:
+                    while True:
+                        await readable.wait()
+                        readable.clear()
+                        conn.poll()
+                        seqs = [int(notify.payload) for notify in conn.notifies]
+                        conn.notifies.clear()
+                        if seqs:
+                            self.publish(max(seqs))
+                finally:
+                    loop.remove_reader(fd)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Live updates listener failed, retrying")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                if conn is not None:
+                    conn.close()
+
+    def stats(self) -> dict:
+        return {
+            "backend": settings.live_updates_backend,
+            "listening": self._listener is not None and not self._listener.done(),
+            "connections": len(self.subscribers),
+            "max_connections": self.max_subscribers,
+            "rejected": self.rejected,
+            "published": self.published,
+            "latest_seq": self.latest,
+        }
+
+
+broker = LiveBroker(settings.live_max_connections)
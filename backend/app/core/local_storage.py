@@ -0,0 +1,149 @@
+import hashlib
+import hmac
+import json
+import os
+import shutil
+import time
+import urllib.parse
+from typing import Any, Dict, List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from .config import settings
+
+# Filesystem stand-in for Supabase Storage (STORAGE_BACKEND=local), for local
+# development and benchmarks. Implements the bucket methods StorageService
+# uses, with the same call shapes as storage3's async client. Content types
+# live in a "<file>.meta.json" sidecar, like the object metadata Supabase keeps.
+
+META_SUFFIX = ".meta.json"
+SIGNED_UPLOAD_TTL = 2 * 60 * 60  # Same as Supabase signed upload URLs
+
+
+def sign_upload(bucket: str, path: str, expires_at: int) -> str:
+    message = f"{bucket}/{path}:{expires_at}".encode()
+    signature = hmac.new(settings.secret_key.encode(), message, hashlib.sha256)
+    return f"{expires_at}.{signature.hexdigest()}"
+
+
+def verify_upload_token(bucket: str, path: str, token: str) -> bool:
+    """Signed upload tokens are "<expires_at>.<hmac>" over bucket, path, expiry"""
+    expires_at, _, _ = token.partition(".")
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(token, sign_upload(bucket, path, int(expires_at)))
+
+
+class LocalBucket:
+    def __init__(self, root: str, bucket: str):
+        self.root = os.path.join(root, bucket)
+        self.bucket = bucket
+
+    def _full_path(self, path: str) -> str:
+        full_path = os.path.abspath(os.path.join(self.root, path))
+        if not full_path.startswith(os.path.abspath(self.root) + os.sep):
+            raise ValueError(f"Invalid storage path: {path}")
+        return full_path
+
+    def _write(self, path: str, content: bytes, content_type: Optional[str]):
+        full_path = self._full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "wb") as f:
+            f.write(content)
+        self.write_meta(path, content_type)
+
+    def write_meta(self, path: str, content_type: Optional[str]):
+        with open(self._full_path(path) + META_SUFFIX, "w") as f:
+            json.dump({"mimetype": content_type}, f)
+
+    def open_for_write(self, path: str):
+        """Binary file handle for streaming an upload to disk"""
+        full_path = self._full_path(path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        return open(full_path, "wb")
+
+    def _read(self, path: str) -> bytes:
+        with open(self._full_path(path), "rb") as f:
+            return f.read()
+
+    def _remove(self, paths: List[str]) -> List[Dict[str, Any]]:
+        removed = []
+        for path in paths:
+            try:
+                os.remove(self._full_path(path))
+                removed.append({"name": path})
+            except FileNotFoundError:
+                continue
+            try:
+                os.remove(self._full_path(path) + META_SUFFIX)
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _list(self, path: str, search: str) -> List[Dict[str, Any]]:
+        folder = self._full_path(path) if path else self.root
+        if not os.path.isdir(folder):
+            return []
+        files = []
+        for entry in os.scandir(folder):
+            if not entry.is_file() or entry.name.endswith(META_SUFFIX):
+                continue
+            if search and search not in entry.name:
+                continue
+            metadata = {"size": entry.stat().st_size, "mimetype": None}
+            try:
+                with open(entry.path + META_SUFFIX) as f:
+                    metadata.update(json.load(f))
+            except FileNotFoundError:
+                pass
+            files.append({"name": entry.name, "metadata": metadata})
+        return files
+
+    async def upload(
+        self, path: str, file: bytes, file_options: Optional[dict] = None
+    ) -> Dict[str, str]:
+        content_type = (file_options or {}).get("content-type")
+        await run_in_threadpool(self._write, path, file, content_type)
+        return {"Key": f"{self.bucket}/{path}"}
+
+    async def create_signed_upload_url(self, path: str) -> Dict[str, str]:
+        self._full_path(path)  # Validate
+        token = sign_upload(self.bucket, path, int(time.time()) + SIGNED_UPLOAD_TTL)
+        base_url = settings.local_storage_url.rstrip("/")
+        return {
+            "signed_url": f"{base_url}/upload/sign/{self.bucket}/{path}?"
+            + urllib.parse.urlencode({"token": token}),
+            "token": token,
+            "path": path,
+        }
+
+    async def get_public_url(self, path: str) -> str:
+        return f"{settings.local_storage_url.rstrip('/')}/{self.bucket}/{path}"
+
+    async def download(self, path: str) -> bytes:
+        return await run_in_threadpool(self._read, path)
+
+    async def remove(self, paths: List[str]) -> List[Dict[str, Any]]:
+        return await run_in_threadpool(self._remove, paths)
+
+    async def list(
+        self, path: Optional[str] = None, options: Optional[dict] = None
+    ) -> List[Dict[str, Any]]:
+        search = (options or {}).get("search", "")
+        return await run_in_threadpool(self._list, path or "", search)
+
+
+class LocalStorageClient:
+    def __init__(self, root: str):
+        self.root = root
+
+    def from_(self, bucket: str) -> LocalBucket:
+        return LocalBucket(self.root, bucket)
+
+    async def aclose(self):
+        pass
+
+
+def clear_local_storage():
+    """Delete everything under local_storage_path (benchmarks, dev resets)"""
+    shutil.rmtree(settings.local_storage_path, ignore_errors=True)
@@ -0,0 +1,138 @@
+import math
+import random
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+from fastapi import HTTPException, Request, status
+from limits import parse
+from limits.storage import Storage, storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+
+from .config import settings
+from .security import SecurityService
+
+
+class SQLiteStorage(Storage):
+    """Fixed-window counters in a SQLite file, shared by every worker on a host
+
+    `sqlite:///tmp/cms-ratelimit.db`. Use redis:// when workers span hosts.
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        self.path = uri[len("sqlite://") :] or ":memory:"
+        self._local = threading.local()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+        )
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # sqlite3 connections can't be shared across threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        now = time.time()
+        if random.random() < 0.01:
+            self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        row = self._conn.execute(
+            "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "count = CASE WHEN expires_at <= ? THEN excluded.count "
+            "ELSE count + excluded.count END, "
+            "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at "
+            "ELSE expires_at END "
+            "RETURNING count",
+            (key, amount, now + expiry, now, now),
+        ).fetchone()
+        return row[0]
+
+    def get(self, key: str) -> int:
+        row = self._conn.execute(
+            "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        row = self._conn.execute(
+            "SELECT expires_at FROM rate_limits WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else time.time()
+
+    def check(self) -> bool:
+        try:
+            self._conn.execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._conn.execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+
+# memory:// is per process (and the stand-in for tests); sqlite:// and
+# redis:// (or any Redis-compatible server) are shared across workers
+storage = storage_from_string(settings.rate_limit_storage_uri)
+limiter = FixedWindowRateLimiter(storage)
+
+
+def rate_limit_key(request: Request) -> str:
+    """The authenticated user (from the JWT, no DB lookup), else the client IP
+
+    Users are counted across all their IPs, so a spoofed or rotating address
+    doesn't buy a fresh budget. The IP is the proxy-resolved one: uvicorn only
+    honours X-Forwarded-For from FORWARDED_ALLOW_IPS.
+    """
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            return f"user:{SecurityService.verify_token(authorization[7:])}"
+        except HTTPException:
+            pass  # Invalid or expired tokens count as anonymous
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit(limit_value: str) -> Callable[[Request], None]:
+    """Route dependency enforcing a budget like "10/minute" per route and client
+
+    Add it via the route's `dependencies=[...]` so it runs before any other
+    dependency, and over-budget requests never reach the DB pool.
+    """
+    item = parse(limit_value)
+
+    def check_rate_limit(request: Request):
+        if not settings.rate_limit_enabled:
+            return
+
+        route = request.scope.get("route")
+        scope = f"{request.method}:{route.path if route else request.url.path}"
+        key = rate_limit_key(request)
+
+        if not limiter.hit(item, scope, key):
+            reset_at = limiter.get_window_stats(item, scope, key).reset_time
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Rate limit exceeded: {limit_value}",
+                headers={"Retry-After": str(max(1, math.ceil(reset_at - time.time())))},
+            )
+
+    return check_rate_limit
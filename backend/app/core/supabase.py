@@ -1,12 +1,58 @@
-from supabase import create_client, Client
+import httpx
+from storage3 import AsyncStorageClient
+from typing import Dict
 from .config import settings
 
-# Initialize Supabase client
 
-supabase: Client = create_client(settings.supabase_url, settings.supabase_anon_key)
+class PooledAsyncStorageClient(AsyncStorageClient):
+    """Async storage client whose httpx session uses the app's pool settings"""
 
-# Admin client for privileged operations
+    def _create_session(
+        self, base_url: str, headers: Dict[str, str], timeout: int
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=httpx.Timeout(timeout, connect=settings.http_connect_timeout),
+            transport=httpx.AsyncHTTPTransport(
+                http2=settings.http_http2,
+                retries=settings.http_retries,
+                limits=httpx.Limits(
+                    max_connections=settings.http_max_connections,
+                    max_keepalive_connections=settings.http_max_keepalive_connections,
+                    keepalive_expiry=settings.http_keepalive_expiry,
+                ),
+            ),
+        )
 
-admin_supabase: Client = create_client(
-    settings.supabase_url, settings.supabase_service_key
-)
+
+# Async storage clients, one per key, created on first use and closed in the
+# app lifespan. Every StorageService shares their connection pools.
+_storage_clients: Dict[bool, AsyncStorageClient] = {}
+
+
+def get_storage_client(use_admin: bool = False) -> AsyncStorageClient:
+    """Get the shared async storage client (service key when use_admin)"""
+    client = _storage_clients.get(use_admin)
+    if client is None and settings.storage_backend == "local":
+        from .local_storage import LocalStorageClient
+
+        client = _storage_clients[use_admin] = LocalStorageClient(
+            settings.local_storage_path
+        )
+    elif client is None:
+        key = settings.supabase_service_key if use_admin else settings.supabase_anon_key
+        client = PooledAsyncStorageClient(
+            f"{settings.supabase_url}/storage/v1",
+            {"apiKey": key, "Authorization": f"Bearer {key}"},
+            settings.storage_timeout,
+        )
+        _storage_clients[use_admin] = client
+    return client
+
+
+async def close_storage_clients():
+    """Close the shared storage clients' connection pools"""
+    for client in _storage_clients.values():
+        await client.aclose()
+    _storage_clients.clear()
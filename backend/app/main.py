@@ -1,25 +1,33 @@
-import os
 import logging
 import time
 
 from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from contextlib import asynccontextmanager
 
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-
 from .core.config import settings
-from .core.database import engine
-from .models import post, media, user
-from .api import posts, media as media_api, auth
-
-# Create tables
-
-post.Base.metadata.create_all(bind=engine)
-media.Base.metadata.create_all(bind=engine)
-user.Base.metadata.create_all(bind=engine)
+from .core.database import (
+    PRIMARY_UNTIL_HEADER,
+    SessionLocal,
+    dispose_engines,
+    get_pool_stats,
+    init_schema,
+    pin_to_primary,
+    record_pool_timeout,
+)
+from .core.background import start_periodic, stop_periodic
+from .core.live import broker
+from .core.single_flight import read_flight
+from .core.supabase import close_storage_clients
+from .services.content_service import content_cache
+from .services.idempotency_service import purge_idempotency_keys
+from .services.job_service import JobService, job_stats, run_pending_jobs
+from .services.media_usage_service import collect_orphaned_media, gc_stats
+from .services.post_service import publish_scheduled_posts
+from .api import posts, media as media_api, auth, changes, users
 
 
 @asynccontextmanager
@@ -29,8 +37,52 @@ async def lifespan(app: FastAPI):  # Startup
     for i, origin in enumerate(settings.allowed_origins):
         print(f"    [{i}] '{origin}' (len: {len(origin)}, repr: {repr(origin)})")
     print(f"🔍 DEBUG: settings.allowed_origins type: {type(settings.allowed_origins)}")
+
+    # Create tables (once, off the event loop)
+    if settings.schema_auto_create:
+        await run_in_threadpool(init_schema)
+
+    background_tasks = []
+    if settings.scheduler_enabled:
+        background_tasks.append(
+            start_periodic(
+                "publish-scheduled-posts",
+                settings.publish_scheduled_interval,
+                publish_scheduled_posts,
+            )
+        )
+    if settings.media_gc_enabled:
+        background_tasks.append(
+            start_periodic(
+                "collect-orphaned-media",
+                settings.media_gc_interval,
+                collect_orphaned_media,
+            )
+        )
+    if settings.job_worker_enabled:
+        background_tasks.append(
+            start_periodic("run-jobs", settings.job_poll_interval, run_pending_jobs)
+        )
+    background_tasks.append(
+        start_periodic(
+            "purge-idempotency-keys",
+            settings.idempotency_purge_interval,
+            purge_idempotency_keys,
+        )
+    )
+
+    await broker.start()
+
+    # The pooled outbound HTTP client is created on first use (get_http_client)
     yield  # Shutdown
     print("🛑 CMS API shutting down...")
+    await broker.stop()
+    await stop_periodic(background_tasks)
+    http_client = getattr(app.state, "http_client", None)
+    if http_client is not None:
+        await http_client.aclose()
+    await close_storage_clients()
+    await run_in_threadpool(dispose_engines)
 
 
 app = FastAPI(
@@ -62,13 +114,29 @@ app.add_middleware(
         "Keep-Alive",
         "X-Requested-With",
         "If-Modified-Since",
+        PRIMARY_UNTIL_HEADER,
     ],
+    expose_headers=[PRIMARY_UNTIL_HEADER],
 )
 
-# Rate limiting
-limiter = Limiter(key_func=get_remote_address)
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+
+# Shed load when the DB pool is exhausted instead of queueing requests
+@app.exception_handler(PoolTimeoutError)
+async def pool_exhausted_handler(request: Request, exc: PoolTimeoutError):
+    record_pool_timeout()
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Server is busy. Please retry shortly."},
+        headers={"Retry-After": str(settings.db_pool_retry_after)},
+    )
+
+
+# Keep a client that just wrote on the primary for its next reads
+@app.middleware("http")
+async def read_your_writes(request: Request, call_next):
+    response = await call_next(request)
+    pin_to_primary(request, response)
+    return response
 
 
 # Enhanced logging for CORS debugging
@@ -123,6 +191,46 @@ def health_check():
         return {"status": "error", "error": str(e)}
 
 
+@app.get("/health/pool")
+def pool_health():
+    """DB connection pool usage, for sizing pools from measurements"""
+    return get_pool_stats()
+
+
+@app.get("/health/media-gc")
+def media_gc_health():
+    """Orphaned media GC progress in this worker"""
+    return gc_stats
+
+
+@app.get("/health/jobs")
+def jobs_health():
+    """Job queue depth, dead jobs, and job runs in this worker"""
+    db = SessionLocal()
+    try:
+        return {**JobService(db).queue_stats(), "worker": job_stats}
+    finally:
+        db.close()
+
+
+@app.get("/health/content-cache")
+def content_cache_health():
+    """Rendered post body cache usage in this worker"""
+    return content_cache.stats()
+
+
+@app.get("/health/live")
+def live_health():
+    """Live update connections and fan-out in this worker"""
+    return broker.stats()
+
+
+@app.get("/health/single-flight")
+def single_flight_health():
+    """Coalesced post reads in this worker (started vs. joined in-flight calls)"""
+    return read_flight.stats()
+
+
 @app.get("/")
 def root():
     return {
@@ -136,10 +244,26 @@ def root():
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(posts.router, prefix="/api/v1")
 app.include_router(media_api.router, prefix="/api/v1")
+app.include_router(changes.router, prefix="/api/v1")
+app.include_router(users.router, prefix="/api/v1")
+
+# Serve uploaded files when storage is on the local filesystem
+if settings.storage_backend == "local":
+    import os
+    from fastapi.staticfiles import StaticFiles
 
-# Railway port handling
+    from .api import local_storage
+
+    os.makedirs(settings.local_storage_path, exist_ok=True)
+    app.include_router(local_storage.router)
+    app.mount(
+        "/storage",
+        StaticFiles(directory=settings.local_storage_path),
+        name="storage",
+    )
 
+# Local development; production runs `python -m app.server`
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(debug=True, port=os.getenv("PORT", default=8000))
+    uvicorn.run("app.main:app", port=settings.port, reload=True)
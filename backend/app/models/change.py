@@ -0,0 +1,17 @@
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+# Append-only log of post/media writes for GET /changes. seq is assigned and
+# committed in order (see core.change_log), so "everything after seq N" never
+# skips a change that commits later.
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+
+    seq = Column(BigInteger, Identity(), primary_key=True)
+    entity = Column(String(20), nullable=False)  # "post" or "media"
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    action = Column(String(20), nullable=False)  # "created", "updated", "deleted"
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
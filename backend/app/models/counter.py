@@ -0,0 +1,17 @@
+from sqlalchemy import Column, String, BigInteger, ForeignKey, Text
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.database import Base
+
+
+# Incrementally maintained row counts, split by owner and status. Every
+# post/media write adjusts these in the same transaction, so list endpoints can
+# report totals and facets without a COUNT(*) over the whole table.
+class ContentCounter(Base):
+    __tablename__ = "content_counters"
+
+    entity = Column(String(20), primary_key=True)  # "post" or "media"
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    facet = Column(String(20), primary_key=True)  # "total", "type", "tag", ...
+    value = Column(Text, primary_key=True, default="")  # Tags have no max length
+    count = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+# Idempotency-Key header on create endpoints: one row per (user, key) with a
+# hash of the request and the id of what it created, so a retry gets the same
+# resource back. In-progress rows expire after the lock timeout (their request
+# died), completed ones after the TTL; both are purged periodically.
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    key = Column(String(255), primary_key=True)
+    request_hash = Column(String(64), nullable=False)  # sha256, incl. the endpoint
+    status = Column(String(20), nullable=False)  # "in_progress" or "completed"
+    resource_id = Column(UUID(as_uuid=True))  # The created post/media
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("idx_idempotency_keys_expires_at", "expires_at"),)
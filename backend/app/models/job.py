@@ -0,0 +1,35 @@
+from sqlalchemy import BigInteger, Column, DateTime, Identity, Index, Integer, String
+from sqlalchemy import Text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from ..core.database import Base
+
+
+# Durable queue of side effects (storage deletes etc.), run by job workers
+# (see job_service). A claimed job's run_at is pushed out by the lease, so a
+# job whose worker died simply becomes due again.
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    kind = Column(String(50), nullable=False)  # Handler name, e.g. "storage.delete"
+    payload = Column(JSONB, nullable=False, default=dict)
+    attempts = Column(Integer, nullable=False, default=0)
+    run_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (Index("idx_jobs_run_at", "run_at"),)
+
+
+# Jobs that ran out of attempts, kept for inspection and manual requeue
+class DeadJob(Base):
+    __tablename__ = "dead_jobs"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=False)  # The job's id
+    kind = Column(String(50), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True))
+    failed_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.database import Base
+
+
+# Post-to-post links found in content and meta_data ([[wikilinks]] and relative
+# markdown links), by target slug. target_post_id is resolved when a post with
+# that slug exists and is NULL for links to pages not written yet.
+class PostLink(Base):
+    __tablename__ = "post_links"
+
+    source_post_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    target_slug = Column(String(255), primary_key=True)
+    target_post_id = Column(
+        UUID(as_uuid=True), ForeignKey("posts.id", ondelete="SET NULL"), nullable=True
+    )
+    source = Column(String(20), nullable=False)  # "content" or "meta_data"
+
+    __table_args__ = (
+        Index("idx_post_links_target_post", "target_post_id"),
+        Index("idx_post_links_target_slug", "target_slug"),
+    )
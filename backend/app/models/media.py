@@ -5,6 +5,10 @@ from sqlalchemy.sql import func
 import uuid
 from ..core.database import Base
 
+# No media meta_data key is hot enough for its own index yet; ?meta= on media
+# uses the GIN index
+MEDIA_META_INDEXED_KEYS = ()
+
 
 class Media(Base):
     __tablename__ = "media"
@@ -33,4 +37,10 @@ class Media(Base):
         Index("idx_media_type_created", "asset_type", "created_at"),
         Index("idx_media_status", "status"),
         Index("idx_media_created_by", "created_by_id"),  # NEW
+        Index(
+            "idx_media_metadata_gin",
+            meta_data,
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
     )
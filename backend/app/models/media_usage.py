@@ -0,0 +1,20 @@
+from sqlalchemy import Column, String, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.database import Base
+
+
+# Reverse index: which posts reference which media, either as content_media_id
+# ("content") or as an id somewhere in the post's meta_data ("meta_data").
+# Rewritten on every post write; rows go away with the post.
+class MediaUsage(Base):
+    __tablename__ = "media_usages"
+
+    media_id = Column(UUID(as_uuid=True), ForeignKey("media.id"), primary_key=True)
+    post_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    source = Column(String(20), primary_key=True)
+
+    __table_args__ = (Index("idx_media_usages_post", "post_id"),)
@@ -1,10 +1,14 @@
-from sqlalchemy import Column, String, Text, DateTime, Index, ARRAY, ForeignKey
-from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Column, String, Text, DateTime, Index, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY, UUID, JSONB
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import uuid
 from ..core.database import Base
 
+# meta_data keys filtered on most (?meta=series:...), each with its own
+# expression index; other keys go through the GIN index with @>
+POST_META_INDEXED_KEYS = ("series", "language")
+
 
 class Post(Base):
     __tablename__ = "posts"
@@ -13,7 +17,7 @@ class Post(Base):
     title = Column(String(255), nullable=False)
     slug = Column(String(255), unique=True, nullable=False)
     description = Column(Text)
-    tags = Column(ARRAY(String), default=[], index=True)
+    tags = Column(ARRAY(String), default=[])
     type = Column(String(50), index=True)
     status = Column(String(20), default="draft", index=True)
 
@@ -35,7 +39,25 @@ class Post(Base):
     __table_args__ = (
         Index("idx_posts_status_published", "status", "published_at"),
         Index("idx_posts_slug", "slug"),
-        Index("idx_posts_tags", "tags"),
+        Index("idx_posts_tags_gin", "tags", postgresql_using="gin"),
         Index("idx_posts_type", "type"),
-        Index("idx_posts_created_by", "created_by_id"),  # NEW
+        # An author's posts by status, newest first (profile pages page
+        # through it with a keyset cursor); also serves created_by_id lookups
+        Index(
+            "idx_posts_author_published",
+            "created_by_id",
+            "status",
+            published_at.desc(),
+            id.desc(),
+        ),
+        Index(
+            "idx_posts_metadata_gin",
+            meta_data,
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+        *(
+            Index(f"idx_posts_meta_{key}", text(f"(metadata ->> '{key}')"))
+            for key in POST_META_INDEXED_KEYS
+        ),
     )
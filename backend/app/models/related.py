@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Float, ForeignKey, Index, SmallInteger
+from sqlalchemy.dialects.postgresql import UUID
+from ..core.database import Base
+
+
+# Precomputed top-K related posts by tag similarity (see related_service), so
+# GET /posts/{id}/related is one primary key range scan
+class PostRelated(Base):
+    __tablename__ = "post_related"
+
+    post_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("posts.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    rank = Column(SmallInteger, primary_key=True)  # 0 is the most similar
+    related_post_id = Column(
+        UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (Index("idx_post_related_related_post", "related_post_id"),)
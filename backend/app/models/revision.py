@@ -0,0 +1,36 @@
+from sqlalchemy import (
+    ARRAY,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Integer,
+    String,
+    UniqueConstraint,
+)
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy.sql import func
+import uuid
+from ..core.database import Base
+
+
+# One row per post edit. `data` is a full snapshot of the tracked fields every
+# revision_snapshot_interval revisions, and an RFC 7386 JSON merge patch
+# against the previous revision otherwise.
+class PostRevision(Base):
+    __tablename__ = "post_revisions"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    post_id = Column(
+        UUID(as_uuid=True), ForeignKey("posts.id", ondelete="CASCADE"), nullable=False
+    )
+    revision = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    data = Column(JSONB, nullable=False)
+    changed_fields = Column(ARRAY(String), nullable=False, default=[])
+    created_by_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("post_id", "revision", name="uq_post_revisions_post_revision"),
+    )
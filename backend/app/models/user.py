@@ -19,4 +19,7 @@ class User(Base):
     )
 
     # Indexes for performance
-    __table_args__ = (Index("idx_users_github_id", "github_id"),)
+    __table_args__ = (
+        Index("idx_users_github_id", "github_id"),
+        Index("idx_users_username", "username"),  # Profile pages
+    )
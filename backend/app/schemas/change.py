@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from .media import MediaResponse
+from .post import PostResponse
+
+
+class ChangeItem(BaseModel):
+    seq: int
+    entity: str  # "post" or "media"
+    id: str
+    action: str  # "created", "updated" or "deleted"
+    post: Optional[PostResponse] = None  # Current state, unless deleted
+    media: Optional[MediaResponse] = None
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeItem]
+    next_since: int  # Pass as `since` on the next call
+    has_more: bool
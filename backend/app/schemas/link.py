@@ -0,0 +1,35 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+
+class LinkedPost(BaseModel):
+    id: str
+    title: str
+    slug: str
+    status: str
+
+    @classmethod
+    def from_post(cls, post) -> "LinkedPost":
+        return cls(
+            id=str(post.id), title=post.title, slug=post.slug, status=post.status
+        )
+
+
+class OutLink(BaseModel):
+    target_slug: str
+    source: str  # "content" or "meta_data"
+    post: Optional[LinkedPost] = None  # None until a post with the slug exists
+
+
+class GraphNode(LinkedPost):
+    depth: int
+
+
+class GraphEdge(BaseModel):
+    source: str
+    target: str
+
+
+class LinkGraph(BaseModel):
+    nodes: List[GraphNode]
+    edges: List[GraphEdge]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -20,3 +20,47 @@ class MediaResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_media(cls, media) -> "MediaResponse":
+        """Build a response from a Media loaded with created_by"""
+        return cls(
+            id=str(media.id),
+            filename=media.filename,
+            original_name=media.original_name,
+            public_url=media.public_url,
+            asset_type=media.asset_type,
+            file_size=media.file_size,
+            status=media.status,
+            created_by=CreatedByUser(
+                id=str(media.created_by.id),
+                username=media.created_by.username,
+                avatar_url=media.created_by.avatar_url,
+            ),
+            created_at=media.created_at,
+            updated_at=media.updated_at,
+        )
+
+
+class MediaListResponse(BaseModel):
+    items: List[MediaResponse]
+    total: Optional[int] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+
+
+class MediaBatchItem(BaseModel):
+    id: str
+    error: Optional[str] = None  # "not_found" or "forbidden"
+    media: Optional[MediaResponse] = None
+
+
+class UploadUrlRequest(BaseModel):
+    filename: str
+    content_type: str
+    file_size: int  # Bytes; checked against the stored object on complete
+
+
+class UploadUrlResponse(BaseModel):
+    media: MediaResponse  # status "pending" until /media/{id}/complete
+    upload_url: str  # PUT the file here with the same Content-Type
+    token: str
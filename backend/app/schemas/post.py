@@ -1,8 +1,10 @@
 from pydantic import BaseModel, field_validator
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 from uuid import UUID
 
+POST_STATUSES = ["draft", "scheduled", "published", "archived"]
+
 
 class PostCreate(BaseModel):
     title: str
@@ -13,6 +15,7 @@ class PostCreate(BaseModel):
     status: str = "draft"
     content_media_id: Optional[UUID] = None
     meta_data: Optional[dict] = None
+    published_at: Optional[datetime] = None  # Required (future) when scheduled
 
     @field_validator("slug")
     def slug_must_be_valid(cls, v):
@@ -24,9 +27,8 @@ class PostCreate(BaseModel):
 
     @field_validator("status")
     def status_must_be_valid(cls, v):
-        valid_statuses = ["draft", "published", "archived"]
-        if v not in valid_statuses:
-            raise ValueError(f'Status must be one of: {", ".join(valid_statuses)}')
+        if v not in POST_STATUSES:
+            raise ValueError(f'Status must be one of: {", ".join(POST_STATUSES)}')
         return v
 
 
@@ -39,6 +41,13 @@ class PostUpdate(BaseModel):
     status: Optional[str] = None
     content_media_id: Optional[UUID] = None
     meta_data: Optional[dict] = None
+    published_at: Optional[datetime] = None
+
+    @field_validator("status")
+    def status_must_be_valid(cls, v):
+        if v is not None and v not in POST_STATUSES:
+            raise ValueError(f'Status must be one of: {", ".join(POST_STATUSES)}')
+        return v
 
 
 class CreatedByUser(BaseModel):
@@ -47,6 +56,28 @@ class CreatedByUser(BaseModel):
     avatar_url: Optional[str] = None
 
 
+class TocEntry(BaseModel):
+    level: int
+    id: str
+    title: str
+
+
+class PostContent(BaseModel):
+    media_id: str
+    content_hash: str
+    html: str  # Rendered from markdown and sanitized
+    toc: List[TocEntry]
+
+    @classmethod
+    def from_rendered(cls, rendered) -> "PostContent":
+        return cls(
+            media_id=str(rendered.media_id),
+            content_hash=rendered.content_hash,
+            html=rendered.html,
+            toc=[TocEntry(**entry) for entry in rendered.toc],
+        )
+
+
 class PostResponse(BaseModel):
     id: str
     title: str
@@ -62,6 +93,54 @@ class PostResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     meta_data: Optional[dict]
+    content: Optional[PostContent] = None  # Only with include=content
 
     class Config:
         from_attributes = True
+
+    @classmethod
+    def from_post(cls, post) -> "PostResponse":
+        """Build a response from a Post loaded with content_media and created_by"""
+        return cls(
+            id=str(post.id),
+            title=post.title,
+            slug=post.slug,
+            description=post.description,
+            tags=post.tags or [],
+            type=post.type,
+            status=post.status,
+            content_media_id=(
+                str(post.content_media_id) if post.content_media_id else None
+            ),
+            content_url=post.content_media.public_url if post.content_media else None,
+            created_by=CreatedByUser(
+                id=str(post.created_by.id),
+                username=post.created_by.username,
+                avatar_url=post.created_by.avatar_url,
+            ),
+            published_at=post.published_at,
+            created_at=post.created_at,
+            updated_at=post.updated_at,
+            meta_data=post.meta_data,
+        )
+
+
+class PostPage(BaseModel):
+    items: List[PostResponse]
+    next_cursor: Optional[str] = None  # Pass as `cursor` for the next page
+
+
+class PostListResponse(BaseModel):
+    items: List[PostResponse]
+    total: Optional[int] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+
+
+class BatchGetRequest(BaseModel):
+    ids: List[UUID]
+
+
+class PostBatchItem(BaseModel):
+    id: str
+    error: Optional[str] = None  # "not_found" or "forbidden"
+    post: Optional[PostResponse] = None
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class PostRevisionSummary(BaseModel):
+    revision: int
+    changed_fields: List[str]
+    is_snapshot: bool
+    created_by_id: str
+    created_at: datetime
+
+    @classmethod
+    def from_revision(cls, revision) -> "PostRevisionSummary":
+        return cls(
+            revision=revision.revision,
+            changed_fields=revision.changed_fields or [],
+            is_snapshot=revision.is_snapshot,
+            created_by_id=str(revision.created_by_id),
+            created_at=revision.created_at,
+        )
+
+
+class PostRevisionResponse(BaseModel):
+    revision: int
+    title: Optional[str] = None
+    slug: Optional[str] = None
+    description: Optional[str] = None
+    tags: List[str] = []
+    type: Optional[str] = None
+    status: Optional[str] = None
+    content_media_id: Optional[str] = None
+    meta_data: Optional[dict] = None
+    published_at: Optional[datetime] = None
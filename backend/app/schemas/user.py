@@ -35,3 +35,10 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     user: UserResponse
+
+
+class UserProfile(BaseModel):
+    username: str
+    avatar_url: Optional[str] = None
+    created_at: datetime
+    published_posts: int
@@ -0,0 +1,122 @@
+import math
+import os
+import tempfile
+
+import uvicorn
+
+from .core.config import settings
+
+
+def available_cpus() -> int:
+    """CPUs this container can actually use (affinity mask, cgroup v2 quota)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # Not on Linux
+        cpus = os.cpu_count() or 1
+
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+
+    return cpus
+
+
+def listen_connections() -> int:
+    """Connections a worker holds outside its pool (the live updates LISTEN)"""
+    return 1 if settings.live_updates_backend == "postgres" else 0
+
+
+def background_connections() -> int:
+    """Pool connections a worker's periodic jobs can hold at once, one each
+
+    Mirrors the start_periodic calls in main.lifespan; the idempotency key
+    purge always runs.
+    """
+    return 1 + sum(
+        [
+            settings.scheduler_enabled,
+            settings.media_gc_enabled,
+            settings.job_worker_enabled,
+        ]
+    )
+
+
+def worker_count() -> int:
+    workers = settings.web_concurrency or available_cpus()
+    if settings.db_max_connections and not settings.db_pooler_mode:
+        # Every worker needs its LISTEN connection, one per periodic job and
+        # at least one for requests
+        needed = listen_connections() + background_connections() + 1
+        workers = min(workers, settings.db_max_connections // needed)
+    return max(1, workers)
+
+
+def pool_sizes(workers: int):
+    """Split db_max_connections across workers into (pool_size, max_overflow)
+
+    Per worker: db_max_connections // workers = pool_size + max_overflow +
+    listen_connections(). Periodic jobs check out from the same pool, so
+    pool_size is kept above background_connections() to leave requests at
+    least one connection that doesn't need overflow.
+    """
+    if not settings.db_max_connections or settings.db_pooler_mode:
+        return None
+    per_worker = settings.db_max_connections // workers
+    pool_capacity = max(1, per_worker - listen_connections())
+    pool_size = min(
+        max(settings.db_pool_size, background_connections() + 1), pool_capacity
+    )
+    return pool_size, pool_capacity - pool_size
+
+
+def rate_limit_storage_uri(workers: int) -> str:
+    """Rate limit storage for the workers: memory:// would give each worker its
+    own counters (N x the limit), so several workers share a SQLite file instead
+    """
+    uri = settings.rate_limit_storage_uri
+    if workers > 1 and uri.startswith("memory://"):
+        path = os.path.join(tempfile.gettempdir(), f"cms-ratelimit-{settings.port}.db")
+        return f"sqlite://{path}"
+    return uri
+
+
+def main():
+    workers = worker_count()
+    os.environ["RATE_LIMIT_STORAGE_URI"] = rate_limit_storage_uri(workers)
+
+    sizes = pool_sizes(workers)
+    if sizes:
+        # Workers are fresh interpreters and read these back into settings
+        os.environ["DB_POOL_SIZE"] = str(sizes[0])
+        os.environ["DB_MAX_OVERFLOW"] = str(sizes[1])
+
+    pool_size, max_overflow = sizes or (settings.db_pool_size, settings.db_max_overflow)
+    print(
+        f"🚀 Starting {workers} worker(s) on port {settings.port} "
+        f"(db pool {pool_size}+{max_overflow} and {listen_connections()} "
+        f"LISTEN connection(s) per worker, rate limits in "
+        f"{os.environ['RATE_LIMIT_STORAGE_URI']})"
+    )
+
+    # uvloop/httptools are picked up automatically when installed. On SIGTERM
+    # each worker stops accepting, drains in-flight requests, then runs the
+    # lifespan shutdown (closes clients and DB pools)
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=settings.port,
+        workers=workers,
+        loop="auto",
+        http="auto",
+        proxy_headers=True,
+        forwarded_allow_ips=settings.forwarded_allow_ips,
+        timeout_graceful_shutdown=settings.graceful_shutdown_timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import List
+from ..models.change import ChangeLogEntry
+
+# change_log rows are written by the session hooks in core.change_log
+
+
+class ChangeService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def latest_seq(self) -> int:
+        return self.db.query(func.max(ChangeLogEntry.seq)).scalar() or 0
+
+    def changes_since(self, since: int, limit: int) -> List[ChangeLogEntry]:
+        """Log entries after since, oldest first (primary key range scan)"""
+        return (
+            self.db.query(ChangeLogEntry)
+            .filter(ChangeLogEntry.seq > since)
+            .order_by(ChangeLogEntry.seq)
+            .limit(limit)
+            .all()
+        )
@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+import markdown
+import nh3
+from fastapi.concurrency import run_in_threadpool
+
+from ..core.config import settings
+from ..models.media import Media
+from .storage_service import StorageService
+
+# Content objects rendered as markdown; anything else isn't a post body
+TEXT_TYPES = {"text/markdown", "text/plain", "application/octet-stream"}
+
+# Headings keep their ids so the TOC links work; code keeps language-* classes
+ALLOWED_ATTRIBUTES = {
+    **nh3.ALLOWED_ATTRIBUTES,
+    **{f"h{level}": {"id"} for level in range(1, 7)},
+    "code": {"class"},
+}
+
+
+class ContentError(Exception):
+    """Post content can't be rendered (not text, too large, missing)"""
+
+
+@dataclass
+class RenderedContent:
+    media_id: UUID
+    content_hash: str  # sha256 of the source, doubles as the ETag
+    html: str
+    toc: List[dict]  # [{level, id, title}] in document order
+
+    @property
+    def size(self) -> int:
+        return len(self.html) + sum(len(entry["title"]) for entry in self.toc)
+
+
+def _flatten_toc(tokens: List[dict]) -> List[dict]:
+    entries = []
+    for token in tokens:
+        entries.append(
+            {"level": token["level"], "id": token["id"], "title": token["name"]}
+        )
+        entries.extend(_flatten_toc(token["children"]))
+    return entries
+
+
+def render_markdown(source: str) -> Tuple[str, List[dict]]:
+    """Markdown to sanitized HTML plus a flat table of contents"""
+    md = markdown.Markdown(
+        extensions=["toc", "fenced_code", "tables", "sane_lists"],
+        # align="..." survives sanitizing, inline styles don't
+        extension_configs={"tables": {"use_align_attribute": True}},
+    )
+    html = md.convert(source)
+    clean = nh3.clean(
+        html,
+        attributes=ALLOWED_ATTRIBUTES,
+        link_rel="noopener noreferrer nofollow",
+    )
+    return clean, _flatten_toc(md.toc_tokens)
+
+
+class ContentCache:
+    """Thread-safe LRU of rendered bodies, bounded by entries and total size
+
+    Keyed by (media id, file path, file size): media files are never
+    rewritten in place, so the row identifies the bytes without a fetch.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, RenderedContent]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[RenderedContent]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: tuple, entry: RenderedContent):
+        if entry.size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old.size
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+content_cache = ContentCache(
+    settings.content_cache_max_entries, settings.content_cache_max_bytes
+)
+
+
+def cache_key(media: Media) -> tuple:
+    return (media.id, media.file_path, media.file_size)
+
+
+class ContentService:
+    def __init__(self):
+        self.storage = StorageService(use_admin=True)
+
+    async def fetch_source(self, media: Media) -> bytes:
+        """Raw markdown of a content media row"""
+        if media.mime_type not in TEXT_TYPES:
+            raise ContentError(f"Content of type {media.mime_type} can't be rendered")
+        if (media.file_size or 0) > settings.content_render_max_bytes:
+            raise ContentError("Content is too large to render")
+
+        try:
+            return await self.storage.download_file(media.file_path)
+        except Exception as e:
+            raise ContentError(f"Could not fetch content: {str(e)}")
+
+    async def render(self, media: Media) -> RenderedContent:
+        """Rendered body for a content media row (cached)"""
+        key = cache_key(media)
+        cached = content_cache.get(key)
+        if cached is not None:
+            return cached
+
+        raw = await self.fetch_source(media)
+
+        # Rendering is CPU work; keep it off the event loop
+        html, toc = await run_in_threadpool(
+            render_markdown, raw.decode("utf-8", errors="replace")
+        )
+        rendered = RenderedContent(
+            media_id=media.id,
+            content_hash=hashlib.sha256(raw).hexdigest(),
+            html=html,
+            toc=toc,
+        )
+        content_cache.put(key, rendered)
+        return rendered
+
+    async def render_many(
+        self, media_list: List[Media]
+    ) -> Dict[UUID, Optional[RenderedContent]]:
+        """Render several bodies concurrently; None for ones that failed"""
+        unique = {media.id: media for media in media_list}
+        semaphore = asyncio.Semaphore(settings.content_fetch_concurrency)
+
+        async def render_one(media: Media):
+            async with semaphore:
+                try:
+                    return media.id, await self.render(media)
+                except ContentError:
+                    return media.id, None
+
+        results = await asyncio.gather(*(render_one(m) for m in unique.values()))
+        return dict(results)
@@ -0,0 +1,222 @@
+from collections import Counter
+from sqlalchemy.orm import Session
+from sqlalchemy import func, literal, or_, select, text
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+from ..models.counter import ContentCounter
+from ..models.media import Media
+from ..models.post import Post
+
+# (entity, created_by_id, status, facet, value)
+CounterKey = Tuple[str, UUID, str, str, str]
+
+
+def post_counter_keys(post: Post) -> List[CounterKey]:
+    """Counter rows a post contributes to"""
+    status = post.status or "draft"
+    keys = [("post", post.created_by_id, status, "total", "")]
+    if post.type:
+        keys.append(("post", post.created_by_id, status, "type", post.type))
+    for tag in set(post.tags or []):
+        keys.append(("post", post.created_by_id, status, "tag", tag))
+    return keys
+
+
+def media_counter_keys(media: Media) -> List[CounterKey]:
+    """Counter rows a media file contributes to (none while upload is pending)"""
+    status = media.status or "draft"
+    if status == "pending":
+        return []
+    keys = [("media", media.created_by_id, status, "total", "")]
+    if media.asset_type:
+        keys.append(
+            ("media", media.created_by_id, status, "asset_type", media.asset_type)
+        )
+    return keys
+
+
+class CounterService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def apply_change(
+        self,
+        old_keys: Optional[List[CounterKey]],
+        new_keys: Optional[List[CounterKey]],
+    ) -> None:
+        """Move a row's contribution from old_keys to new_keys (None for create/delete)
+
+        Runs inside the caller's transaction; the caller commits.
+        """
+        deltas = Counter(new_keys or [])
+        deltas.subtract(Counter(old_keys or []))
+        # Sorted so concurrent writers lock counter rows in the same order
+        rows = [
+            {
+                "entity": key[0],
+                "created_by_id": key[1],
+                "status": key[2],
+                "facet": key[3],
+                "value": key[4],
+                "count": delta,
+            }
+            for key, delta in sorted(deltas.items(), key=lambda kv: str(kv[0]))
+            if delta
+        ]
+        if not rows:
+            return
+
+        stmt = insert(ContentCounter).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["entity", "created_by_id", "status", "facet", "value"],
+            set_={"count": ContentCounter.count + stmt.excluded["count"]},
+        )
+        self.db.execute(stmt)
+
+    def get_counts(
+        self,
+        entity: str,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        facet: str = "total",
+        value: str = "",
+    ) -> int:
+        """Count rows visible in a list scope, optionally narrowed to one facet value"""
+        query = self._scope(entity, user_id, status).filter(
+            ContentCounter.facet == facet, ContentCounter.value == value
+        )
+        return int(query.with_entities(func.sum(ContentCounter.count)).scalar() or 0)
+
+    def get_facets(
+        self,
+        entity: str,
+        user_id: Optional[UUID] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+    ) -> Dict[str, Dict[str, int]]:
+        """Per-facet value counts for a list scope; "status" is derived from totals"""
+        query = self._scope(entity, user_id, status)
+        rows = (
+            query.with_entities(
+                ContentCounter.facet,
+                ContentCounter.status,
+                ContentCounter.value,
+                func.sum(ContentCounter.count),
+            )
+            .group_by(ContentCounter.facet, ContentCounter.status, ContentCounter.value)
+            .all()
+        )
+
+        facets: Dict[str, Counter] = {}
+        for facet, row_status, value, count in rows:
+            if not count:
+                continue
+            if facet == "total":
+                facets.setdefault("status", Counter())[row_status] += int(count)
+            else:
+                facets.setdefault(facet, Counter())[value] += int(count)
+
+        return {
+            name: dict(counts.most_common(limit)) for name, counts in facets.items()
+        }
+
+    def get_author_count(self, entity: str, author_id: UUID, status: str) -> int:
+        """One author's rows in one status (a single counter row)"""
+        count = (
+            self.db.query(ContentCounter.count)
+            .filter(
+                ContentCounter.entity == entity,
+                ContentCounter.created_by_id == author_id,
+                ContentCounter.status == status,
+                ContentCounter.facet == "total",
+                ContentCounter.value == "",
+            )
+            .scalar()
+        )
+        return int(count or 0)
+
+    def _scope(self, entity: str, user_id: Optional[UUID], status: Optional[str]):
+        # Mirrors the visibility rules of list_posts/list_media
+        query = self.db.query(ContentCounter).filter(
+            ContentCounter.entity == entity, ContentCounter.count > 0
+        )
+        if status:
+            query = query.filter(ContentCounter.status == status)
+        elif user_id:
+            query = query.filter(
+                or_(
+                    ContentCounter.created_by_id == user_id,
+                    ContentCounter.status == "published",
+                )
+            )
+        else:
+            query = query.filter(ContentCounter.status == "published")
+        return query
+
+    def rebuild(self) -> None:
+        """Recompute every counter from the posts and media tables"""
+        self.db.execute(text("LOCK TABLE content_counters IN EXCLUSIVE MODE"))
+        self.db.query(ContentCounter).delete()
+
+        post_status = func.coalesce(Post.status, "draft")
+        media_status = func.coalesce(Media.status, "draft")
+        tag = func.unnest(Post.tags).label("value")
+        post_tags = select(
+            Post.id, Post.created_by_id, post_status.label("status"), tag
+        ).subquery()
+
+        sources = [
+            select(
+                literal("post"),
+                Post.created_by_id,
+                post_status,
+                literal("total"),
+                literal(""),
+                func.count(),
+            ).group_by(Post.created_by_id, post_status),
+            select(
+                literal("post"),
+                Post.created_by_id,
+                post_status,
+                literal("type"),
+                Post.type,
+                func.count(),
+            )
+            .where(Post.type.is_not(None))
+            .group_by(Post.created_by_id, post_status, Post.type),
+            select(
+                literal("post"),
+                post_tags.c.created_by_id,
+                post_tags.c.status,
+                literal("tag"),
+                post_tags.c.value,
+                func.count(func.distinct(post_tags.c.id)),
+            ).group_by(
+                post_tags.c.created_by_id, post_tags.c.status, post_tags.c.value
+            ),
+            select(
+                literal("media"),
+                Media.created_by_id,
+                media_status,
+                literal("total"),
+                literal(""),
+                func.count(),
+            )
+            .where(media_status != "pending")
+            .group_by(Media.created_by_id, media_status),
+            select(
+                literal("media"),
+                Media.created_by_id,
+                media_status,
+                literal("asset_type"),
+                Media.asset_type,
+                func.count(),
+            )
+            .where(Media.asset_type.is_not(None), media_status != "pending")
+            .group_by(Media.created_by_id, media_status, Media.asset_type),
+        ]
+        columns = ["entity", "created_by_id", "status", "facet", "value", "count"]
+        for source in sources:
+            self.db.execute(insert(ContentCounter).from_select(columns, source))
+        self.db.commit()
@@ -0,0 +1,153 @@
+import hashlib
+import json
+import logging
+import time
+from datetime import timedelta
+from fastapi import HTTPException
+from sqlalchemy import delete, func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from typing import Any, Optional
+from uuid import UUID
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.2  # Seconds between checks on an in-progress duplicate
+
+
+def request_hash(endpoint: str, *parts: Any) -> str:
+    """Fingerprint of a request; a key reused for a different one is rejected"""
+    digest = hashlib.sha256(endpoint.encode())
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, default=str).encode()
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()
+
+
+class IdempotencyService:
+    """Claim/complete/release of Idempotency-Key rows
+
+    acquire() commits the in-progress claim on its own so duplicates see it;
+    complete() runs in the caller's transaction, so the key flips to completed
+    exactly when the created row commits.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _claim(self, user_id: UUID, key: str, fingerprint: str) -> bool:
+        # Insert, or take over a key whose row has expired
+        claim = insert(IdempotencyKey).values(
+            user_id=user_id,
+            key=key,
+            request_hash=fingerprint,
+            status="in_progress",
+            expires_at=func.now()
+            + timedelta(seconds=settings.idempotency_lock_seconds),
+        )
+        claim = claim.on_conflict_do_update(
+            index_elements=["user_id", "key"],
+            set_={
+                "request_hash": claim.excluded.request_hash,
+                "status": claim.excluded.status,
+                "resource_id": None,
+                "created_at": func.now(),
+                "expires_at": claim.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at < func.now(),
+        ).returning(IdempotencyKey.key)
+        claimed = self.db.execute(claim).first() is not None
+        self.db.commit()
+        return claimed
+
+    def acquire(self, user_id: UUID, key: str, fingerprint: str) -> Optional[UUID]:
+        """None if this request now owns the key, else the resource id to replay
+
+        Waits while another request with the key is running; 409 if it doesn't
+        finish in time, 422 if the key was used for a different request.
+        """
+        deadline = time.monotonic() + settings.idempotency_wait_seconds
+        while True:
+            if self._claim(user_id, key, fingerprint):
+                return None
+
+            row = self.db.execute(
+                select(
+                    IdempotencyKey.request_hash,
+                    IdempotencyKey.status,
+                    IdempotencyKey.resource_id,
+                ).where(IdempotencyKey.user_id == user_id, IdempotencyKey.key == key)
+            ).first()
+            self.db.commit()
+            if row is None:
+                continue  # Released since the claim; try again
+
+            if row.request_hash != fingerprint:
+                raise HTTPException(
+                    status_code=422,
+                    detail="Idempotency-Key was already used for a different request",
+                )
+            if row.status == "completed":
+                return row.resource_id
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=409,
+                    detail="A request with this Idempotency-Key is still in progress",
+                )
+            time.sleep(POLL_INTERVAL)
+
+    def complete(self, user_id: UUID, key: str, resource_id: UUID) -> None:
+        """Mark the key done (caller commits, together with the resource)"""
+        self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id, IdempotencyKey.key == key
+        ).update(
+            {
+                "status": "completed",
+                "resource_id": resource_id,
+                "expires_at": func.now()
+                + timedelta(hours=settings.idempotency_ttl_hours),
+            },
+            synchronize_session=False,
+        )
+
+    def release(self, user_id: UUID, key: str) -> None:
+        """Drop an in-progress claim after a failed request, so a retry can run"""
+        self.db.rollback()
+        self.db.query(IdempotencyKey).filter(
+            IdempotencyKey.user_id == user_id,
+            IdempotencyKey.key == key,
+            IdempotencyKey.status == "in_progress",
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+
+def purge_idempotency_keys() -> int:
+    """Background job: delete expired keys in batches; returns how many"""
+    db = SessionLocal()
+    purged = 0
+    try:
+        while True:
+            expired = (
+                select(IdempotencyKey.user_id, IdempotencyKey.key)
+                .where(IdempotencyKey.expires_at < func.now())
+                .limit(settings.idempotency_purge_batch_size)
+            )
+            deleted = db.execute(
+                delete(IdempotencyKey).where(
+                    tuple_(IdempotencyKey.user_id, IdempotencyKey.key).in_(expired)
+                )
+            ).rowcount
+            db.commit()
+            purged += deleted
+            if deleted < settings.idempotency_purge_batch_size:
+                break
+    finally:
+        db.close()
+
+    if purged:
+        logger.info("Purged %s expired idempotency keys", purged)
+    return purged
@@ -0,0 +1,179 @@
+import logging
+import random
+from anyio.from_thread import run as run_async
+from dataclasses import dataclass
+from datetime import datetime, timedelta, UTC
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from typing import Any, Callable, Dict, List
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.job import DeadJob, Job
+from .storage_service import StorageService
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(payload). Delivery is at least once (a worker can die or
+# overrun its lease mid-job), so handlers must be idempotent
+HANDLERS: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+
+def job_handler(kind: str):
+    def register(handler: Callable[[Dict[str, Any]], None]):
+        HANDLERS[kind] = handler
+        return handler
+
+    return register
+
+
+def enqueue(db: Session, kind: str, payload: Dict[str, Any], delay: float = 0) -> Job:
+    """Add a job in the caller's transaction: it exists only if the caller commits"""
+    job = Job(kind=kind, payload=payload)
+    if delay:
+        job.run_at = datetime.now(UTC) + timedelta(seconds=delay)
+    db.add(job)
+    return job
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds until the next try: doubling per attempt, capped, half jittered"""
+    delay = min(
+        settings.job_backoff_max, settings.job_backoff_base * 2 ** (attempts - 1)
+    )
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+@dataclass
+class ClaimedJob:
+    id: int
+    kind: str
+    payload: Dict[str, Any]
+    attempts: int  # Including this one; doubles as the claim token
+
+
+class JobService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def claim(self, limit: int) -> List[ClaimedJob]:
+        """Lease up to `limit` due jobs (SKIP LOCKED, so workers split the queue)
+
+        Claiming bumps attempts and pushes run_at out by the lease, then
+        commits, so no transaction stays open while handlers run.
+        """
+        due = (
+            select(Job.id)
+            .where(Job.run_at <= func.now())
+            .order_by(Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        rows = self.db.execute(
+            update(Job)
+            .where(Job.id.in_(due))
+            .values(
+                attempts=Job.attempts + 1,
+                run_at=func.now() + timedelta(seconds=settings.job_lease_seconds),
+            )
+            .returning(Job.id, Job.kind, Job.payload, Job.attempts)
+        ).all()
+        self.db.commit()
+        return [ClaimedJob(*row) for row in rows]
+
+    def complete(self, job: ClaimedJob) -> None:
+        # Matching attempts: a worker that overran its lease can't touch a
+        # newer claim of the same job
+        self.db.query(Job).filter(
+            Job.id == job.id, Job.attempts == job.attempts
+        ).delete(synchronize_session=False)
+        self.db.commit()
+
+    def fail(self, job: ClaimedJob, error: str) -> bool:
+        """Schedule a retry, or move the job to dead_jobs; True if it's dead"""
+        row = (
+            self.db.query(Job)
+            .filter(Job.id == job.id, Job.attempts == job.attempts)
+            .with_for_update()
+            .first()
+        )
+        if row is None:
+            self.db.rollback()
+            return False
+
+        dead = row.attempts >= settings.job_max_attempts
+        if dead:
+            self.db.add(
+                DeadJob(
+                    id=row.id,
+                    kind=row.kind,
+                    payload=row.payload,
+                    attempts=row.attempts,
+                    last_error=error,
+                    created_at=row.created_at,
+                )
+            )
+            self.db.delete(row)
+        else:
+            row.last_error = error
+            row.run_at = datetime.now(UTC) + timedelta(
+                seconds=retry_delay(row.attempts)
+            )
+        self.db.commit()
+        return dead
+
+    def queue_stats(self) -> Dict[str, int]:
+        pending, due = self.db.query(
+            func.count(Job.id),
+            func.count(Job.id).filter(Job.run_at <= func.now()),
+        ).one()
+        dead = self.db.query(func.count(DeadJob.id)).scalar()
+        return {"pending": pending, "due": due, "dead": dead}
+
+
+# Job runs in this process, served at /health/jobs
+job_stats: Dict[str, Any] = {
+    "last_run_at": None,
+    "succeeded": 0,
+    "retried": 0,
+    "dead": 0,
+}
+
+
+def run_pending_jobs() -> int:
+    """Run due jobs until the queue has none left; returns how many ran
+
+    Blocking; call from a worker thread (handlers use anyio.from_thread).
+    """
+    job_stats["last_run_at"] = datetime.now(UTC)
+    db = SessionLocal()
+    ran = 0
+    try:
+        jobs = JobService(db)
+        while True:
+            claimed = jobs.claim(settings.job_batch_size)
+            for job in claimed:
+                try:
+                    handler = HANDLERS.get(job.kind)
+                    if handler is None:
+                        raise LookupError(f"No handler for job kind {job.kind}")
+                    handler(job.payload)
+                except Exception as e:
+                    logger.warning("Job %s (%s) failed: %s", job.id, job.kind, e)
+                    if jobs.fail(job, f"{type(e).__name__}: {e}"):
+                        job_stats["dead"] += 1
+                    else:
+                        job_stats["retried"] += 1
+                else:
+                    jobs.complete(job)
+                    job_stats["succeeded"] += 1
+            ran += len(claimed)
+            if len(claimed) < settings.job_batch_size:
+                return ran
+    finally:
+        db.close()
+
+
+@job_handler("storage.delete")
+def delete_stored_files(payload: Dict[str, Any]) -> None:
+    """Remove files from storage; files already gone count as removed"""
+    run_async(StorageService(use_admin=True).remove_files, payload["paths"])
@@ -0,0 +1,207 @@
+import logging
+import re
+from anyio.from_thread import run as run_async
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, or_, text
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlsplit
+from uuid import UUID
+from ..models.link import PostLink
+from ..models.media import Media
+from ..models.post import Post
+from .content_service import ContentError, ContentService
+
+logger = logging.getLogger(__name__)
+
+# [[slug]], [[Page Title|label]] and [[slug#heading]]; ![[embeds]] are files
+WIKILINK_PATTERN = re.compile(
+    r"(?<!!)\[\[([^\[\]|#]+)(?:#[^\[\]|]*)?(?:\|[^\[\]]*)?\]\]"
+)
+# [text](target "title"), not images
+MARKDOWN_LINK_PATTERN = re.compile(r"(?<!!)\[[^\]]*\]\(\s*<?([^)\s>]+)>?[^)]*\)")
+# Links inside code are examples, not links
+CODE_PATTERN = re.compile(r"```.*?```|~~~.*?~~~|`[^`\n]*`", re.DOTALL)
+
+# Walks the link graph from a post in both directions, only through posts the
+# viewer can see. Each hop is an index lookup on post_links (source or target)
+NEIGHBORHOOD_QUERY = text("""
+    WITH RECURSIVE walk(id, depth) AS (
+        SELECT :post_id, 0
+        UNION
+        SELECT n.id, w.depth + 1
+        FROM walk w
+        CROSS JOIN LATERAL (
+            SELECT l.target_post_id AS id FROM post_links l
+            WHERE l.source_post_id = w.id AND l.target_post_id IS NOT NULL
+            UNION ALL
+            SELECT l.source_post_id FROM post_links l
+            WHERE l.target_post_id = w.id
+        ) n
+        JOIN posts p ON p.id = n.id
+        WHERE w.depth < :depth
+          AND (p.status = 'published' OR p.created_by_id = :user_id)
+    )
+    SELECT id, min(depth) AS depth FROM walk
+    GROUP BY id
+    ORDER BY min(depth), id
+    LIMIT :max_nodes
+    """).bindparams(
+    bindparam("post_id", type_=PG_UUID(as_uuid=True)),
+    bindparam("user_id", type_=PG_UUID(as_uuid=True)),
+)
+
+
+# Longer targets can't name a post (and wouldn't fit post_links.target_slug)
+MAX_SLUG_LENGTH = Post.__table__.c.slug.type.length
+
+
+def slugify(value: str) -> str:
+    """Link target as a post slug ("My Note" -> "my-note")"""
+    value = re.sub(r"[\s_]+", "-", value.strip().lower())
+    value = re.sub(r"[^\w-]+", "", value).replace("_", "-")
+    return re.sub(r"-{2,}", "-", value).strip("-")
+
+
+def markdown_target(url: str) -> Optional[str]:
+    """Slug a relative markdown link points at (/posts/my-note, ../my-note)"""
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    name = parts.path.rstrip("/").rsplit("/", 1)[-1]
+    if not name or "." in name:  # Files (images, attachments), "." and ".."
+        return None
+    return slugify(name)
+
+
+def find_links(source: str) -> Set[str]:
+    """Slugs linked from markdown text"""
+    source = CODE_PATTERN.sub("", source)
+    slugs = {slugify(match) for match in WIKILINK_PATTERN.findall(source)}
+    slugs |= {markdown_target(match) for match in MARKDOWN_LINK_PATTERN.findall(source)}
+    return {slug for slug in slugs if slug and len(slug) <= MAX_SLUG_LENGTH}
+
+
+def find_meta_links(value: Any) -> Set[str]:
+    """Slugs linked from strings anywhere in a meta_data value"""
+    found = set()
+    if isinstance(value, dict):
+        for item in value.values():
+            found |= find_meta_links(item)
+    elif isinstance(value, list):
+        for item in value:
+            found |= find_meta_links(item)
+    elif isinstance(value, str) and "[" in value:
+        found |= find_links(value)
+    return found
+
+
+class LinkService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def content_links(self, media_id: UUID) -> Set[str]:
+        """Links in a post body; runs in a sync route's worker thread"""
+        media = self.db.query(Media).filter(Media.id == media_id).first()
+        if media is None:
+            return set()
+        try:
+            raw = run_async(ContentService().fetch_source, media)
+        except ContentError as e:
+            logger.warning("Could not read links from media %s: %s", media_id, e)
+            return set()
+        return find_links(raw.decode("utf-8", errors="replace"))
+
+    def sync_post(self, post: Post, content_changed: bool = True) -> None:
+        """Rewrite a post's outgoing links and point links to its slug at it
+
+        Content files are immutable, so the body is only re-read when
+        content_media_id changed; otherwise its links are kept. Caller commits.
+        """
+        self.db.flush()
+        if not post.content_media_id:
+            content = set()
+        elif content_changed:
+            content = self.content_links(post.content_media_id)
+        else:
+            content = {
+                slug
+                for (slug,) in self.db.query(PostLink.target_slug).filter(
+                    PostLink.source_post_id == post.id, PostLink.source == "content"
+                )
+            }
+        links = {slug: "meta_data" for slug in find_meta_links(post.meta_data or {})}
+        links.update({slug: "content" for slug in content})
+        links.pop(post.slug, None)
+
+        targets = {}
+        if links:
+            targets = dict(
+                self.db.query(Post.slug, Post.id).filter(Post.slug.in_(links))
+            )
+        self.db.query(PostLink).filter(PostLink.source_post_id == post.id).delete(
+            synchronize_session=False
+        )
+        self.db.add_all(
+            PostLink(
+                source_post_id=post.id,
+                target_slug=slug,
+                target_post_id=targets.get(slug),
+                source=source,
+            )
+            for slug, source in sorted(links.items())
+        )
+
+        # Links written before this post existed (or before a rename) resolve
+        # now; links to its old slug dangle again
+        self.db.query(PostLink).filter(
+            PostLink.target_slug == post.slug,
+            or_(PostLink.target_post_id.is_(None), PostLink.target_post_id != post.id),
+        ).update({PostLink.target_post_id: post.id}, synchronize_session=False)
+        self.db.query(PostLink).filter(
+            PostLink.target_post_id == post.id, PostLink.target_slug != post.slug
+        ).update({PostLink.target_post_id: None}, synchronize_session=False)
+
+    def backlinks(self, post_id: UUID) -> List[Post]:
+        """Posts linking to this one"""
+        return (
+            self.db.query(Post)
+            .join(PostLink, PostLink.source_post_id == Post.id)
+            .filter(PostLink.target_post_id == post_id)
+            .order_by(Post.title)
+            .all()
+        )
+
+    def outlinks(self, post_id: UUID) -> List[Tuple[PostLink, Optional[Post]]]:
+        """Links from this post with their targets (None if not written yet)"""
+        return (
+            self.db.query(PostLink, Post)
+            .outerjoin(Post, Post.id == PostLink.target_post_id)
+            .filter(PostLink.source_post_id == post_id)
+            .order_by(PostLink.target_slug)
+            .all()
+        )
+
+    def neighborhood(
+        self, post_id: UUID, user_id: UUID, depth: int, max_nodes: int
+    ) -> Tuple[Dict[UUID, int], List[Tuple[UUID, UUID]]]:
+        """Posts within depth hops ({id: hops}) and the links between them"""
+        rows = self.db.execute(
+            NEIGHBORHOOD_QUERY,
+            {
+                "post_id": post_id,
+                "user_id": user_id,
+                "depth": depth,
+                "max_nodes": max_nodes,
+            },
+        )
+        depths = {row.id: row.depth for row in rows}
+        edges = (
+            self.db.query(PostLink.source_post_id, PostLink.target_post_id)
+            .filter(
+                PostLink.source_post_id.in_(depths),
+                PostLink.target_post_id.in_(depths),
+            )
+            .all()
+        )
+        return depths, [tuple(edge) for edge in edges]
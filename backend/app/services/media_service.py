@@ -1,8 +1,12 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc, or_
-from typing import List, Optional
+from sqlalchemy import any_, bindparam, cast, desc, or_
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from typing import Any, Dict, List, Optional
 from uuid import UUID
-from ..models.media import Media
+from ..models.media import MEDIA_META_INDEXED_KEYS, Media
+from .counter_service import CounterService, media_counter_keys
+from .job_service import enqueue
+from .meta_filter import meta_conditions
 
 
 class MediaService:
@@ -21,8 +25,9 @@ class MediaService:
         created_by_id: UUID,
         status: str = "draft",
         meta_data: dict = None,
+        media_id: Optional[UUID] = None,
     ) -> Media:
-        """Create media record"""
+        """Create media record (media_id: use an id reserved up front)"""
         db_media = Media(
             filename=filename,
             original_name=original_name,
@@ -35,22 +40,26 @@ class MediaService:
             created_by_id=created_by_id,  # Added this field
             meta_data=meta_data or {},
         )
+        if media_id:
+            db_media.id = media_id
 
         self.db.add(db_media)
+        CounterService(self.db).apply_change(None, media_counter_keys(db_media))
         self.db.commit()
         self.db.refresh(db_media)
         return db_media
 
-    def get_media_list(
+    def media_list_query(
         self,
-        skip: int = 0,
-        limit: int = 20,
         asset_type: Optional[str] = None,
         status: Optional[str] = None,
         user_id: Optional[UUID] = None,
-    ) -> List[Media]:
-        """Get media files with pagination and user-based filtering"""
-        query = self.db.query(Media).options(joinedload(Media.created_by))
+        meta: Optional[Dict[str, Any]] = None,
+    ):
+        """Filtered media query shared by the list and its fallback count"""
+        query = self.db.query(Media).filter(
+            Media.status != "pending"  # Upload not completed yet
+        )
 
         if asset_type:
             query = query.filter(Media.asset_type == asset_type)
@@ -63,7 +72,30 @@ class MediaService:
                 or_(Media.created_by_id == user_id, Media.status == "published")
             )
 
-        return query.order_by(desc(Media.created_at)).offset(skip).limit(limit).all()
+        if meta:
+            query = query.filter(
+                *meta_conditions(Media.meta_data, meta, MEDIA_META_INDEXED_KEYS)
+            )
+        return query
+
+    def get_media_list(
+        self,
+        skip: int = 0,
+        limit: int = 20,
+        asset_type: Optional[str] = None,
+        status: Optional[str] = None,
+        user_id: Optional[UUID] = None,
+        meta: Optional[Dict[str, Any]] = None,
+    ) -> List[Media]:
+        """Get media files with pagination and user-based filtering"""
+        return (
+            self.media_list_query(asset_type, status, user_id, meta)
+            .options(joinedload(Media.created_by))
+            .order_by(desc(Media.created_at))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
 
     def get_media_by_id(self, media_id: UUID) -> Optional[Media]:
         """Get media by ID with creator info"""
@@ -74,11 +106,43 @@ class MediaService:
             .first()
         )
 
+    def get_media_by_ids(self, media_ids: List[UUID]) -> List[Media]:
+        """Get media by ID in one `id = ANY(...)` query, with creator info"""
+        ids = bindparam(
+            "media_ids", list(set(media_ids)), type_=ARRAY(PG_UUID(as_uuid=True))
+        )
+        return (
+            self.db.query(Media)
+            .options(joinedload(Media.created_by))
+            .filter(Media.id == any_(cast(ids, ARRAY(PG_UUID(as_uuid=True)))))
+            .all()
+        )
+
+    def complete_upload(self, media_id: UUID, status: str) -> Optional[Media]:
+        """Move a pending direct upload to `status` (None if not pending)"""
+        media = (
+            self.db.query(Media)
+            .filter(Media.id == media_id, Media.status == "pending")
+            .with_for_update()
+            .first()
+        )
+        if not media:
+            return None
+        old_counter_keys = media_counter_keys(media)
+        media.status = status
+        CounterService(self.db).apply_change(
+            old_counter_keys, media_counter_keys(media)
+        )
+        self.db.commit()
+        return self.get_media_by_id(media_id)
+
     def delete_media(self, media_id: UUID) -> bool:
-        """Delete media record"""
+        """Delete media record; its file is deleted by a queued job"""
         media = self.get_media_by_id(media_id)
         if media:
+            CounterService(self.db).apply_change(media_counter_keys(media), None)
             self.db.delete(media)
+            enqueue(self.db, "storage.delete", {"paths": [media.file_path]})
             self.db.commit()
             return True
         return False
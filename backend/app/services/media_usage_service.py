@@ -0,0 +1,171 @@
+import logging
+import re
+from datetime import datetime, timedelta, UTC
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, exists, func, or_
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.media import Media
+from ..models.media_usage import MediaUsage
+from ..models.post import Post
+from .counter_service import CounterService, media_counter_keys
+from .job_service import enqueue
+
+logger = logging.getLogger(__name__)
+
+UUID_PATTERN = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE
+)
+
+# Only never-published uploads are garbage; archived media is kept on purpose.
+# Pending (direct upload never completed) rows expire sooner
+GC_STATUSES = ["draft"]
+
+
+def find_uuids(value: Any) -> Set[UUID]:
+    """Every UUID in a JSON value (keys, nested lists/objects, inside strings)"""
+    found = set()
+    if isinstance(value, dict):
+        for key, item in value.items():
+            found |= find_uuids(key) | find_uuids(item)
+    elif isinstance(value, list):
+        for item in value:
+            found |= find_uuids(item)
+    elif isinstance(value, str):
+        found |= {UUID(match) for match in UUID_PATTERN.findall(value)}
+    return found
+
+
+class MediaUsageService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def post_references(self, post: Post) -> Set[Tuple[UUID, str]]:
+        """(media_id, source) pairs for a post; meta_data ids must be real media"""
+        references = set()
+        if post.content_media_id:
+            references.add((post.content_media_id, "content"))
+
+        candidates = find_uuids(post.meta_data or {}) - {post.id}
+        if candidates:
+            existing = self.db.query(Media.id).filter(Media.id.in_(candidates))
+            references |= {(media_id, "meta_data") for (media_id,) in existing}
+        return references
+
+    def sync_post(self, post: Post) -> None:
+        """Rewrite a post's usage rows (caller commits)"""
+        self.db.flush()
+        self.db.query(MediaUsage).filter(MediaUsage.post_id == post.id).delete(
+            synchronize_session=False
+        )
+        rows = [
+            {"media_id": media_id, "post_id": post.id, "source": source}
+            for media_id, source in sorted(self.post_references(post))
+        ]
+        if rows:
+            self.db.execute(insert(MediaUsage).values(rows).on_conflict_do_nothing())
+
+    def get_usages(self, media_id: UUID) -> List[MediaUsage]:
+        return self.db.query(MediaUsage).filter(MediaUsage.media_id == media_id).all()
+
+    def orphans_query(self, cutoff: datetime, pending_cutoff: datetime):
+        """Unreferenced drafts created before cutoff, or stale pending uploads"""
+        return self.db.query(Media).filter(
+            or_(
+                and_(Media.status.in_(GC_STATUSES), Media.created_at < cutoff),
+                and_(Media.status == "pending", Media.created_at < pending_cutoff),
+            ),
+            ~exists().where(MediaUsage.media_id == Media.id),
+        )
+
+    def claim_orphans(
+        self, cutoff: datetime, pending_cutoff: datetime, limit: int
+    ) -> List[Media]:
+        """Lock a batch of orphans; SKIP LOCKED so workers split the work"""
+        return (
+            self.orphans_query(cutoff, pending_cutoff)
+            .order_by(Media.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+
+
+# Progress of the media GC in this process, served at /health/media-gc
+gc_stats: Dict[str, Any] = {
+    "runs": 0,
+    "last_run_at": None,
+    "dry_run": None,
+    "candidates": 0,
+    "candidate_bytes": 0,
+    "deleted": 0,
+    "deleted_bytes": 0,
+    "db_errors": 0,
+}
+
+
+def collect_orphaned_media(dry_run: Optional[bool] = None) -> Dict[str, Any]:
+    """Background job: delete orphaned media from the DB, then from storage
+
+    Rows are deleted and committed first, so a post that grabs a reference
+    mid-run makes the delete fail (FK) instead of losing its file. Files are
+    removed by a storage.delete job committed with the rows.
+    """
+    dry_run = settings.media_gc_dry_run if dry_run is None else dry_run
+    cutoff = datetime.now(UTC) - timedelta(hours=settings.media_gc_grace_hours)
+    pending_cutoff = datetime.now(UTC) - timedelta(
+        hours=settings.media_gc_pending_hours
+    )
+    gc_stats.update(runs=gc_stats["runs"] + 1, last_run_at=datetime.now(UTC))
+    gc_stats["dry_run"] = dry_run
+
+    db = SessionLocal()
+    try:
+        usages = MediaUsageService(db)
+        count, size = (
+            usages.orphans_query(cutoff, pending_cutoff)
+            .with_entities(
+                func.count(Media.id), func.coalesce(func.sum(Media.file_size), 0)
+            )
+            .one()
+        )
+        gc_stats.update(candidates=count, candidate_bytes=int(size))
+        if dry_run or not count:
+            return gc_stats
+
+        while True:
+            batch = usages.claim_orphans(
+                cutoff, pending_cutoff, settings.media_gc_batch_size
+            )
+            if not batch:
+                break
+            paths = [media.file_path for media in batch]
+            freed = sum(media.file_size or 0 for media in batch)
+
+            counters = CounterService(db)
+            for media in batch:
+                counters.apply_change(media_counter_keys(media), None)
+                db.delete(media)
+            enqueue(db, "storage.delete", {"paths": paths})
+            try:
+                db.commit()
+            except IntegrityError:
+                # Referenced since we looked; try again next run
+                db.rollback()
+                gc_stats["db_errors"] += 1
+                break
+
+            gc_stats["deleted"] += len(batch)
+            gc_stats["deleted_bytes"] += freed
+
+            if len(batch) < settings.media_gc_batch_size:
+                break
+    finally:
+        db.close()
+
+    logger.info("Media GC: %s", gc_stats)
+    return gc_stats
@@ -0,0 +1,22 @@
+from typing import Any, Dict, List, Sequence
+
+
+def meta_conditions(
+    column, meta: Dict[str, Any], indexed_keys: Sequence[str]
+) -> List[Any]:
+    """WHERE clauses matching a meta_data filter
+
+    String values of indexed keys compare as `metadata ->> key = value`, which
+    their expression indexes serve. Everything else becomes one
+    `metadata @> {...}` containment check for the jsonb_path_ops GIN index.
+    """
+    conditions = []
+    contained = {}
+    for key, value in meta.items():
+        if key in indexed_keys and isinstance(value, str):
+            conditions.append(column[key].astext == value)
+        else:
+            contained[key] = value
+    if contained:
+        conditions.append(column.contains(contained))
+    return conditions
@@ -0,0 +1,91 @@
+import logging
+from datetime import datetime, UTC
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import any_, bindparam, cast
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from typing import List, Optional
+from uuid import UUID
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.post import Post
+from .counter_service import CounterService, post_counter_keys
+from .related_service import refresh_related
+from .revision_service import RevisionService, post_state
+
+logger = logging.getLogger(__name__)
+
+
+class PostService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_posts_by_ids(self, post_ids: List[UUID]) -> List[Post]:
+        """Get posts by ID in one `id = ANY(...)` query, with media and creator"""
+        ids = bindparam(
+            "post_ids", list(set(post_ids)), type_=ARRAY(PG_UUID(as_uuid=True))
+        )
+        return (
+            self.db.query(Post)
+            .options(joinedload(Post.content_media), joinedload(Post.created_by))
+            .filter(Post.id == any_(cast(ids, ARRAY(PG_UUID(as_uuid=True)))))
+            .all()
+        )
+
+    def publish_due_posts(
+        self, batch_size: int, now: Optional[datetime] = None
+    ) -> List[Post]:
+        """Publish one batch of scheduled posts whose published_at has passed
+
+        One range scan on idx_posts_status_published (status = 'scheduled' AND
+        published_at <= now). SKIP LOCKED lets every worker run this at once
+        without publishing a post twice. Commits.
+        """
+        now = now or datetime.now(UTC)
+        due = (
+            self.db.query(Post)
+            .filter(Post.status == "scheduled", Post.published_at <= now)
+            .order_by(Post.published_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        counters = CounterService(self.db)
+        revisions = RevisionService(self.db)
+        for post in due:
+            old_counter_keys = post_counter_keys(post)
+            old_state = post_state(post)
+            post.status = "published"
+            counters.apply_change(old_counter_keys, post_counter_keys(post))
+            revisions.record(post, old_state, post.created_by_id)
+        self.db.commit()
+        return due
+
+
+def publish_scheduled_posts() -> int:
+    """Background job: publish every due scheduled post, batch by batch"""
+    db = SessionLocal()
+    published = 0
+    try:
+        service = PostService(db)
+        while True:
+            batch = service.publish_due_posts(settings.publish_batch_size)
+            published += len(batch)
+            # Newly published posts become related-post candidates (one query
+            # for their tags; the batch was expired by the commit)
+            if batch:
+                tagged = (
+                    db.query(Post.id, Post.tags)
+                    .filter(Post.id.in_([post.id for post in batch]))
+                    .all()
+                )
+                refresh_related(
+                    [post_id for post_id, _ in tagged],
+                    [tag for _, tags in tagged for tag in tags or []],
+                )
+            if len(batch) < settings.publish_batch_size:
+                break
+    finally:
+        db.close()
+    if published:
+        logger.info("Published %d scheduled post(s)", published)
+    return published
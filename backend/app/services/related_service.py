@@ -0,0 +1,177 @@
+import logging
+from collections.abc import Iterable
+from typing import Dict, List, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import text
+from sqlalchemy.orm import Session, joinedload
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.post import Post
+from ..models.related import PostRelated
+
+logger = logging.getLogger(__name__)
+
+# Only published posts are recommended; any post can have recommendations
+CANDIDATE_STATUSES = ["published"]
+
+# Serializes refreshes so two of them don't interleave a post's rows
+REFRESH_LOCK = text("SELECT pg_advisory_xact_lock(hashtext('post_related'))")
+
+TaggedPost = Tuple[UUID, Sequence[str]]
+
+
+def tag_matrix(
+    posts: List[TaggedPost], vocabulary: Dict[str, int]
+) -> sparse.csr_matrix:
+    """Binary post x tag matrix (tags missing from vocabulary are dropped)"""
+    rows, cols = [], []
+    for row, (_, tags) in enumerate(posts):
+        columns = {vocabulary[tag] for tag in tags or [] if tag in vocabulary}
+        rows.extend([row] * len(columns))
+        cols.extend(columns)
+    return sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (rows, cols)),
+        shape=(len(posts), len(vocabulary)),
+    )
+
+
+def top_k_jaccard(
+    sources: List[TaggedPost], candidates: List[TaggedPost], k: int
+) -> Dict[UUID, List[Tuple[UUID, float]]]:
+    """Top-k candidates per source by Jaccard similarity of their tag sets
+
+    |A & B| for every pair is one sparse product, so only pairs sharing a tag
+    are ever materialized; Jaccard is |A & B| / (|A| + |B| - |A & B|).
+    """
+    result = {post_id: [] for post_id, _ in sources}
+    vocabulary = {}
+    for _, tags in sources:
+        for tag in tags or []:
+            vocabulary.setdefault(tag, len(vocabulary))
+    if not vocabulary or not candidates:
+        return result
+
+    a = tag_matrix(sources, vocabulary)
+    b = tag_matrix(candidates, vocabulary)
+    # Candidate sizes count all their tags, not just the ones sources use
+    b_sizes = np.array([len(set(tags or [])) for _, tags in candidates])
+    a_sizes = np.asarray(a.sum(axis=1)).ravel()
+
+    shared = (a @ b.T).tocoo()
+    rows, cols = shared.row, shared.col
+    scores = shared.data / (a_sizes[rows] + b_sizes[cols] - shared.data)
+
+    source_ids = np.array([post_id for post_id, _ in sources], dtype=object)
+    candidate_ids = np.array([post_id for post_id, _ in candidates], dtype=object)
+    not_self = source_ids[rows] != candidate_ids[cols]
+    rows, cols, scores = rows[not_self], cols[not_self], scores[not_self]
+
+    # Sort by source, then best score (ties: candidate order), keep k per source
+    order = np.lexsort((cols, -scores, rows))
+    rows, cols, scores = rows[order], cols[order], scores[order]
+    starts = np.searchsorted(rows, rows, side="left")
+    keep = np.arange(len(rows)) - starts < k
+    for row, col, score in zip(rows[keep], cols[keep], scores[keep]):
+        result[source_ids[row]].append((candidate_ids[col], float(score)))
+    return result
+
+
+class RelatedService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def affected_posts(
+        self, post_ids: Iterable[UUID], tags: Iterable[str]
+    ) -> List[UUID]:
+        """The given posts plus every post sharing one of the tags (GIN index)"""
+        affected = set(post_ids)
+        tags = sorted(set(tags))
+        if tags:
+            affected.update(
+                post_id
+                for (post_id,) in self.db.query(Post.id).filter(Post.tags.overlap(tags))
+            )
+        return sorted(affected)
+
+    def refresh(self, post_ids: List[UUID]) -> int:
+        """Recompute and store related posts for post_ids, batch by batch
+
+        Each batch loads its posts' tags, then only the candidates sharing a
+        tag with them. Commits per batch.
+        """
+        refreshed = 0
+        for start in range(0, len(post_ids), settings.related_batch_size):
+            batch = post_ids[start : start + settings.related_batch_size]
+            sources = self.db.query(Post.id, Post.tags).filter(Post.id.in_(batch)).all()
+            tags = sorted({tag for _, tags in sources for tag in tags or []})
+            candidates = []
+            if tags:
+                candidates = (
+                    self.db.query(Post.id, Post.tags)
+                    .filter(
+                        Post.status.in_(CANDIDATE_STATUSES), Post.tags.overlap(tags)
+                    )
+                    .order_by(Post.published_at.desc(), Post.id)
+                    .all()
+                )
+            related = top_k_jaccard(sources, candidates, settings.related_posts_k)
+
+            self.db.execute(REFRESH_LOCK)
+            self.db.query(PostRelated).filter(PostRelated.post_id.in_(batch)).delete(
+                synchronize_session=False
+            )
+            self.db.add_all(
+                PostRelated(
+                    post_id=post_id,
+                    rank=rank,
+                    related_post_id=related_post_id,
+                    score=score,
+                )
+                for post_id, neighbours in related.items()
+                for rank, (related_post_id, score) in enumerate(neighbours)
+            )
+            self.db.commit()
+            refreshed += len(sources)
+        return refreshed
+
+    def rebuild(self) -> int:
+        """Recompute related posts for every post"""
+        post_ids = [post_id for (post_id,) in self.db.query(Post.id).order_by(Post.id)]
+        return self.refresh(post_ids)
+
+    def get_related(self, post_id: UUID, limit: int) -> List[Post]:
+        """Stored related posts, most similar first"""
+        return (
+            self.db.query(Post)
+            .join(PostRelated, PostRelated.related_post_id == Post.id)
+            .options(joinedload(Post.content_media), joinedload(Post.created_by))
+            .filter(
+                PostRelated.post_id == post_id,
+                Post.status.in_(CANDIDATE_STATUSES),
+            )
+            .order_by(PostRelated.rank)
+            .limit(limit)
+            .all()
+        )
+
+
+def refresh_related(post_ids: List[UUID], tags: List[str]) -> int:
+    """Background task: refresh related posts after posts' tags or status changed
+
+    Pass the changed posts and their old and new tags; posts sharing those
+    tags get recomputed too, since their scores against them moved.
+    """
+    db = SessionLocal()
+    try:
+        service = RelatedService(db)
+        return service.refresh(service.affected_posts(post_ids, tags))
+    except Exception:
+        db.rollback()
+        logger.exception("Refreshing related posts failed")
+        return 0
+    finally:
+        db.close()
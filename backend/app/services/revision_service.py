@@ -0,0 +1,187 @@
+from datetime import datetime
+from sqlalchemy.orm import Session, defer
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from ..core.config import settings
+from ..models.post import Post
+from ..models.revision import PostRevision
+
+# Post fields kept in history
+TRACKED_FIELDS = [
+    "title",
+    "slug",
+    "description",
+    "tags",
+    "type",
+    "status",
+    "content_media_id",
+    "meta_data",
+    "published_at",
+]
+
+# Restoring a revision brings back its content, not its publishing state
+RESTORABLE_FIELDS = [
+    "title",
+    "slug",
+    "description",
+    "tags",
+    "type",
+    "content_media_id",
+    "meta_data",
+]
+
+
+def post_state(post: Post) -> Dict[str, Any]:
+    """Tracked fields as JSON values (missing keys mean None)"""
+    state = {}
+    for field in TRACKED_FIELDS:
+        value = getattr(post, field)
+        if isinstance(value, UUID):
+            value = str(value)
+        elif isinstance(value, datetime):
+            value = value.isoformat()
+        if value is not None:
+            state[field] = value
+    return state
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """RFC 7386: objects merge recursively, null removes, anything else replaces"""
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+    return result
+
+
+def make_merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """Smallest merge patch turning old into new
+
+    Merge patches can't express an explicit null inside an object, so null
+    values nested in meta_data come back as missing keys.
+    """
+    patch = {}
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = make_merge_patch(old[key], value)
+            if nested:
+                patch[key] = nested
+        elif value != old[key]:
+            patch[key] = value
+    return patch
+
+
+class RevisionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def record(
+        self,
+        post: Post,
+        old_state: Optional[Dict[str, Any]],
+        user_id: UUID,
+    ) -> Optional[PostRevision]:
+        """Add a revision for the post's current state (None if nothing changed)
+
+        old_state is post_state() from before the change, or None on create.
+        Flushes first so the post's row lock orders concurrent edits; runs in
+        the caller's transaction, the caller commits.
+        """
+        self.db.flush()
+        new_state = post_state(post)
+        last = (
+            self.db.query(PostRevision.revision)
+            .filter(PostRevision.post_id == post.id)
+            .order_by(PostRevision.revision.desc())
+            .limit(1)
+            .scalar()
+        )
+
+        if last is None and old_state is None:
+            return self._add(post.id, 1, new_state, sorted(new_state), user_id)
+        if last is None:
+            # Post from before history existed: keep its pre-edit state first
+            self._add(post.id, 1, old_state, sorted(old_state), post.created_by_id)
+            last = 1
+
+        patch = make_merge_patch(old_state or {}, new_state)
+        if not patch:
+            return None
+        return self._add(post.id, last + 1, new_state, sorted(patch), user_id, patch)
+
+    def _add(
+        self,
+        post_id: UUID,
+        revision: int,
+        state: Dict[str, Any],
+        changed: List[str],
+        user_id: UUID,
+        patch: Optional[Dict[str, Any]] = None,
+    ) -> PostRevision:
+        is_snapshot = (revision - 1) % settings.revision_snapshot_interval == 0
+        post_revision = PostRevision(
+            post_id=post_id,
+            revision=revision,
+            is_snapshot=is_snapshot,
+            data=state if is_snapshot or patch is None else patch,
+            changed_fields=changed,
+            created_by_id=user_id,
+        )
+        self.db.add(post_revision)
+        return post_revision
+
+    def list_revisions(self, post_id: UUID) -> List[PostRevision]:
+        """Revision metadata, newest first (data is not needed for the list)"""
+        return (
+            self.db.query(PostRevision)
+            .options(defer(PostRevision.data))
+            .filter(PostRevision.post_id == post_id)
+            .order_by(PostRevision.revision.desc())
+            .all()
+        )
+
+    def get_state(self, post_id: UUID, revision: int) -> Optional[Dict[str, Any]]:
+        """Rebuild a revision: nearest snapshot at or before it, then its patches
+
+        Snapshots are at most revision_snapshot_interval apart, so this reads
+        one indexed range and applies fewer than that many patches.
+        """
+        snapshot = (
+            self.db.query(PostRevision.revision)
+            .filter(
+                PostRevision.post_id == post_id,
+                PostRevision.revision <= revision,
+                PostRevision.is_snapshot.is_(True),
+            )
+            .order_by(PostRevision.revision.desc())
+            .limit(1)
+            .scalar()
+        )
+        if snapshot is None:
+            return None
+
+        rows = (
+            self.db.query(PostRevision.revision, PostRevision.data)
+            .filter(
+                PostRevision.post_id == post_id,
+                PostRevision.revision >= snapshot,
+                PostRevision.revision <= revision,
+            )
+            .order_by(PostRevision.revision)
+            .all()
+        )
+        if not rows or rows[-1].revision != revision:
+            return None
+
+        state = rows[0].data
+        for row in rows[1:]:
+            state = apply_merge_patch(state, row.data)
+        return state
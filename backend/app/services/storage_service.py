@@ -1,17 +1,27 @@
-from supabase import Client
+import logging
+from storage3 import AsyncStorageClient
 from fastapi import UploadFile, HTTPException
 import uuid
 import os
-from typing import Dict, Any
-from ..core.supabase import supabase, admin_supabase
+from typing import Dict, Any, List, Optional
+from ..core.supabase import get_storage_client
 from ..core.config import settings
 
+logger = logging.getLogger(__name__)
+
 
 class StorageService:
     def __init__(self, use_admin: bool = False):
-        self.client: Client = admin_supabase if use_admin else supabase
+        self.client: AsyncStorageClient = get_storage_client(use_admin)
         self.bucket = settings.storage_bucket
 
+    @staticmethod
+    def new_file_path(original_name: Optional[str], folder: str = "media"):
+        """Unique (filename, path) keeping the original extension"""
+        file_ext = os.path.splitext(original_name or "")[1]
+        unique_filename = f"{uuid.uuid4()}{file_ext}"
+        return unique_filename, f"{folder}/{unique_filename}"
+
     async def upload_file(
         self, file: UploadFile, folder: str = "media"
     ) -> Dict[str, Any]:
@@ -25,13 +35,10 @@ class StorageService:
                     detail=f"File too large. Max size: {settings.max_file_size} bytes",
                 )
 
-            # Generate unique filename
-            file_ext = os.path.splitext(file.filename or "")[1]
-            unique_filename = f"{uuid.uuid4()}{file_ext}"
-            file_path = f"{folder}/{unique_filename}"
+            unique_filename, file_path = self.new_file_path(file.filename, folder)
 
             # Upload to Supabase Storage
-            result = self.client.storage.from_(self.bucket).upload(
+            result = await self.client.from_(self.bucket).upload(
                 file_path,
                 content,
                 file_options={
@@ -44,7 +51,7 @@ class StorageService:
                 raise Exception(f"Upload failed: {result.error}")
 
             # Get public URL
-            public_url_response = self.client.storage.from_(self.bucket).get_public_url(
+            public_url_response = await self.client.from_(self.bucket).get_public_url(
                 file_path
             )
             public_url = public_url_response
@@ -61,14 +68,52 @@ class StorageService:
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-    def delete_file(self, file_path: str) -> bool:
+    async def remove_files(self, file_paths: List[str]) -> None:
+        """Delete files in one storage request, raising if it fails
+
+        Missing files aren't an error, so retrying a delete is safe.
+        """
+        result = await self.client.from_(self.bucket).remove(file_paths)
+        if hasattr(result, "error") and result.error:
+            raise Exception(f"Delete failed: {result.error}")
+
+    async def delete_file(self, file_path: str) -> bool:
         """Delete file from Supabase Storage"""
+        return await self.delete_files([file_path])
+
+    async def delete_files(self, file_paths: List[str]) -> bool:
+        """Delete several files in one storage request; False if it failed"""
         try:
-            result = self.client.storage.from_(self.bucket).remove([file_path])
-            return not (hasattr(result, "error") and result.error)
-        except:
+            await self.remove_files(file_paths)
+            return True
+        except Exception:
+            logger.warning("Could not delete %s", file_paths, exc_info=True)
             return False
 
-    def get_file_url(self, file_path: str) -> str:
+    async def create_upload_url(self, file_path: str) -> Dict[str, str]:
+        """Signed URL the client uploads to directly (PUT, body is the file)"""
+        result = await self.client.from_(self.bucket).create_signed_upload_url(
+            file_path
+        )
+        return {"upload_url": result["signed_url"], "token": result["token"]}
+
+    async def get_file_info(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Size and content type of a stored file, None if it isn't there"""
+        folder, _, name = file_path.rpartition("/")
+        files = await self.client.from_(self.bucket).list(folder, {"search": name})
+        for item in files:
+            if item.get("name") == name:
+                metadata = item.get("metadata") or {}
+                return {
+                    "size": metadata.get("size"),
+                    "mime_type": metadata.get("mimetype"),
+                }
+        return None
+
+    async def download_file(self, file_path: str) -> bytes:
+        """Download a file's bytes"""
+        return await self.client.from_(self.bucket).download(file_path)
+
+    async def get_file_url(self, file_path: str) -> str:
         """Get public URL for file"""
-        return self.client.storage.from_(self.bucket).get_public_url(file_path)
+        return await self.client.from_(self.bucket).get_public_url(file_path)
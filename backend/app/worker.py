@@ -0,0 +1,46 @@
+import argparse
+import logging
+
+import anyio
+
+from .core.config import settings
+from .core.database import dispose_engines
+from .core.supabase import close_storage_clients
+from .services.job_service import run_pending_jobs
+
+logger = logging.getLogger(__name__)
+
+
+async def work(worker: int):
+    while True:
+        try:
+            ran = await anyio.to_thread.run_sync(run_pending_jobs)
+        except Exception:
+            logger.exception("Job worker %s failed", worker)
+            ran = 0
+        if not ran:
+            await anyio.sleep(settings.job_poll_interval)
+
+
+async def main(concurrency: int):
+    """Run jobs until interrupted; workers claim separate batches (SKIP LOCKED)"""
+    print(f"🚀 Starting {concurrency} job worker(s)")
+    try:
+        async with anyio.create_task_group() as tg:
+            for worker in range(concurrency):
+                tg.start_soon(work, worker)
+    finally:
+        await close_storage_clients()
+        dispose_engines()
+
+
+if __name__ == "__main__":
+    # Dedicated job runner, e.g. alongside API workers with JOB_WORKER_ENABLED=false
+    parser = argparse.ArgumentParser(description="Run queued background jobs")
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        anyio.run(main, args.concurrency)
+    except KeyboardInterrupt:
+        print("🛑 Job worker stopped")
@@ -0,0 +1,117 @@
+"""Helpers for migrations that must not lock live tables.
+
+Indexes on posts/media are built with CREATE INDEX CONCURRENTLY and data
+backfills run in small, separately committed batches, so a deploy never holds
+a long write lock.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Optional, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+def create_index_concurrently(
+    index_name: str,
+    table_name: str,
+    columns: Sequence[Union[str, sa.TextClause]],
+    **kw,
+) -> None:
+    """CREATE INDEX CONCURRENTLY outside the revision's transaction
+
+    Safe to re-run: an INVALID index left by a failed concurrent build is
+    dropped first, and an existing valid one is kept.
+    """
+    with op.get_context().autocommit_block():
+        _drop_if_invalid(index_name)
+        # A concurrent build takes no write lock but waits for older
+        # transactions, so the migration lock_timeout doesn't apply here
+        with _lock_timeout("0"):
+            op.create_index(
+                index_name,
+                table_name,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+                **kw,
+            )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    """DROP INDEX CONCURRENTLY outside the revision's transaction"""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def batched_execute(
+    statement: str,
+    batch_size: int = 1000,
+    pause_seconds: float = 0.0,
+    params: Optional[dict] = None,
+) -> int:
+    """Run a statement repeatedly, one committed batch at a time, until it
+    affects no rows. The statement must take `:batch_size` and only touch rows
+    that still need work, e.g.
+
+        UPDATE posts SET x = ... WHERE id IN (
+            SELECT id FROM posts WHERE x IS NULL
+            LIMIT :batch_size FOR UPDATE SKIP LOCKED
+        )
+
+    Returns the total number of rows affected.
+    """
+    stmt = sa.text(statement)
+    bind_params = {"batch_size": batch_size, **(params or {})}
+
+    if context.is_offline_mode():
+        op.execute(stmt.bindparams(**bind_params))
+        return 0
+
+    total = 0
+    with op.get_context().autocommit_block():
+        bind = op.get_bind()
+        while True:
+            affected = bind.execute(stmt, bind_params).rowcount
+            total += affected
+            if affected == 0:
+                return total
+            print(f"    backfilled {total} rows")
+            if pause_seconds:
+                time.sleep(pause_seconds)
+
+
+@contextmanager
+def _lock_timeout(value: str):
+    if context.is_offline_mode():
+        yield
+        return
+
+    bind = op.get_bind()
+    previous = bind.execute(sa.text("SHOW lock_timeout")).scalar()
+    bind.execute(sa.text(f"SET lock_timeout = '{value}'"))
+    try:
+        yield
+    finally:
+        bind.execute(sa.text(f"SET lock_timeout = '{previous}'"))
+
+
+def _drop_if_invalid(index_name: str) -> None:
+    if context.is_offline_mode():
+        return
+
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": index_name},
+    )
+    if invalid.first():
+        op.execute(sa.text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'))
@@ -0,0 +1,141 @@
+"""initial schema
+
+Matches what Base.metadata.create_all produced before migrations existed.
+Databases created that way should be marked with `alembic stamp 0001`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("github_id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(length=255), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("avatar_url", sa.String(length=500), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("github_id"),
+    )
+    op.create_index("idx_users_github_id", "users", ["github_id"])
+
+    op.create_table(
+        "media",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("filename", sa.String(length=255), nullable=False),
+        sa.Column("original_name", sa.String(length=255), nullable=True),
+        sa.Column("mime_type", sa.String(length=100), nullable=True),
+        sa.Column("file_size", sa.BigInteger(), nullable=True),
+        sa.Column("file_path", sa.String(), nullable=False),
+        sa.Column("public_url", sa.String(), nullable=False),
+        sa.Column("asset_type", sa.String(length=50), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.ForeignKeyConstraint(["created_by_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("idx_media_created_by", "media", ["created_by_id"])
+    op.create_index("idx_media_status", "media", ["status"])
+    op.create_index("idx_media_type_created", "media", ["asset_type", "created_at"])
+    op.create_index("ix_media_asset_type", "media", ["asset_type"])
+    op.create_index("ix_media_status", "media", ["status"])
+
+    op.create_table(
+        "posts",
+        sa.Column("id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("slug", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("tags", sa.ARRAY(sa.String()), nullable=True),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=True),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("content_media_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("published_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("metadata", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+        sa.ForeignKeyConstraint(["content_media_id"], ["media.id"]),
+        sa.ForeignKeyConstraint(["created_by_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("slug"),
+    )
+    op.create_index("idx_posts_created_by", "posts", ["created_by_id"])
+    op.create_index("idx_posts_slug", "posts", ["slug"])
+    op.create_index("idx_posts_status_published", "posts", ["status", "published_at"])
+    op.create_index("idx_posts_tags", "posts", ["tags"])
+    op.create_index("idx_posts_type", "posts", ["type"])
+    op.create_index("ix_posts_published_at", "posts", ["published_at"])
+    op.create_index("ix_posts_status", "posts", ["status"])
+    op.create_index("ix_posts_tags", "posts", ["tags"])
+    op.create_index("ix_posts_type", "posts", ["type"])
+
+    op.create_table(
+        "content_counters",
+        sa.Column("entity", sa.String(length=20), nullable=False),
+        sa.Column("created_by_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("facet", sa.String(length=20), nullable=False),
+        sa.Column("value", sa.String(length=255), nullable=False),
+        sa.Column("count", sa.BigInteger(), nullable=False),
+        sa.ForeignKeyConstraint(["created_by_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("entity", "created_by_id", "status", "facet", "value"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("content_counters")
+    op.drop_table("posts")
+    op.drop_table("media")
+    op.drop_table("users")
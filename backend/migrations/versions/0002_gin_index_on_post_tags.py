@@ -0,0 +1,34 @@
+"""gin index on posts.tags
+
+list_posts filters with `tags && ARRAY[...]`, which a B-tree on an array
+column can't serve. Build a GIN index concurrently, then drop both B-trees.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 09:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently(
+        "idx_posts_tags_gin", "posts", ["tags"], postgresql_using="gin"
+    )
+    drop_index_concurrently("idx_posts_tags", "posts")
+    drop_index_concurrently("ix_posts_tags", "posts")
+
+
+def downgrade() -> None:
+    create_index_concurrently("idx_posts_tags", "posts", ["tags"])
+    create_index_concurrently("ix_posts_tags", "posts", ["tags"])
+    drop_index_concurrently("idx_posts_tags_gin", "posts")
@@ -0,0 +1,70 @@
+"""media usages
+
+Reverse index from media to the posts that reference it, backfilled from
+posts.content_media_id and ids found anywhere in posts.metadata.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from migrations.helpers import batched_execute
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+UUID_PATTERN = "[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "media_usages",
+        sa.Column("media_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(["media_id"], ["media.id"]),
+        sa.ForeignKeyConstraint(["post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("media_id", "post_id", "source"),
+    )
+    op.create_index("idx_media_usages_post", "media_usages", ["post_id"])
+
+    batched_execute("""
+        INSERT INTO media_usages (media_id, post_id, source)
+        SELECT p.content_media_id, p.id, 'content' FROM posts p
+        WHERE p.content_media_id IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM media_usages u
+            WHERE u.post_id = p.id AND u.source = 'content'
+        )
+        LIMIT :batch_size
+        ON CONFLICT DO NOTHING
+        """)
+    batched_execute(
+        """
+        INSERT INTO media_usages (media_id, post_id, source)
+        SELECT DISTINCT m.id, p.id, 'meta_data'
+        FROM posts p
+        CROSS JOIN LATERAL regexp_matches(p.metadata::text, :pattern, 'gi') AS r(id)
+        JOIN media m ON m.id = lower(r.id[1])::uuid
+        WHERE p.metadata IS NOT NULL AND NOT EXISTS (
+            SELECT 1 FROM media_usages u
+            WHERE u.media_id = m.id AND u.post_id = p.id AND u.source = 'meta_data'
+        )
+        LIMIT :batch_size
+        ON CONFLICT DO NOTHING
+        """,
+        params={"pattern": UUID_PATTERN},
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("media_usages")
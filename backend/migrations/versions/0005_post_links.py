@@ -0,0 +1,42 @@
+"""post links
+
+Adjacency table for wikilinks and markdown links between posts, indexed in
+both directions. Links live in content files, so existing posts are
+backfilled with scripts/rebuild_links.py rather than in SQL.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "post_links",
+        sa.Column("source_post_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("target_slug", sa.String(length=255), nullable=False),
+        sa.Column("target_post_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("source", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(["source_post_id"], ["posts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["target_post_id"], ["posts.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("source_post_id", "target_slug"),
+    )
+    op.create_index("idx_post_links_target_post", "post_links", ["target_post_id"])
+    op.create_index("idx_post_links_target_slug", "post_links", ["target_slug"])
+
+
+def downgrade() -> None:
+    op.drop_table("post_links")
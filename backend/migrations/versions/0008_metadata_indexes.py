@@ -0,0 +1,48 @@
+"""metadata indexes
+
+GIN (jsonb_path_ops) indexes on posts.metadata and media.metadata for
+`meta=` containment filters, plus expression indexes on the hot post keys
+(POST_META_INDEXED_KEYS), all built concurrently.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of POST_META_INDEXED_KEYS at this revision
+POST_META_INDEXED_KEYS = ("series", "language")
+
+
+def upgrade() -> None:
+    for table in ("posts", "media"):
+        create_index_concurrently(
+            f"idx_{table}_metadata_gin",
+            table,
+            ["metadata"],
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        )
+    for key in POST_META_INDEXED_KEYS:
+        create_index_concurrently(
+            f"idx_posts_meta_{key}", "posts", [sa.text(f"(metadata ->> '{key}')")]
+        )
+
+
+def downgrade() -> None:
+    for key in POST_META_INDEXED_KEYS:
+        drop_index_concurrently(f"idx_posts_meta_{key}", "posts")
+    for table in ("posts", "media"):
+        drop_index_concurrently(f"idx_{table}_metadata_gin", table)
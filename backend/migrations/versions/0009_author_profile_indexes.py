@@ -0,0 +1,45 @@
+"""author profile indexes
+
+Index on users.username for profile lookups, and a composite index on
+posts (created_by_id, status, published_at DESC, id DESC) so an author's
+published posts are one ordered range scan with keyset pagination. The
+composite index leads with created_by_id, so it replaces idx_posts_created_by.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from migrations.helpers import create_index_concurrently, drop_index_concurrently
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_concurrently("idx_users_username", "users", ["username"])
+    create_index_concurrently(
+        "idx_posts_author_published",
+        "posts",
+        [
+            "created_by_id",
+            "status",
+            sa.text("published_at DESC"),
+            sa.text("id DESC"),
+        ],
+    )
+    drop_index_concurrently("idx_posts_created_by", "posts")
+
+
+def downgrade() -> None:
+    create_index_concurrently("idx_posts_created_by", "posts", ["created_by_id"])
+    drop_index_concurrently("idx_posts_author_published", "posts")
+    drop_index_concurrently("idx_users_username", "users")
@@ -0,0 +1,42 @@
+"""counter value as text
+
+content_counters.value holds post tags, which have no length limit, so a
+tag over 255 characters made the post write fail. varchar -> text needs no
+table rewrite in Postgres.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        "content_counters",
+        "value",
+        existing_type=sa.String(length=255),
+        type_=sa.Text(),
+        existing_nullable=False,
+    )
+
+
+def downgrade() -> None:
+    op.alter_column(
+        "content_counters",
+        "value",
+        existing_type=sa.Text(),
+        type_=sa.String(length=255),
+        existing_nullable=False,
+    )
@@ -0,0 +1,79 @@
+"""Measure cold-start cost: `import app.main`, lifespan startup, first request.
+
+Each run happens in a fresh interpreter so module imports are really cold.
+
+    python scripts/bench_startup.py --runs 5
+    SCHEMA_AUTO_CREATE=true python scripts/bench_startup.py
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs inside the child interpreter
+CHILD = """
+import asyncio, json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+import httpx
+
+async def first_request():
+    app_ = app.main.app
+    async with app_.router.lifespan_context(app_):
+        t2 = time.perf_counter()
+        transport = httpx.ASGITransport(app=app_)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            t3 = time.perf_counter()
+            response = await client.get({path!r})
+            t4 = time.perf_counter()
+    return t2, t3, t4, response.status_code
+
+t2, t3, t4, status = asyncio.run(first_request())
+print(json.dumps({{
+    "import_ms": (t1 - t0) * 1000,
+    "startup_ms": (t2 - t1) * 1000,
+    "first_request_ms": (t4 - t3) * 1000,
+    "total_ms": (t4 - t0) * 1000,
+    "status": status,
+}}))
+"""
+
+
+def run_once(path: str) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(path=path)],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    # The app prints startup logs; the measurement is the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--path", default="/health", help="first request path")
+    args = parser.parse_args()
+
+    samples = [run_once(args.path) for _ in range(args.runs)]
+
+    print(f"📊 Cold start over {args.runs} runs (GET {args.path}):")
+    for key in ("import_ms", "startup_ms", "first_request_ms", "total_ms"):
+        values = [sample[key] for sample in samples]
+        print(
+            f"    {key:<18} median {statistics.median(values):8.1f}"
+            f"   min {min(values):8.1f}   max {max(values):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
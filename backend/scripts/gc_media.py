@@ -0,0 +1,26 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio  # noqa: E402
+
+from app.core.supabase import close_storage_clients  # noqa: E402
+from app.services.media_usage_service import collect_orphaned_media  # noqa: E402
+
+
+async def gc_media(dry_run: bool):
+    """Run the orphaned media GC once (same job the app runs periodically)"""
+    try:
+        stats = await anyio.to_thread.run_sync(collect_orphaned_media, dry_run)
+        print(f"{'🔍 Dry run' if dry_run else '🧹 Done'}: {stats}")
+    finally:
+        await close_storage_clients()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete orphaned media")
+    parser.add_argument("--delete", action="store_true", help="not a dry run")
+    args = parser.parse_args()
+    anyio.run(gc_media, not args.delete)
@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal  # noqa: E402
+from app.services.counter_service import CounterService  # noqa: E402
+
+
+def rebuild_counters():
+    """Backfill content_counters from the posts and media tables"""
+    db = SessionLocal()
+    try:
+        CounterService(db).rebuild()
+        print("✅ Content counters rebuilt")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding counters: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_counters()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import anyio  # noqa: E402
+
+from app.core.database import SessionLocal, load_models  # noqa: E402
+from app.core.supabase import close_storage_clients  # noqa: E402
+from app.models.post import Post  # noqa: E402
+from app.services.link_service import LinkService  # noqa: E402
+
+
+def rebuild_links():
+    """Backfill post_links by re-reading every post's content and meta_data"""
+    load_models()
+    db = SessionLocal()
+    try:
+        links = LinkService(db)
+        post_ids = [post_id for (post_id,) in db.query(Post.id).order_by(Post.id)]
+        for post_id in post_ids:
+            links.sync_post(db.query(Post).filter(Post.id == post_id).one())
+            db.commit()
+        print(f"✅ Links rebuilt for {len(post_ids)} posts")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding links: {e}")
+    finally:
+        db.close()
+
+
+async def main():
+    try:
+        # Content is fetched with anyio.from_thread, so run in a worker thread
+        await anyio.to_thread.run_sync(rebuild_links)
+    finally:
+        await close_storage_clients()
+
+
+if __name__ == "__main__":
+    anyio.run(main)
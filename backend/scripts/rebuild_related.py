@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.database import SessionLocal, load_models  # noqa: E402
+from app.services.related_service import RelatedService  # noqa: E402
+
+
+def rebuild_related():
+    """Backfill post_related for every post"""
+    load_models()
+    db = SessionLocal()
+    try:
+        count = RelatedService(db).rebuild()
+        print(f"✅ Related posts rebuilt for {count} posts")
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error rebuilding related posts: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild_related()
@@ -0,0 +1,63 @@
+"""Rows for tests that run against Postgres (see conftest)"""
+
+import uuid
+
+
+def make_user(db, username: str = "author"):
+    from app.models.user import User
+
+    user = User(github_id=uuid.uuid4().int % 2**31, username=username)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def make_post(db, user, **fields):
+    from app.models.post import Post
+
+    fields.setdefault("title", "A post")
+    fields.setdefault("slug", f"post-{uuid.uuid4().hex[:8]}")
+    fields.setdefault("status", "published")
+    fields.setdefault("tags", [])
+    fields.setdefault("meta_data", {})
+    post = Post(created_by_id=user.id, **fields)
+    db.add(post)
+    db.commit()
+    return post
+
+
+def make_media(db, user, **fields):
+    from app.models.media import Media
+    from app.services.counter_service import CounterService, media_counter_keys
+
+    name = f"{uuid.uuid4().hex[:8]}.png"
+    fields.setdefault("filename", name)
+    fields.setdefault("file_path", f"uploads/{name}")
+    fields.setdefault("public_url", f"http://localhost/uploads/{name}")
+    fields.setdefault("file_size", 1024)
+    fields.setdefault("asset_type", "image")
+    fields.setdefault("status", "draft")
+    media = Media(created_by_id=user.id, **fields)
+    db.add(media)
+    CounterService(db).apply_change(None, media_counter_keys(media))
+    db.commit()
+    return media
+
+
+def as_current_user(user):
+    from app.schemas.user import UserResponse
+
+    return UserResponse(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        avatar_url=user.avatar_url,
+        created_at=user.created_at,
+    )
+
+
+def auth_headers(user) -> dict:
+    from app.core.security import SecurityService
+
+    token = SecurityService.create_access_token({"sub": str(user.id)})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,89 @@
+import asyncio
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core.http import create_http_client, get_http_client
+from app.core.security import SecurityService
+from app.models.user import User
+
+GITHUB_USER = {
+    "id": 4242,
+    "login": "0xs1r4t",
+    "email": "me@example.com",
+    "avatar_url": "https://avatars.example.com/4242",
+}
+
+
+def test_concurrent_first_requests_share_one_client():
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+
+    async def first_requests():
+        clients = await asyncio.gather(*(get_http_client(request) for _ in range(10)))
+        await clients[0].aclose()
+        return clients
+
+    clients = asyncio.run(first_requests())
+
+    assert len({id(client) for client in clients}) == 1
+
+
+def _github(token_status=200):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, str(request.url)))
+        if request.url.path == "/login/oauth/access_token":
+            assert b"code=the-code" in request.content
+            return httpx.Response(token_status, json={"access_token": "gho_token"})
+        assert request.headers["Authorization"] == "token gho_token"
+        return httpx.Response(200, json=GITHUB_USER)
+
+    return handler, calls
+
+
+@pytest.fixture
+def callback():
+    from app.main import app
+
+    def call(handler):
+        http_client = create_http_client(transport=httpx.MockTransport(handler))
+        app.dependency_overrides[get_http_client] = lambda: http_client
+        return TestClient(app).get(
+            "/api/v1/auth/callback",
+            params={"code": "the-code"},
+            follow_redirects=False,
+        )
+
+    yield call
+    app.dependency_overrides.pop(get_http_client, None)
+
+
+def test_callback_signs_in_the_github_user(db, callback):
+    handler, calls = _github()
+
+    response = callback(handler)
+
+    assert response.status_code == 307
+    assert calls == [
+        ("POST", "https://github.com/login/oauth/access_token"),
+        ("GET", "https://api.github.com/user"),
+    ]
+    user = db.query(User).filter(User.github_id == GITHUB_USER["id"]).one()
+    assert user.username == "0xs1r4t"
+    query = parse_qs(urlsplit(response.headers["location"]).query)
+    assert query["user"] == [str(user.id)]
+    assert SecurityService.verify_token(query["access_token"][0]) == str(user.id)
+
+
+def test_failed_code_exchange_creates_no_user(db, callback):
+    handler, calls = _github(token_status=401)
+
+    response = callback(handler)
+
+    assert response.status_code >= 400
+    assert len(calls) == 1
+    assert db.query(User).count() == 0
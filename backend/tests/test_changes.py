@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+from datetime import UTC, datetime, timedelta
+
+from app.core.config import settings
+from app.models.change import ChangeLogEntry
+from app.services.media_usage_service import collect_orphaned_media
+
+from .factories import as_current_user, make_media, make_post, make_user
+
+
+def test_change_hooks_do_not_need_the_api_loaded():
+    # What scripts/gc_media.py imports; the API routers never load there
+    check = (
+        "import sys\n"
+        "from sqlalchemy import event\n"
+        "from app.services.media_usage_service import collect_orphaned_media\n"
+        "from app.core.database import SessionLocal\n"
+        "from app.core.change_log import _write_changes\n"
+        "assert not any(name.startswith('app.api') for name in sys.modules)\n"
+        "assert event.contains(SessionLocal, 'before_commit', _write_changes)\n"
+    )
+    subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        check=True,
+    )
+
+
+def test_media_gc_deletes_show_up_in_the_change_log(db):
+    user = make_user(db)
+    old = datetime.now(UTC) - timedelta(hours=settings.media_gc_grace_hours + 1)
+    media_id = make_media(db, user, created_at=old).id
+
+    collect_orphaned_media(dry_run=False)
+
+    entries = db.query(ChangeLogEntry).order_by(ChangeLogEntry.seq).all()
+    assert [(e.entity, e.entity_id, e.action) for e in entries] == [
+        ("media", media_id, "created"),
+        ("media", media_id, "deleted"),
+    ]
+
+
+def test_feed_returns_each_change_once_with_its_latest_action(db):
+    from app.api.changes import get_changes
+
+    user = make_user(db)
+    since = get_changes(
+        since=None, limit=100, current_user=as_current_user(user), db=db
+    ).next_since
+    kept = make_post(db, user, title="Kept")
+    gone = make_post(db, user, title="Gone")
+    kept.title = "Kept, edited"
+    db.delete(gone)
+    db.commit()
+
+    feed = get_changes(
+        since=since, limit=100, current_user=as_current_user(user), db=db
+    )
+
+    assert [(item.id, item.action) for item in feed.changes] == [
+        (str(kept.id), "updated"),
+        (str(gone.id), "deleted"),
+    ]
+    assert feed.changes[0].post.title == "Kept, edited"
+    assert not feed.has_more
@@ -0,0 +1,16 @@
+from app.models.counter import ContentCounter
+from app.services.counter_service import CounterService, post_counter_keys
+
+from .factories import make_post, make_user
+
+
+def test_long_tags_are_counted(db):
+    user = make_user(db)
+    tag = "t" * 1000
+    post = make_post(db, user, tags=[tag])
+
+    CounterService(db).apply_change(None, post_counter_keys(post))
+    db.commit()
+
+    counter = db.query(ContentCounter).filter(ContentCounter.facet == "tag").one()
+    assert (counter.value, counter.count) == (tag, 1)
@@ -0,0 +1,106 @@
+from urllib.parse import urlsplit
+
+import pytest
+
+from app.models.job import Job
+from app.models.media import Media
+
+from .factories import auth_headers, make_user
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 2048
+
+
+@pytest.fixture
+def headers(db):
+    return auth_headers(make_user(db))
+
+
+def _start(client, headers, content=PNG, content_type="image/png"):
+    response = client.post(
+        "/api/v1/media/upload-url",
+        json={
+            "filename": "photo.png",
+            "content_type": content_type,
+            "file_size": len(content),
+        },
+        headers=headers,
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _put(client, upload_url, content=PNG, content_type="image/png"):
+    # The signed URL points at local_storage_url; same app, so just its path
+    url = urlsplit(upload_url)
+    return client.put(
+        f"{url.path}?{url.query}",
+        content=content,
+        headers={"Content-Type": content_type},
+    )
+
+
+def _complete(client, headers, media_id):
+    return client.post(f"/api/v1/media/{media_id}/complete", headers=headers)
+
+
+def test_direct_upload_flow(client, headers):
+    upload = _start(client, headers)
+    assert upload["media"]["status"] == "pending"
+
+    assert _put(client, upload["upload_url"]).status_code == 200
+    response = _complete(client, headers, upload["media"]["id"])
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "draft"
+    assert response.json()["file_size"] == len(PNG)
+    assert client.get(urlsplit(response.json()["public_url"]).path).content == PNG
+
+
+def test_put_needs_a_valid_token(client, headers):
+    upload = _start(client, headers)
+    forged = upload["upload_url"].replace(upload["token"], "9999999999.forged")
+
+    assert _put(client, forged).status_code == 403
+
+
+def test_complete_before_upload_is_rejected(client, headers):
+    upload = _start(client, headers)
+
+    response = _complete(client, headers, upload["media"]["id"])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "File has not been uploaded yet"
+
+    # Still pending, so the client can upload and complete afterwards
+    _put(client, upload["upload_url"])
+    assert _complete(client, headers, upload["media"]["id"]).status_code == 200
+
+
+def test_completing_twice_conflicts(client, headers):
+    upload = _start(client, headers)
+    _put(client, upload["upload_url"])
+
+    assert _complete(client, headers, upload["media"]["id"]).status_code == 200
+    assert _complete(client, headers, upload["media"]["id"]).status_code == 409
+
+
+@pytest.mark.parametrize(
+    "content, content_type, detail",
+    [
+        (PNG + b"extra", "image/png", "bytes, expected"),
+        (PNG, "image/jpeg", "Uploaded type image/jpeg"),
+    ],
+)
+def test_mismatched_upload_is_discarded(
+    client, headers, db, content, content_type, detail
+):
+    upload = _start(client, headers)
+    _put(client, upload["upload_url"], content, content_type)
+
+    response = _complete(client, headers, upload["media"]["id"])
+
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+    assert db.query(Media).count() == 0
+    (job,) = db.query(Job).all()
+    (path,) = job.payload["paths"]
+    assert urlsplit(upload["upload_url"]).path.endswith(f"/{path}")
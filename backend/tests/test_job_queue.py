@@ -0,0 +1,122 @@
+from datetime import UTC, datetime, timedelta
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.job import DeadJob, Job
+from app.services import job_service
+from app.services.job_service import JobService, enqueue, retry_delay
+
+
+def _enqueue(db, *kinds):
+    jobs = [enqueue(db, kind, {"n": n}) for n, kind in enumerate(kinds)]
+    db.commit()
+    return [job.id for job in jobs]
+
+
+def _expire_leases(db):
+    # As if the claiming worker died: the jobs are due again
+    db.query(Job).update({"run_at": datetime.now(UTC) - timedelta(seconds=1)})
+    db.commit()
+
+
+def test_claim_leases_due_jobs(db):
+    ids = _enqueue(db, "a", "b")
+    enqueue(db, "later", {}, delay=60)
+    db.commit()
+
+    claimed = JobService(db).claim(10)
+
+    assert sorted(job.id for job in claimed) == ids
+    assert {job.attempts for job in claimed} == {1}
+    assert JobService(db).claim(10) == []  # Leased, not due again yet
+    lease_end = datetime.now(UTC) + timedelta(seconds=settings.job_lease_seconds)
+    for job in db.query(Job).filter(Job.id.in_(ids)):
+        assert job.run_at > lease_end - timedelta(seconds=5)
+
+
+def test_workers_skip_jobs_another_worker_is_claiming(db):
+    locked_id, free_id = _enqueue(db, "a", "b")
+
+    other = SessionLocal()
+    try:
+        other.query(Job).filter(Job.id == locked_id).with_for_update().one()
+        claimed = JobService(db).claim(10)
+    finally:
+        other.rollback()
+        other.close()
+
+    assert [job.id for job in claimed] == [free_id]
+
+
+def test_stale_worker_cannot_touch_a_newer_claim(db):
+    (job_id,) = _enqueue(db, "a")
+    jobs = JobService(db)
+    (stale,) = jobs.claim(1)
+    _expire_leases(db)
+    (fresh,) = jobs.claim(1)
+
+    jobs.complete(stale)
+    assert jobs.fail(stale, "late") is False
+    job = db.get(Job, job_id)
+    assert (job.attempts, job.last_error) == (2, None)
+
+    jobs.complete(fresh)
+    assert db.get(Job, job_id) is None
+
+
+def test_failed_job_is_retried_after_a_backoff(db):
+    (job_id,) = _enqueue(db, "a")
+    jobs = JobService(db)
+    (claimed,) = jobs.claim(1)
+
+    before = datetime.now(UTC)
+    assert jobs.fail(claimed, "ValueError: nope") is False
+
+    job = db.get(Job, job_id)
+    assert job.last_error == "ValueError: nope"
+    delay = (job.run_at - before).total_seconds()
+    assert settings.job_backoff_base / 2 - 1 <= delay <= settings.job_backoff_base + 1
+    assert jobs.claim(1) == []
+
+
+def test_retry_delay_doubles_and_is_capped():
+    base, cap = settings.job_backoff_base, settings.job_backoff_max
+
+    for attempts in range(1, 20):
+        delay = min(cap, base * 2 ** (attempts - 1))
+        assert delay / 2 <= retry_delay(attempts) <= delay
+
+
+def test_fail_at_max_attempts_moves_the_job_to_dead_jobs(db, monkeypatch):
+    monkeypatch.setattr(settings, "job_max_attempts", 2)
+    (job_id,) = _enqueue(db, "a")
+    jobs = JobService(db)
+
+    assert jobs.fail(jobs.claim(1)[0], "first") is False
+    _expire_leases(db)
+    assert jobs.fail(jobs.claim(1)[0], "second") is True
+
+    assert db.get(Job, job_id) is None
+    dead = db.get(DeadJob, job_id)
+    assert (dead.kind, dead.payload, dead.attempts) == ("a", {"n": 0}, 2)
+    assert dead.last_error == "second"
+    assert jobs.queue_stats() == {"pending": 0, "due": 0, "dead": 1}
+
+
+def test_run_pending_jobs_dispatches_to_handlers(db, monkeypatch):
+    ran = []
+
+    def boom(payload):
+        raise RuntimeError("storage down")
+
+    monkeypatch.setitem(job_service.HANDLERS, "test.ok", ran.append)
+    monkeypatch.setitem(job_service.HANDLERS, "test.boom", boom)
+    ok_id, boom_id, unknown_id = _enqueue(db, "test.ok", "test.boom", "test.unknown")
+
+    assert job_service.run_pending_jobs() == 3
+
+    db.expire_all()
+    assert ran == [{"n": 0}]
+    assert db.get(Job, ok_id) is None
+    assert db.get(Job, boom_id).last_error == "RuntimeError: storage down"
+    assert db.get(Job, unknown_id).last_error.startswith("LookupError")
@@ -0,0 +1,78 @@
+from app.services.link_service import LinkService, find_links, find_meta_links
+
+from .factories import make_post, make_user
+
+
+def test_find_links():
+    source = """
+    See [[My Note]], [[other-note|the other one]] and [[Third#Heading]].
+    Also [a relative link](../fourth-note) and [one with a title](/posts/fifth "x").
+    ![[diagram.png]] ![photo](./photo) [site](https://example.com/sixth)
+    [a file](./notes.pdf) `[[in code]]`
+
+    ```
+    [[in a block]]
+    ```
+    """
+
+    assert find_links(source) == {
+        "my-note",
+        "other-note",
+        "third",
+        "fourth-note",
+        "fifth",
+    }
+
+
+def test_find_links_skips_targets_too_long_for_a_slug():
+    assert find_links(f"[[{'a' * 256}]] [[{'b' * 255}]]") == {"b" * 255}
+
+
+def test_find_meta_links():
+    meta = {"related": ["[[One]]", {"deep": "see [two](two)"}], "count": 3}
+
+    assert find_meta_links(meta) == {"one", "two"}
+
+
+def _linked_post(db, user, slug, *targets, **fields):
+    post = make_post(
+        db,
+        user,
+        slug=slug,
+        title=slug.title(),
+        meta_data={"links": [f"[[{target}]]" for target in targets]},
+        **fields,
+    )
+    LinkService(db).sync_post(post)
+    db.commit()
+    return post
+
+
+def test_links_resolve_when_the_target_is_written(db):
+    user = make_user(db)
+    a = _linked_post(db, user, "a", "b", "not-yet", "x" * 300)
+    b = _linked_post(db, user, "b")
+
+    links = LinkService(db)
+    assert links.backlinks(b.id) == [a]
+    assert [(link.target_slug, target) for link, target in links.outlinks(a.id)] == [
+        ("b", b),
+        ("not-yet", None),
+    ]
+
+
+def test_neighborhood_walks_both_ways_through_visible_posts(db):
+    author, other = make_user(db, "author"), make_user(db, "other")
+    d = _linked_post(db, other, "d", status="draft")
+    c = _linked_post(db, author, "c", "d")
+    b = _linked_post(db, author, "b", "c")
+    a = _linked_post(db, author, "a", "b")
+
+    links = LinkService(db)
+    depths, edges = links.neighborhood(b.id, author.id, depth=5, max_nodes=10)
+
+    assert depths == {b.id: 0, a.id: 1, c.id: 1}  # Not the other user's draft
+    assert sorted(edges) == sorted([(a.id, b.id), (b.id, c.id)])
+
+    depths, _ = links.neighborhood(c.id, other.id, depth=1, max_nodes=10)
+    assert depths == {c.id: 0, b.id: 1, d.id: 1}
@@ -0,0 +1,69 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.changes import stream_changes
+from app.core.live import broker
+
+SCOPE = {"type": "http", "method": "GET", "path": "/api/v1/changes/stream"}
+
+
+async def _open_stream():
+    return await stream_changes(
+        current_user=None, db=SimpleNamespace(close=lambda: None)
+    )
+
+
+async def _disconnected():
+    return {"type": "http.disconnect"}
+
+
+def test_client_gone_before_the_body_frees_the_slot():
+    async def scenario():
+        response = await _open_stream()
+        assert len(broker.subscribers) == 1
+
+        async def send(message):
+            raise OSError("connection reset")
+
+        with pytest.raises(OSError):
+            await response(SCOPE, _disconnected, send)
+
+    asyncio.run(scenario())
+
+    assert broker.subscribers == set()
+
+
+def test_cancelled_response_frees_the_slot():
+    async def scenario():
+        response = await _open_stream()
+        started = asyncio.Event()
+
+        async def receive():
+            started.set()
+            await asyncio.Event().wait()  # The client never says anything
+
+        async def send(message):
+            pass
+
+        task = asyncio.create_task(response(SCOPE, receive, send))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert broker.subscribers == set()
+
+
+def test_full_broker_turns_streams_away(monkeypatch):
+    monkeypatch.setattr(broker, "max_subscribers", 0)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(_open_stream())
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {"Retry-After": "30"}
@@ -0,0 +1,20 @@
+import asyncio
+import hashlib
+import io
+
+from fastapi import UploadFile
+
+from app.api.media import HASH_CHUNK_SIZE, file_digest
+
+
+def test_file_digest_hashes_in_chunks_and_rewinds():
+    content = bytes(range(256)) * (HASH_CHUNK_SIZE // 256 * 3 + 1)
+    upload = UploadFile(io.BytesIO(content), filename="big.bin")
+
+    async def digest_then_read():
+        return await file_digest(upload), await upload.read()
+
+    digest, rest = asyncio.run(digest_then_read())
+
+    assert digest == hashlib.sha256(content).hexdigest()
+    assert rest == content
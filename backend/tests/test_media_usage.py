@@ -0,0 +1,100 @@
+import uuid
+from datetime import UTC, datetime, timedelta
+
+from app.core.config import settings
+from app.models.job import Job
+from app.models.media import Media
+from app.services.media_usage_service import (
+    MediaUsageService,
+    collect_orphaned_media,
+    find_uuids,
+)
+
+from .factories import auth_headers, make_media, make_post, make_user
+
+
+def test_find_uuids_anywhere_in_json():
+    a, b, c = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    value = {str(a): [1, {"hero": f"see {b}"}], "gallery": [str(c).upper()]}
+
+    assert find_uuids(value) == {a, b, c}
+
+
+def test_usages_follow_content_and_meta_data(db):
+    user = make_user(db)
+    content, hero, unused = (make_media(db, user) for _ in range(3))
+    post = make_post(
+        db,
+        user,
+        content_media_id=content.id,
+        meta_data={"hero": str(hero.id), "not_media": str(uuid.uuid4())},
+    )
+    usages = MediaUsageService(db)
+    usages.sync_post(post)
+    db.commit()
+
+    assert [(u.post_id, u.source) for u in usages.get_usages(content.id)] == [
+        (post.id, "content")
+    ]
+    assert [u.source for u in usages.get_usages(hero.id)] == ["meta_data"]
+    assert usages.get_usages(unused.id) == []
+
+    post.meta_data = {}
+    usages.sync_post(post)
+    db.commit()
+    assert usages.get_usages(hero.id) == []
+
+
+def test_media_in_use_cannot_be_deleted(db, client):
+    user = make_user(db)
+    media = make_media(db, user)
+    post = make_post(db, user, content_media_id=media.id)
+    MediaUsageService(db).sync_post(post)
+    db.commit()
+
+    response = client.delete(f"/api/v1/media/{media.id}", headers=auth_headers(user))
+
+    assert response.status_code == 409
+    assert response.json()["detail"]["post_ids"] == [str(post.id)]
+
+
+def _media_set(db):
+    user = make_user(db)
+    old = datetime.now(UTC) - timedelta(hours=settings.media_gc_grace_hours + 1)
+
+    media = {
+        "orphan": make_media(db, user, created_at=old),
+        "referenced": make_media(db, user, created_at=old),
+        "recent": make_media(db, user),
+        "published": make_media(db, user, created_at=old, status="published"),
+    }
+    post = make_post(db, user, content_media_id=media["referenced"].id)
+    MediaUsageService(db).sync_post(post)
+    db.commit()
+    return {name: (item.id, item.file_path) for name, item in media.items()}
+
+
+def test_old_orphans_are_collected_and_the_rest_kept(db):
+    media = _media_set(db)
+
+    stats = collect_orphaned_media(dry_run=False)
+
+    db.expire_all()
+    assert stats["candidates"] == 1
+    remaining = {media_id for (media_id,) in db.query(Media.id)}
+    assert remaining == {
+        media[name][0] for name in ("referenced", "recent", "published")
+    }
+    (job,) = db.query(Job).all()
+    assert job.kind == "storage.delete"
+    assert job.payload == {"paths": [media["orphan"][1]]}
+
+
+def test_dry_run_only_counts(db):
+    media = _media_set(db)
+
+    stats = collect_orphaned_media(dry_run=True)
+
+    assert stats["candidates"] == 1
+    assert db.query(Media).count() == len(media)
+    assert db.query(Job).count() == 0
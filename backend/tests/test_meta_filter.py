@@ -0,0 +1,62 @@
+import pytest
+from fastapi import HTTPException
+
+from app.api.params import parse_meta
+
+from .factories import auth_headers, make_media, make_post, make_user
+
+
+def test_parse_meta_forms():
+    assert parse_meta("series: garden ,language:en") == {
+        "series": "garden",
+        "language": "en",
+    }
+    assert parse_meta('{"featured": true, "n": 2}') == {"featured": True, "n": 2}
+    assert parse_meta(None) is None
+
+    for bad in ("series", ":x", "{}", "[1]", "{not json"):
+        with pytest.raises(HTTPException) as error:
+            parse_meta(bad)
+        assert error.value.status_code == 400
+
+
+def test_posts_and_media_filter_by_meta_data(db, client):
+    user = make_user(db)
+    make_post(
+        db,
+        user,
+        title="Match",
+        meta_data={
+            "series": "garden",
+            "language": "en",
+            "featured": True,
+            "author": {"name": "Ada", "role": "editor"},
+        },
+    )
+    make_post(
+        db,
+        user,
+        title="Other language",
+        meta_data={"series": "garden", "language": "de"},
+    )
+    make_post(db, user, title="No meta")
+    x100 = make_media(db, user, meta_data={"camera": "x100"})
+    make_media(db, user, meta_data={"camera": "gr3"})
+    headers = auth_headers(user)
+
+    def post_titles(meta):
+        response = client.get("/api/v1/posts/", params={"meta": meta}, headers=headers)
+        assert response.status_code == 200, response.text
+        return sorted(post["title"] for post in response.json())
+
+    # Indexed keys (expression indexes) and containment (GIN) mix freely
+    assert post_titles("series:garden") == ["Match", "Other language"]
+    assert post_titles("series:garden,language:en") == ["Match"]
+    assert post_titles('{"featured": true}') == ["Match"]
+    assert post_titles('{"author": {"name": "Ada"}, "series": "garden"}') == ["Match"]
+    assert post_titles('{"author": {"name": "Bob"}}') == []
+
+    media = client.get(
+        "/api/v1/media/", params={"meta": "camera:x100"}, headers=headers
+    )
+    assert [item["id"] for item in media.json()] == [str(x100.id)]
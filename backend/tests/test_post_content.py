@@ -0,0 +1,79 @@
+import asyncio
+import uuid
+
+from app.services.content_service import (
+    ContentCache,
+    RenderedContent,
+    render_markdown,
+)
+from app.services.storage_service import StorageService
+
+from .factories import auth_headers, make_media, make_post, make_user
+
+SOURCE = b"""# Garden
+
+Intro <script>alert(1)</script>
+
+## Planting
+
+```python
+print("hi")
+```
+"""
+
+
+def test_render_markdown_sanitizes_and_builds_a_toc():
+    html, toc = render_markdown(SOURCE.decode())
+
+    assert "<script>" not in html
+    assert '<h2 id="planting">Planting</h2>' in html
+    assert '<code class="language-python">' in html
+    assert toc == [
+        {"level": 1, "id": "garden", "title": "Garden"},
+        {"level": 2, "id": "planting", "title": "Planting"},
+    ]
+
+
+def _rendered(html: str) -> RenderedContent:
+    return RenderedContent(media_id=uuid.uuid4(), content_hash="", html=html, toc=[])
+
+
+def test_content_cache_evicts_least_recently_used():
+    cache = ContentCache(max_entries=2, max_bytes=10)
+    cache.put("a", _rendered("aaaa"))
+    cache.put("b", _rendered("bbbb"))
+    cache.get("a")
+    cache.put("c", _rendered("cccc"))  # Over both limits: "b" goes
+    cache.put("huge", _rendered("x" * 11))  # Never fits
+
+    assert [key for key in "abc" if cache.get(key)] == ["a", "c"]
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_content_endpoint_serves_cached_html_with_an_etag(db, client):
+    user = make_user(db)
+    storage = StorageService(use_admin=True)
+    _, path = storage.new_file_path("garden.md", "content")
+    asyncio.run(storage.client.from_(storage.bucket).upload(path, SOURCE))
+    media = make_media(
+        db, user, file_path=path, file_size=len(SOURCE), mime_type="text/markdown"
+    )
+    post_id = make_post(db, user, content_media_id=media.id).id
+    headers = auth_headers(user)
+
+    response = client.get(f"/api/v1/posts/{post_id}/content", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["toc"][1]["id"] == "planting"
+    etag = response.headers["ETag"]
+
+    # Served from the cache from now on, so the file isn't needed any more
+    asyncio.run(storage.client.from_(storage.bucket).remove([path]))
+    again = client.get(f"/api/v1/posts/{post_id}/content", headers=headers)
+    assert again.json() == response.json()
+
+    not_modified = client.get(
+        f"/api/v1/posts/{post_id}/content",
+        headers={**headers, "If-None-Match": etag},
+    )
+    assert not_modified.status_code == 304
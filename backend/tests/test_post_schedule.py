@@ -0,0 +1,49 @@
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import BackgroundTasks, HTTPException
+
+from app.api.posts import update_post
+from app.schemas.post import PostUpdate
+
+from .factories import as_current_user, make_post, make_user
+
+
+def _update(db, user, post_id, **fields):
+    return update_post(
+        post_id,
+        PostUpdate(**fields),
+        BackgroundTasks(),
+        current_user=as_current_user(user),
+        db=db,
+    )
+
+
+def test_editing_an_overdue_scheduled_post_keeps_its_time(db):
+    user = make_user(db)
+    overdue = datetime.now(UTC) - timedelta(minutes=5)
+    post_id = make_post(db, user, status="scheduled", published_at=overdue).id
+
+    response = _update(db, user, post_id, title="Fixed typo")
+
+    assert response.title == "Fixed typo"
+    assert response.status == "scheduled"
+    assert response.published_at == overdue
+
+
+def test_rescheduling_into_the_past_is_rejected(db):
+    user = make_user(db)
+    later = datetime.now(UTC) + timedelta(hours=1)
+    scheduled_id = make_post(db, user, status="scheduled", published_at=later).id
+    draft_id = make_post(db, user, status="draft").id
+    past = datetime.now(UTC) - timedelta(hours=1)
+
+    for post_id, fields in [
+        (scheduled_id, {"published_at": past}),
+        (draft_id, {"status": "scheduled", "published_at": past}),
+        (draft_id, {"status": "scheduled"}),
+    ]:
+        with pytest.raises(HTTPException) as error:
+            _update(db, user, post_id, **fields)
+        assert error.value.status_code == 400
+        db.rollback()
@@ -0,0 +1,111 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from limits import parse
+from limits.strategies import FixedWindowRateLimiter
+from starlette.requests import Request
+
+from app.core import rate_limit as rate_limit_module
+from app.core.config import settings
+from app.core.rate_limit import SQLiteStorage, rate_limit, rate_limit_key
+
+from .factories import auth_headers
+
+
+@pytest.fixture(autouse=True)
+def fresh_counters():
+    rate_limit_module.storage.reset()
+    yield
+    rate_limit_module.storage.reset()
+
+
+def _request(ip="203.0.113.7", headers=None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+            "client": (ip, 50000),
+        }
+    )
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+
+    @app.get("/limited", dependencies=[Depends(rate_limit("2/minute"))])
+    def limited():
+        return {"ok": True}
+
+    return TestClient(app)
+
+
+def test_over_budget_requests_get_429_with_retry_after():
+    client = _client()
+
+    assert [client.get("/limited").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/limited")
+
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded: 2/minute"}
+    assert 1 <= int(response.headers["Retry-After"]) <= 60
+
+
+def test_users_have_their_own_budget():
+    client = _client()
+    headers = auth_headers(SimpleNamespace(id=uuid.uuid4()))
+
+    for _ in range(2):
+        client.get("/limited")
+
+    assert client.get("/limited").status_code == 429
+    assert client.get("/limited", headers=headers).status_code == 200
+
+
+def test_key_is_the_user_across_ips():
+    user = SimpleNamespace(id=uuid.uuid4())
+    headers = auth_headers(user)
+
+    keys = {rate_limit_key(_request(ip, headers)) for ip in ("10.0.0.1", "10.0.0.2")}
+
+    assert keys == {f"user:{user.id}"}
+
+
+def test_anonymous_key_is_the_ip():
+    assert rate_limit_key(_request("10.0.0.1")) == "ip:10.0.0.1"
+    assert rate_limit_key(_request("10.0.0.2")) == "ip:10.0.0.2"
+
+
+def test_invalid_token_counts_as_anonymous():
+    request = _request("10.0.0.1", {"Authorization": "Bearer not-a-jwt"})
+
+    assert rate_limit_key(request) == "ip:10.0.0.1"
+
+
+def test_sqlite_storage_is_shared_between_workers(tmp_path):
+    uri = f"sqlite://{tmp_path / 'ratelimit.db'}"
+    item = parse("3/minute")
+    workers = [FixedWindowRateLimiter(SQLiteStorage(uri)) for _ in range(2)]
+
+    hits = [workers[i % 2].hit(item, "GET:/limited", "ip:10.0.0.1") for i in range(4)]
+
+    assert hits == [True, True, True, False]
+    assert workers[1].get_window_stats(item, "GET:/limited", "ip:10.0.0.1")[1] == 0
+
+
+def test_several_workers_share_counters_instead_of_memory(monkeypatch):
+    from app.server import rate_limit_storage_uri
+
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "memory://")
+    assert rate_limit_storage_uri(1) == "memory://"
+    assert rate_limit_storage_uri(4).startswith("sqlite:///")
+
+    monkeypatch.setattr(settings, "rate_limit_storage_uri", "redis://cache:6379")
+    assert rate_limit_storage_uri(4) == "redis://cache:6379"
@@ -0,0 +1,37 @@
+import uuid
+
+from app.services.related_service import RelatedService, refresh_related, top_k_jaccard
+
+from .factories import make_post, make_user
+
+
+def test_top_k_jaccard_matches_the_definition():
+    a, b, c, d = (uuid.uuid4() for _ in range(4))
+    posts = [(a, ["x", "y"]), (b, ["x", "y", "z"]), (c, ["x", "q"]), (d, ["w"])]
+
+    related = top_k_jaccard(posts, posts, k=2)
+
+    assert related[a] == [(b, 2 / 3), (c, 1 / 3)]
+    assert related[c] == [(a, 1 / 3), (b, 1 / 4)]
+    assert related[d] == []
+
+
+def test_refresh_stores_published_neighbours_and_follows_tag_changes(db):
+    user = make_user(db)
+    post = make_post(db, user, tags=["garden", "soil"])
+    close = make_post(db, user, tags=["garden", "soil", "compost"])
+    loose = make_post(db, user, tags=["garden"])
+    make_post(db, user, tags=["garden", "soil"], status="draft")
+    make_post(db, user, tags=["kitchen"])
+
+    related = RelatedService(db)
+    related.rebuild()
+    assert related.get_related(post.id, 10) == [close, loose]
+
+    # Retagging the post moves it, and the posts that shared its old tags
+    post.tags = ["kitchen"]
+    db.commit()
+    refresh_related([post.id], ["garden", "soil", "kitchen"])
+    db.expire_all()
+    assert [p.tags for p in related.get_related(post.id, 10)] == [["kitchen"]]
+    assert post not in related.get_related(close.id, 10)
@@ -0,0 +1,76 @@
+from fastapi import BackgroundTasks
+
+from app.api.posts import restore_post_revision, update_post
+from app.core.config import settings
+from app.models.revision import PostRevision
+from app.schemas.post import PostUpdate
+from app.services.revision_service import (
+    RevisionService,
+    apply_merge_patch,
+    make_merge_patch,
+)
+
+from .factories import as_current_user, make_post, make_user
+
+
+def test_merge_patch_round_trip():
+    old = {"title": "A", "tags": ["x"], "meta_data": {"a": 1, "b": {"c": 2}}}
+    new = {"title": "A", "meta_data": {"a": 1, "b": {"c": 3, "d": 4}}}
+
+    patch = make_merge_patch(old, new)
+
+    assert patch == {"tags": None, "meta_data": {"b": {"c": 3, "d": 4}}}
+    assert apply_merge_patch(old, patch) == new
+
+
+def test_edits_are_stored_as_patches_between_snapshots(db, monkeypatch):
+    monkeypatch.setattr(settings, "revision_snapshot_interval", 3)
+    user = make_user(db)
+    post_id = make_post(db, user, title="v1", status="draft").id
+
+    titles = ["v2", "v3", "v4", "v5"]
+    for title in titles:
+        update_post(
+            post_id,
+            PostUpdate(title=title),
+            BackgroundTasks(),
+            current_user=as_current_user(user),
+            db=db,
+        )
+
+    rows = (
+        db.query(PostRevision)
+        .filter(PostRevision.post_id == post_id)
+        .order_by(PostRevision.revision)
+        .all()
+    )
+    # Revision 1 is the pre-edit state of a post from before history
+    assert [row.is_snapshot for row in rows] == [True, False, False, True, False]
+    assert rows[1].data == {"title": "v2"}
+    assert rows[1].changed_fields == ["title"]
+
+    revisions = RevisionService(db)
+    for revision, title in enumerate(["v1"] + titles, start=1):
+        state = revisions.get_state(post_id, revision)
+        assert (state["title"], state["status"]) == (title, "draft")
+    assert revisions.get_state(post_id, 6) is None
+
+
+def test_restore_brings_back_content_not_status(db):
+    user = make_user(db)
+    post_id = make_post(db, user, title="Original", status="draft").id
+    update_post(
+        post_id,
+        PostUpdate(title="Rewritten", status="published"),
+        BackgroundTasks(),
+        current_user=as_current_user(user),
+        db=db,
+    )
+
+    restored = restore_post_revision(
+        post_id, 1, BackgroundTasks(), current_user=as_current_user(user), db=db
+    )
+
+    assert (restored.title, restored.status) == ("Original", "published")
+    latest = RevisionService(db).list_revisions(post_id)[0]
+    assert (latest.revision, latest.changed_fields) == (3, ["title"])
@@ -0,0 +1,142 @@
+import asyncio
+
+from sqlalchemy import event
+
+from app.core.single_flight import SingleFlight
+
+from .factories import as_current_user, make_post, make_user
+
+CALLERS = 20
+
+
+async def _wait_for_joiners(flight: SingleFlight, joiners: int, release: asyncio.Event):
+    # Let the leader's call finish only once everyone else is waiting on it
+    while flight.shared < joiners:
+        await asyncio.sleep(0)
+    release.set()
+
+
+def test_concurrent_calls_run_once_and_share_the_result():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def load(post_id):
+            calls.append(post_id)
+            await release.wait()
+            return f"body of {post_id}".encode()
+
+        *bodies, _ = await asyncio.gather(
+            *(flight.do(("get_post", 1), load, 1) for _ in range(CALLERS)),
+            _wait_for_joiners(flight, CALLERS - 1, release),
+        )
+        return flight, calls, bodies
+
+    flight, calls, bodies = asyncio.run(scenario())
+
+    assert calls == [1]
+    assert bodies == [b"body of 1"] * CALLERS
+    assert flight.stats() == {"in_flight": 0, "started": 1, "shared": CALLERS - 1}
+
+
+def test_leader_exception_reaches_every_waiter():
+    async def scenario():
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            await release.wait()
+            raise ValueError("connection lost")
+
+        *results, _ = await asyncio.gather(
+            *(flight.do("key", load) for _ in range(CALLERS)),
+            _wait_for_joiners(flight, CALLERS - 1, release),
+            return_exceptions=True,
+        )
+        return calls, results
+
+    calls, results = asyncio.run(scenario())
+
+    assert calls == [1]
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len({id(result) for result in results}) == 1
+
+
+def test_nothing_is_cached_after_the_call():
+    async def scenario():
+        flight = SingleFlight()
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return len(calls)
+
+        return [await flight.do("key", load) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [1, 2, 3]
+
+
+def test_concurrent_get_post_requests_run_one_query(db):
+    from app.api.posts import get_post
+
+    user = make_user(db)
+    post_id = make_post(db, user, title="Hot post").id
+    current_user = as_current_user(user)
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        if "FROM posts" in statement:
+            statements.append(statement)
+
+    async def read(callers):
+        responses = await asyncio.gather(
+            *(
+                get_post(post_id, include=None, current_user=current_user, db=db)
+                for _ in range(callers)
+            )
+        )
+        return [response.body for response in responses]
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        (single,) = asyncio.run(read(1))
+        queries_per_load = len(statements)
+        statements.clear()
+        bodies = asyncio.run(read(CALLERS))
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+    assert queries_per_load == 1
+    assert len(statements) == queries_per_load
+    assert bodies == [single] * CALLERS
+    assert b"Hot post" in single
+
+
+def test_coalesced_get_post_still_checks_access_per_caller(db):
+    from fastapi import HTTPException
+
+    from app.api.posts import get_post
+
+    owner = make_user(db, "owner")
+    reader = make_user(db, "reader")
+    post = make_post(db, owner, status="draft")
+
+    async def read():
+        return await asyncio.gather(
+            get_post(post.id, include=None, current_user=as_current_user(owner), db=db),
+            get_post(
+                post.id, include=None, current_user=as_current_user(reader), db=db
+            ),
+            return_exceptions=True,
+        )
+
+    owner_result, reader_result = asyncio.run(read())
+
+    assert owner_result.status_code == 200
+    assert isinstance(reader_result, HTTPException)
+    assert reader_result.status_code == 403
@@ -0,0 +1,31 @@
+from datetime import UTC, datetime, timedelta
+
+from app.api.users import list_user_posts
+
+from .factories import as_current_user, make_post, make_user
+
+
+def test_author_posts_page_newest_first(db):
+    author = make_user(db, "author")
+    now = datetime.now(UTC)
+    titles = ["Newest", "Middle", "Oldest"]
+    for age, title in enumerate(titles):
+        make_post(db, author, title=title, published_at=now - timedelta(days=age))
+    make_post(db, author, title="Draft", status="draft", published_at=now)
+    make_post(db, author, title="Undated", published_at=None)
+
+    seen, cursor = [], None
+    while True:
+        page = list_user_posts(
+            "author",
+            cursor=cursor,
+            limit=2,
+            current_user=as_current_user(author),
+            db=db,
+        )
+        seen += [post.title for post in page.items]
+        cursor = page.next_cursor
+        if not cursor:
+            break
+
+    assert seen == titles